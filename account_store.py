@@ -0,0 +1,295 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+DEFAULT_DATABASE = "players/accounts.db"
+LEGACY_DIRECTORY = "players"
+
+
+class AccountStore(ABC):
+    """Storage backend for player accounts"""
+
+    @abstractmethod
+    def load(self, username):
+        """Return {"username", "password", "balance"} or None if missing"""
+
+    @abstractmethod
+    def save(self, username, password, balance):
+        """Create or overwrite an account"""
+
+    @abstractmethod
+    def delete(self, username):
+        """Remove an account; returns False if it did not exist"""
+
+    @abstractmethod
+    def rename(self, old_username, new_username):
+        """Rename an account; returns False if the new name is taken"""
+
+    @abstractmethod
+    def adjust_balance(self, username, delta):
+        """Atomically add delta to a balance and return the new balance"""
+
+    @abstractmethod
+    def get_meta(self, key):
+        """Return a store-level setting, or None if unset"""
+
+    @abstractmethod
+    def set_meta(self, key, value):
+        """Set a store-level setting"""
+
+    def exists(self, username):
+        return self.load(username) is not None
+
+    def create(self, username, password, balance):
+        """Create an account; returns False if the username is taken"""
+        if self.exists(username):
+            return False
+        self.save(username, password, balance)
+        return True
+
+    @contextmanager
+    def batch(self):
+        """Group several writes into one commit where the backend allows it"""
+        yield self
+
+    def after_commit(self, callback):
+        """Call callback once the writes made so far are committed"""
+        callback()
+
+
+class SQLiteAccountStore(AccountStore):
+    """Accounts in one SQLite database in WAL mode, indexed by username"""
+    def __init__(self, path=DEFAULT_DATABASE):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        # Callbacks waiting for the outermost batch to commit
+        self._committed = []
+        self._connection = sqlite3.connect(path, isolation_level=None,
+                                           check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS accounts ("
+            "username TEXT PRIMARY KEY, password TEXT NOT NULL, "
+            "balance REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def close(self):
+        self._connection.close()
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            if self._batch_depth == 0:
+                self._connection.execute("BEGIN IMMEDIATE")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._committed = []
+                    self._connection.execute("ROLLBACK")
+                raise
+            else:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._connection.execute("COMMIT")
+                    callbacks, self._committed = self._committed, []
+                    for callback in callbacks:
+                        callback()
+
+    def after_commit(self, callback):
+        with self._lock:
+            if self._batch_depth:
+                self._committed.append(callback)
+            else:
+                callback()
+
+    def load(self, username):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT username, password, balance FROM accounts "
+                "WHERE username = ?",
+                (username,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"username": row[0], "password": row[1], "balance": row[2]}
+
+    def save(self, username, password, balance):
+        with self.batch():
+            self._connection.execute(
+                "INSERT INTO accounts (username, password, balance) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET "
+                "password = excluded.password, balance = excluded.balance",
+                (username, password, balance)
+            )
+
+    def create(self, username, password, balance):
+        with self.batch():
+            try:
+                self._connection.execute(
+                    "INSERT INTO accounts (username, password, balance) "
+                    "VALUES (?, ?, ?)",
+                    (username, password, balance)
+                )
+            except sqlite3.IntegrityError:
+                return False
+        return True
+
+    def delete(self, username):
+        with self.batch():
+            cursor = self._connection.execute(
+                "DELETE FROM accounts WHERE username = ?", (username,))
+        return cursor.rowcount > 0
+
+    def rename(self, old_username, new_username):
+        with self.batch():
+            try:
+                cursor = self._connection.execute(
+                    "UPDATE accounts SET username = ? WHERE username = ?",
+                    (new_username, old_username)
+                )
+            except sqlite3.IntegrityError:
+                return False
+        return cursor.rowcount > 0
+
+    def adjust_balance(self, username, delta):
+        with self.batch():
+            row = self._connection.execute(
+                "UPDATE accounts SET balance = balance + ? "
+                "WHERE username = ? RETURNING balance",
+                (delta, username)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"No saved data found for player: {username}")
+        return row[0]
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_meta(self, key, value):
+        with self.batch():
+            self._connection.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value))
+            )
+
+
+class JsonAccountStore(AccountStore):
+    """Legacy backend: one JSON file per player"""
+    def __init__(self, directory=LEGACY_DIRECTORY):
+        self.directory = directory
+
+    def _filename(self, username):
+        return os.path.join(self.directory, f"{username}.json")
+
+    def usernames(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [name[:-len(".json")]
+                for name in sorted(os.listdir(self.directory))
+                if name.endswith(".json")]
+
+    def load(self, username):
+        try:
+            with open(self._filename(username), "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def save(self, username, password, balance):
+        os.makedirs(self.directory, exist_ok=True)
+        player_data = {"username": username, "password": password,
+                       "balance": balance}
+        # Write a temporary file and swap it in so a crash never leaves half
+        # a file
+        temporary = self._filename(username) + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(player_data, file, indent=4)
+        os.replace(temporary, self._filename(username))
+
+    def delete(self, username):
+        try:
+            os.remove(self._filename(username))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def rename(self, old_username, new_username):
+        data = self.load(old_username)
+        if data is None or self.exists(new_username):
+            return False
+        self.save(new_username, data["password"], data["balance"])
+        self.delete(old_username)
+        return True
+
+    def adjust_balance(self, username, delta):
+        data = self.load(username)
+        if data is None:
+            raise ValueError(f"No saved data found for player: {username}")
+        self.save(username, data["password"], data["balance"] + delta)
+        return data["balance"] + delta
+
+    def _read_meta(self):
+        try:
+            path = os.path.join(self.directory, "_store.meta")
+            with open(path, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def get_meta(self, key):
+        return self._read_meta().get(key)
+
+    def set_meta(self, key, value):
+        meta = self._read_meta()
+        meta[key] = str(value)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "_store.meta"), "w") as file:
+            json.dump(meta, file)
+
+
+def migrate_json_accounts(store, directory=LEGACY_DIRECTORY):
+    """Copy legacy JSON accounts into store, keeping accounts it already has.
+    Returns the number of accounts copied."""
+    legacy = JsonAccountStore(directory)
+    copied = 0
+    with store.batch():
+        for username in legacy.usernames():
+            data = legacy.load(username)
+            if not store.exists(data["username"]):
+                store.save(data["username"], data["password"], data["balance"])
+                copied += 1
+    return copied
+
+
+_default_store = None
+
+
+def default_store():
+    """The shared SQLite store, created and migrated on first use"""
+    global _default_store
+    if _default_store is None:
+        _default_store = SQLiteAccountStore(DEFAULT_DATABASE)
+        # Migrate once, so renamed or deleted accounts do not come back
+        if _default_store.get_meta("json_migrated") is None:
+            with _default_store.batch():
+                migrate_json_accounts(_default_store, LEGACY_DIRECTORY)
+                _default_store.set_meta("json_migrated", 1)
+    return _default_store
@@ -0,0 +1,178 @@
+import os
+import struct
+import zlib
+from enum import IntEnum
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_JOURNAL = "players/balance.journal"
+
+_CRC = struct.Struct("<I")
+# Sequence number, delta, entry kind, username length
+_BODY = struct.Struct("<QdBH")
+
+
+class Entry(IntEnum):
+    BET = 1
+    PAYOUT = 2
+    PUSH = 3
+    DEPOSIT = 4
+    SURRENDER = 5
+
+
+class JournalInUse(OSError):
+    """Another session holds the journal file"""
+
+
+def _lock(file):
+    """Take an exclusive lock on file, held until it is closed"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        file.close()
+        raise JournalInUse(f"{file.name} is used by another session") from None
+
+
+class BalanceJournal:
+    """Append-only journal of balance deltas in front of an AccountStore.
+
+    Entries are appended as they happen and fsynced in batches (every
+    sync_every entries or on flush). A checkpoint applies them to the store
+    together with the last applied sequence number in one transaction and
+    empties the journal, so replaying after a crash never applies an entry
+    twice.
+
+    Each journal is locked by the session writing it and tracks its own
+    applied sequence number; open_journal gives concurrent sessions one
+    journal file each.
+    """
+    def __init__(self, store, path=DEFAULT_JOURNAL, sync_every=64,
+                 checkpoint_every=1024):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.store = store
+        self.path = path
+        self.sync_every = sync_every
+        self.checkpoint_every = checkpoint_every
+        self.unsynced = 0
+        self.uncheckpointed = 0
+        self._file = open(path, "ab")
+        _lock(self._file)
+        self.meta_key = f"journal_seq:{os.path.basename(path)}"
+        self.seq = int(store.get_meta(self.meta_key) or 0)
+        for seq, _, _, _ in self.entries():
+            self.seq = max(self.seq, seq)
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def record(self, username, kind, delta):
+        """Append one balance change"""
+        self.seq += 1
+        name = username.encode("utf-8")
+        body = _BODY.pack(self.seq, delta, kind, len(name)) + name
+        self._file.write(_CRC.pack(zlib.crc32(body)) + body)
+        self.unsynced += 1
+        self.uncheckpointed += 1
+        if self.unsynced >= self.sync_every:
+            self.flush()
+
+    def flush(self):
+        """Make every recorded entry durable"""
+        if self.unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.unsynced = 0
+
+    def entries(self):
+        """Yield (seq, username, kind, delta) for every intact entry on disk,
+        stopping at a torn write at the end of the file"""
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            while True:
+                header = file.read(_CRC.size + _BODY.size)
+                if len(header) < _CRC.size + _BODY.size:
+                    return
+                (crc,) = _CRC.unpack_from(header)
+                seq, delta, kind, length = _BODY.unpack_from(header, _CRC.size)
+                name = file.read(length)
+                if (len(name) < length
+                        or zlib.crc32(header[_CRC.size:] + name) != crc):
+                    return
+                yield seq, name.decode("utf-8"), Entry(kind), delta
+
+    def checkpoint(self):
+        """Apply journalled entries to the store and empty the journal"""
+        self.flush()
+        applied = int(self.store.get_meta(self.meta_key) or 0)
+        with self.store.batch():
+            for seq, username, _, delta in self.entries():
+                if seq <= applied:
+                    continue
+                try:
+                    self.store.adjust_balance(username, delta)
+                except ValueError:
+                    pass  # Account deleted since the entry was written
+                applied = seq
+            self.store.set_meta(self.meta_key, max(applied, self.seq))
+            # Empty the journal only once an outer batch has committed too
+            size = self._file.tell()
+            self.store.after_commit(lambda: self._truncate(size))
+
+    def _truncate(self, size):
+        # Entries recorded since the checkpoint are not applied yet; keep
+        # them, and the applied ones before them, which replay skips
+        if self._file.tell() == size:
+            self._file.truncate(0)
+            self.uncheckpointed = 0
+
+    def replay(self):
+        """Recover entries left behind by a crash; call before loading
+        accounts"""
+        self.checkpoint()
+
+    def maybe_checkpoint(self):
+        """Checkpoint once enough entries have accumulated"""
+        if self.uncheckpointed >= self.checkpoint_every:
+            self.checkpoint()
+
+
+def _slot(path, number):
+    if not number:
+        return path
+    base, extension = os.path.splitext(path)
+    return f"{base}.{number}{extension}"
+
+
+def open_journal(store, path=DEFAULT_JOURNAL):
+    """A replayed journal for this session: path, or the first of path.1,
+    path.2, ... no other session holds. Journals sessions left behind when
+    they crashed are replayed too."""
+    journal = None
+    number = 0
+    while journal is None or os.path.exists(_slot(path, number)):
+        try:
+            claimed = BalanceJournal(store, _slot(path, number))
+        except JournalInUse:
+            pass
+        else:
+            if journal is None:
+                journal = claimed
+            else:
+                claimed.replay()
+                claimed.close()
+        number += 1
+    journal.replay()
+    return journal
@@ -0,0 +1,197 @@
+"""Vectorized simulation of fixed-strategy rounds with NumPy.
+
+Every hand is dealt from its own freshly shuffled shoe and played as a
+row of integer arrays: the player follows a decision table (stand, hit or
+double, no splits) and the dealer draws like Dealer.make_decision under
+the RuleSet's soft 17 rule. Naturals are settled like RoundEngine.
+"""
+from array import array
+import seeding
+from cards import RANK_VALUES
+from rules import DEFAULT_RULES
+from constants import RANKS, SUITS, GameActions as GA
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batch simulation
+    np = None
+else:
+    _VALUES = np.asarray(RANK_VALUES, dtype=np.int8)
+
+STAND, HIT, DOUBLE = 0, 1, 2
+MAX_CARDS = 40  # Player hits to at most 21 aces, the dealer to at most 17
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Batch simulation requires NumPy: pip install numpy")
+
+
+def threshold_table(stand_on=17):
+    """Decision table that hits below stand_on, like strategies.mimic_dealer.
+
+    Tables are (hard, soft) pairs of arrays indexed [player score, upcard
+    value] holding STAND, HIT or DOUBLE.
+    """
+    _require_numpy()
+    hard = np.zeros((22, 11), dtype=np.int8)
+    hard[:stand_on] = HIT
+    return hard, hard.copy()
+
+
+def table_policy(table):
+    """Round engine policy that follows a decision table"""
+    hard, soft = table
+
+    def policy(player, dealer, actions):
+        upcard = dealer.game_cards[0].value
+        code = (soft if player.is_soft else hard)[player.score, upcard]
+        if code == DOUBLE and GA.DOUBLE_DOWN.value in actions:
+            return GA.DOUBLE_DOWN.value
+        return GA.STAND.value if code == STAND else GA.HIT.value
+    return policy
+
+
+class ShoeBatch:
+    """One freshly shuffled shoe per row, dealt lazily.
+
+    Drawing a card picks one of the full shoe's cards and picks again if it
+    was already dealt, which deals the same sequence as shuffling the whole
+    shoe but only costs the cards actually used, without a pass over the
+    ranks. The dealt ranks are kept for replays.
+    """
+    def __init__(self, count, rng, num_of_decks=DEFAULT_RULES.num_of_decks):
+        _require_numpy()
+        self.rng = rng
+        self.per_rank = len(SUITS) * num_of_decks
+        self.size = self.per_rank * len(RANKS)
+        self.counts = np.full((count, len(RANKS)), self.per_rank,
+                              dtype=np.int16)
+        self.dealt = np.zeros((count, MAX_CARDS), dtype=np.int8)
+        self.position = np.zeros(count, dtype=np.int64)
+
+    def draw(self, rows):
+        """Deal one card to each of rows and return their values"""
+        counts = self.counts.reshape(-1)
+        cells = rows * len(RANKS)
+        ranks = np.empty(len(rows), dtype=np.int64)
+        pending = np.arange(len(rows))
+        while len(pending):
+            pick = self.rng.integers(self.size, size=len(pending))
+            rank = pick // self.per_rank
+            # Copies below the rank's count are the ones still in the shoe
+            left = pick - rank * self.per_rank < counts[cells[pending] + rank]
+            ranks[pending[left]] = rank[left]
+            pending = pending[~left]
+        counts[cells + ranks] -= 1
+        self.dealt[rows, self.position[rows]] = ranks
+        self.position[rows] += 1
+        return _VALUES[ranks]
+
+
+def _scores(hard, aces):
+    soft = (aces > 0) & (hard + 10 <= 21)
+    return np.where(soft, hard + 10, hard), soft
+
+
+def play_batch(shoes, table, rules=DEFAULT_RULES):
+    """Play one hand per shoe and return the net units won by each"""
+    hard_table, soft_table = table
+    count = len(shoes.counts)
+    rows = np.arange(count)
+
+    # Cards are dealt player, dealer, player, dealer like RoundEngine
+    first, upcard, second, hole = (shoes.draw(rows) for _ in range(4))
+    player_hard = first + second
+    player_aces = (first == 1).astype(np.int8) + (second == 1)
+    dealer_hard = upcard + hole
+    dealer_aces = (upcard == 1).astype(np.int8) + (hole == 1)
+    bet = np.ones(count, dtype=np.int8)
+
+    score, soft = _scores(player_hard, player_aces)
+    natural = score == 21
+    active = np.flatnonzero(score < 21)
+    first_turn = True
+    while len(active):
+        table_score = score[active]
+        column = upcard[active]
+        action = np.where(soft[active], soft_table[table_score, column],
+                          hard_table[table_score, column])
+        if first_turn:
+            bet[active[action == DOUBLE]] = 2
+        active = active[action != STAND]
+        card = shoes.draw(active)
+        player_hard[active] += card
+        player_aces[active] += card == 1
+        score[active], soft[active] = _scores(player_hard[active],
+                                              player_aces[active])
+        active = active[(score[active] < 21) & (bet[active] == 1)]
+        first_turn = False
+
+    dealer_score, dealer_soft = _scores(dealer_hard, dealer_aces)
+    dealer_natural = dealer_score == 21
+
+    def dealer_hits(rows):
+        hits = dealer_score[rows] < 17
+        if rules.hit_soft_17:
+            hits |= (dealer_score[rows] == 17) & dealer_soft[rows]
+        return rows[hits]
+
+    drawing = dealer_hits(np.flatnonzero((score <= 21) & ~natural))
+    while len(drawing):
+        card = shoes.draw(drawing)
+        dealer_hard[drawing] += card
+        dealer_aces[drawing] += card == 1
+        dealer_score[drawing], dealer_soft[drawing] = _scores(
+            dealer_hard[drawing], dealer_aces[drawing])
+        drawing = dealer_hits(drawing)
+
+    # Same outcomes as round_engine.settle_hand
+    win = (score <= 21) & ((dealer_score > 21) | (score > dealer_score))
+    lose = (score > 21) | ((dealer_score <= 21) & (dealer_score > score))
+    net = (bet * (win.astype(np.int8) - lose)).astype(np.float64)
+    net[natural] = np.where(dealer_natural[natural], 0.0, rules.blackjack_pays)
+    net[dealer_natural & ~natural] = -bet[dealer_natural & ~natural]
+    return net
+
+
+def simulate_batch(hands, table=None, rules=DEFAULT_RULES, seed=0,
+                   batch_size=100_000):
+    """Play many hands in batches and return the net units of every hand.
+    Each batch draws from its own seeding stream (seed, batch index)."""
+    _require_numpy()
+    if table is None:
+        table = threshold_table()
+    results = []
+    for batch, start in enumerate(range(0, hands, batch_size)):
+        rng = seeding.numpy_stream(seed, batch)
+        shoes = ShoeBatch(min(batch_size, hands - start), rng,
+                          rules.num_of_decks)
+        results.append(play_batch(shoes, table, rules))
+    return np.concatenate(results) if results else np.zeros(0)
+
+
+def cross_check(hands=200, table=None, rules=DEFAULT_RULES, seeds=(0, 1, 2)):
+    """Replay batches through the object RoundEngine and return the
+    (seed, hand) pairs where the two engines disagree"""
+    from bot import Bot
+    from dealer import Dealer
+    from decks import Deck
+    from round_engine import RoundEngine
+
+    if table is None:
+        table = threshold_table()
+    policy = table_policy(table)
+    player, dealer = Bot(policy), Dealer(rules)
+    mismatches = []
+    for seed in seeds:
+        shoes = ShoeBatch(hands, seeding.numpy_stream(seed, 0),
+                          rules.num_of_decks)
+        nets = play_batch(shoes, table, rules)
+        for hand, row in enumerate(shoes.dealt):
+            deck = Deck(rules.num_of_decks)
+            deck.cards = array("B", (int(rank) * len(SUITS) for rank in row))
+            result = RoundEngine(deck, dealer, policy).play_round(player, 1)
+            if result.net != nets[hand]:
+                mismatches.append((seed, hand))
+    return mismatches
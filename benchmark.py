@@ -0,0 +1,204 @@
+"""Throughput benchmarks for the dealing, scoring and settlement hot paths.
+
+Every benchmark is timed with timeit at 1, 4, 6 and 8 decks where the deck
+count matters, keeping the best of several repeats. The shallow
+round benchmarks reshuffle after a quarter of the shoe, with and without
+a ShoePipeline, to measure what pre-shuffling buys in rounds per second.
+Results are written as JSON so that runs can be compared:
+
+    python benchmark.py --output before.json
+    python benchmark.py --compare before.json
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from dataclasses import replace
+from bot import Bot
+from card_factory import CardFactory
+from cards import Card
+from dealer import Dealer
+from decks import Deck
+from round_engine import RoundEngine
+from rules import DEFAULT_RULES
+from shoe_pipeline import ShoePipeline
+from shuffling import ThresholdShuffle
+from strategies import mimic_dealer
+
+DECK_COUNTS = (1, 4, 6, 8)
+ROUNDS = 1000  # Rounds per timed call of the round benchmark
+# Fraction of the shoe dealt before the shallow benchmarks reshuffle
+SHALLOW = 0.25
+
+
+def bench_draw_card(num_of_decks):
+    """Deal a whole shoe card by card"""
+    deck = Deck(num_of_decks)
+    deck.observers = []  # Count the cursor and lookup only
+    size = len(deck.cards)
+
+    def run():
+        deck.position = 0
+        draw = deck.draw_card
+        for _ in range(size):
+            draw()
+    return run, size
+
+
+def bench_shuffle_cards(num_of_decks):
+    deck = Deck(num_of_decks)
+    return deck.shuffle_cards, 1
+
+
+def bench_create_deck(num_of_decks):
+    return lambda: CardFactory.create_deck(num_of_decks), 1
+
+
+def bench_calculate_score(num_of_decks=None):
+    """Full recount of a soft three-card hand"""
+    player = Bot(mimic_dealer)
+    player.game_cards = [Card("A", "♠"), Card("5", "♥"), Card("K", "♣")]
+    return player.calculate_score, 1
+
+
+def bench_dealer_decision(num_of_decks=None):
+    dealer = Dealer(replace(DEFAULT_RULES, hit_soft_17=True))
+    dealer.game_cards = [Card("A", "♠"), Card("6", "♥")]
+    return dealer.make_decision, 1
+
+
+def bench_round(num_of_decks):
+    """Headless rounds with reshuffles, dealing to settlement. The shoe
+    reshuffles with 52 cards left, like the game, or with half of it left
+    when it holds a single deck, so rounds are not all shuffles."""
+    rules = replace(DEFAULT_RULES, num_of_decks=num_of_decks)
+    deck = Deck(num_of_decks)
+    deck.shuffle_cards()
+    shuffler = ThresholdShuffle(min(52, len(deck.cards) // 2))
+    engine = RoundEngine(deck, Dealer(rules), mimic_dealer)
+    player = Bot(mimic_dealer)
+
+    def run():
+        for _ in range(ROUNDS):
+            shuffler.before_round(deck)
+            engine.play_round(player, 1)
+    return run, ROUNDS
+
+
+def bench_shallow_round(num_of_decks, pipeline=None):
+    """Headless rounds reshuffling at shallow penetration. pipeline is None,
+    "thread" or "process"; the third value returned stops the worker."""
+    rules = replace(DEFAULT_RULES, num_of_decks=num_of_decks)
+    deck = Deck(num_of_decks)
+    deck.shuffle_cards()
+    shoes = None
+    if pipeline:
+        shoes = ShoePipeline(deck, process=pipeline == "process")
+    shuffler = ThresholdShuffle(int(len(deck.cards) * (1 - SHALLOW)))
+    engine = RoundEngine(deck, Dealer(rules), mimic_dealer)
+    player = Bot(mimic_dealer)
+
+    def run():
+        for _ in range(ROUNDS):
+            shuffler.before_round(deck)
+            engine.play_round(player, 1)
+    return run, ROUNDS, shoes.close if shoes else None
+
+
+BENCHMARKS = {
+    "draw_card": (bench_draw_card, DECK_COUNTS),
+    "shuffle_cards": (bench_shuffle_cards, DECK_COUNTS),
+    "create_deck": (bench_create_deck, DECK_COUNTS),
+    "calculate_score": (bench_calculate_score, (None,)),
+    "dealer_decision": (bench_dealer_decision, (None,)),
+    "round": (bench_round, DECK_COUNTS),
+    "shallow_round": (bench_shallow_round, DECK_COUNTS),
+    "shallow_round_thread": (
+        lambda decks: bench_shallow_round(decks, "thread"), DECK_COUNTS),
+    "shallow_round_process": (
+        lambda decks: bench_shallow_round(decks, "process"), DECK_COUNTS),
+}
+
+
+def time_per_op(run, ops, repeat=5, min_seconds=0.05):
+    """Best seconds per operation over repeat timings of at least
+    min_seconds each"""
+    timer = timeit.Timer(run)
+    number, elapsed = timer.autorange()
+    number = max(number, int(number * min_seconds / max(elapsed, 1e-9)) or 1)
+    return min(timer.repeat(repeat, number)) / (number * ops)
+
+
+def run_benchmarks(names=None, repeat=5, min_seconds=0.05):
+    """Run the named benchmarks (all by default) and return the report"""
+    results = []
+    for name in names or BENCHMARKS:
+        setup, deck_counts = BENCHMARKS[name]
+        for num_of_decks in deck_counts:
+            run, ops, *cleanup = setup(num_of_decks)
+            seconds = time_per_op(run, ops, repeat, min_seconds)
+            if cleanup and cleanup[0] is not None:
+                cleanup[0]()
+            results.append({"name": name, "decks": num_of_decks,
+                            "ns_per_op": seconds * 1e9,
+                            "ops_per_sec": 1 / seconds})
+    return {"python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "results": results}
+
+
+def compare(report, baseline, tolerance=0.10):
+    """Return (name, decks, change) for benchmarks more than tolerance slower
+    than in baseline; change is the relative increase in time per op"""
+    before = {(result["name"], result["decks"]): result["ns_per_op"]
+              for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        key = (result["name"], result["decks"])
+        if key in before:
+            change = result["ns_per_op"] / before[key] - 1
+            if change > tolerance:
+                regressions.append((*key, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Blackjack hot paths")
+    parser.add_argument("names", nargs="*",
+                        help=f"Benchmarks to run: {', '.join(BENCHMARKS)} "
+                             "(default: all)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare",
+                        help="Baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed slowdown before failing "
+                             "(default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(args.names, args.repeat)
+    for result in report["results"]:
+        decks = "" if result["decks"] is None else f"{result['decks']} decks"
+        print(f"{result['name']:<22} {decks:<8} "
+              f"{result['ns_per_op']:>12.1f} ns/op "
+              f"{result['ops_per_sec']:>14,.0f} ops/s")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for name, decks, change in regressions:
+            print(f"Regression: {name} ({decks} decks) is {change:.0%} slower")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
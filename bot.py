@@ -0,0 +1,12 @@
+from player import Player
+
+
+class Bot(Player):
+    """Automated player that follows a strategy policy"""
+    def __init__(self, policy):
+        super().__init__()
+        self.policy = policy
+
+    def make_decision(self, dealer, actions):
+        """Pick one of the available actions using the policy"""
+        return self.policy(self, dealer, actions)
@@ -0,0 +1,92 @@
+from constants import RANKS, SUITS
+
+CARDS_PER_DECK = len(RANKS) * len(SUITS)
+
+
+class CountingSystem:
+    """Point value (tag) of every rank in a card counting system"""
+    def __init__(self, name, tags, balanced=True):
+        self.name = name
+        # Indexed by rank index
+        self.tags = tuple(tags[rank] for rank in RANKS)
+        self.balanced = balanced
+
+    def initial_count(self, num_of_decks):
+        """Running count at the start of a shoe; unbalanced systems start
+        below zero so that their pivot lands on zero"""
+        if self.balanced:
+            return 0
+        return -sum(self.tags) * len(SUITS) * num_of_decks
+
+
+def _tags(ace, two, three, four, five, six, seven, eight, nine, ten):
+    tags = dict(zip(RANKS, (ace, two, three, four, five, six, seven, eight,
+                            nine)))
+    tags.update({"10": ten, "J": ten, "Q": ten, "K": ten})
+    return tags
+
+
+COUNTING_SYSTEMS = {
+    "hi-lo": CountingSystem("Hi-Lo", _tags(-1, 1, 1, 1, 1, 1, 0, 0, 0, -1)),
+    "ko": CountingSystem("KO", _tags(-1, 1, 1, 1, 1, 1, 1, 0, 0, -1),
+                         balanced=False),
+    "omega-ii": CountingSystem("Omega II",
+                               _tags(0, 1, 1, 2, 2, 2, 1, 0, -1, -2)),
+}
+
+
+class CountTracker:
+    """Keeps a running count and the remaining cards per rank of a Deck.
+
+    The tracker observes Deck.draw_card, so every card is counted in O(1)
+    as it leaves the shoe, the dealer's hole card included. Read the count
+    between rounds, once that card has been revealed.
+    """
+    def __init__(self, deck, system="hi-lo"):
+        if isinstance(system, str):
+            system = COUNTING_SYSTEMS[system]
+        self.system = system
+        self.deck = deck
+        self.running_count = 0
+        self.rank_remaining = []
+        self.shoe_shuffled(deck)
+        deck.add_observer(self)
+
+    def shoe_shuffled(self, deck):
+        self.running_count = self.system.initial_count(deck.num_of_decks)
+        self.rank_remaining = [len(deck.cards) // len(RANKS)] * len(RANKS)
+
+    def card_dealt(self, card):
+        rank_index = card.id // len(SUITS)
+        self.running_count += self.system.tags[rank_index]
+        self.rank_remaining[rank_index] -= 1
+
+    @property
+    def decks_remaining(self):
+        return self.deck.remaining / CARDS_PER_DECK
+
+    @property
+    def true_count(self):
+        """Running count per remaining deck"""
+        decks = self.decks_remaining
+        return self.running_count / decks if decks else 0.0
+
+
+class BetSpread:
+    """Bet in units of min_bet, keyed on the floored true count.
+
+    ramp is a sequence of (true count, units) pairs; the largest true count
+    not above the current one sets the bet, and anything below the ramp
+    bets one unit.
+    """
+    def __init__(self, ramp=((2, 2), (3, 4), (4, 8)), min_bet=1):
+        self.ramp = sorted(ramp)
+        self.min_bet = min_bet
+
+    def bet(self, true_count):
+        units = 1
+        for count, ramp_units in self.ramp:
+            if true_count < count:
+                break
+            units = ramp_units
+        return units * self.min_bet
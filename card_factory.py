@@ -1,4 +1,5 @@
-from cards import Card
+from array import array
+from cards import Card, CARDS
 from constants import SUITS, RANKS
 
 
@@ -12,20 +13,21 @@ class CardFactory:
     def create_debug_cards() -> list:
         """Create cards for debugging split hands"""
         return [
-            Card("10", "S"),
-            Card("5", "S"),
-            Card("10", "S"),
-            Card("9", "S"),
-            Card("10", "S"),
-            Card("10", "S")
+            Card("10", "♠"),
+            Card("5", "♠"),
+            Card("10", "♠"),
+            Card("9", "♠"),
+            Card("10", "♠"),
+            Card("10", "♠")
         ]
     
     @staticmethod
     def create_deck(num_of_decks: int = 1) -> list:
         """Create a full deck of cards"""
-        cards = []
-        for _ in range(num_of_decks):
-            for suit in SUITS:
-                for rank in RANKS:
-                    cards.append(CardFactory.create_standard_card(rank, suit))
-        return cards
\ No newline at end of file
+        deck = [Card(rank, suit) for suit in SUITS for rank in RANKS]
+        return deck * num_of_decks
+
+    @staticmethod
+    def create_shoe(num_of_decks: int = 1) -> array:
+        """Create a shoe as a compact buffer of card ids"""
+        return array("B", range(len(CARDS))) * num_of_decks
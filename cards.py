@@ -1,8 +1,54 @@
+from constants import SUITS, RANKS
+
+
+# Lookup tables indexed by position in RANKS
+RANK_VALUES = tuple(
+    1 if rank == "A" else 10 if rank in ("J", "Q", "K") else int(rank)
+    for rank in RANKS
+)
+RANK_IS_ACE = tuple(rank == "A" for rank in RANKS)
+
+
 class Card():
-    def __init__(self, rank, suit):
-        self.suit = suit
-        self.rank = rank
-        self.code = rank + suit
+    """Immutable playing card.
+
+    Cards are interned: Card(rank, suit) always returns the same object, so
+    a shoe only needs to store small integer ids (rank index * 4 + suit
+    index) that point into CARDS.
+    """
+    __slots__ = ("rank", "suit", "code", "id", "value", "is_ace")
+    _interned = {}
+
+    def __new__(cls, rank, suit):
+        card = cls._interned.get((rank, suit))
+        if card is None:
+            card = super().__new__(cls)
+            object.__setattr__(card, "rank", rank)
+            object.__setattr__(card, "suit", suit)
+            object.__setattr__(card, "code", rank + suit)
+            if rank in RANKS and suit in SUITS:
+                rank_index = RANKS.index(rank)
+                card_id = rank_index * len(SUITS) + SUITS.index(suit)
+                value = RANK_VALUES[rank_index]
+                is_ace = RANK_IS_ACE[rank_index]
+            else:
+                # Placeholders such as "?"
+                card_id, value, is_ace = None, 0, False
+            object.__setattr__(card, "id", card_id)
+            # Hard value, aces count 1
+            object.__setattr__(card, "value", value)
+            object.__setattr__(card, "is_ace", is_ace)
+            cls._interned[(rank, suit)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Cards are immutable")
+
+    def __reduce__(self):
+        return (Card, (self.rank, self.suit))
+
+    def __repr__(self):
+        return f"Card({self.rank!r}, {self.suit!r})"
 
     def get_card_info(self):
         info = {
@@ -14,12 +60,9 @@ class Card():
         return info
 
     def get_card_value(self):
-        if self.rank in ["J", "Q", "K"]:
-            return [10]
-        elif self.rank == "A":
+        if self.is_ace:
             return [1, 11]
-        else:
-            return [int(self.rank)]
+        return [self.value]
         
     def get_card_ascii(self):
         """Generate ASCII art representation of a card"""
@@ -29,4 +72,8 @@ class Card():
         middle2 = f"│       {self.rank:>2}│"
         bottom = f"└─────────┘"
         
-        return [top, middle, suit_line, middle2, bottom]
\ No newline at end of file
+        return [top, middle, suit_line, middle2, bottom]
+
+
+# The 52 distinct cards, indexed by card id
+CARDS = tuple(Card(rank, suit) for rank in RANKS for suit in SUITS)
@@ -25,4 +25,22 @@ class AccountActions(Enum):
     CHANGE_PASSWORD = "change password"
     CHANGE_USERNAME = "change username"
     VIEW_BALANCE = "view balance"
-    BACK = "back"
\ No newline at end of file
+    BACK = "back"
+
+class Outcomes(Enum):
+    WIN = "win"
+    LOSE = "lose"
+    PUSH = "push"
+    BUST = "bust"
+    SURRENDER = "surrender"
+
+class RoundEvents(Enum):
+    DEAL = "deal"
+    HIT = "hit"
+    DOUBLE_DOWN = "double"
+    SPLIT = "split"
+    HAND_DONE = "hand done"
+    NEXT_HAND = "next hand"
+    NEXT_SEAT = "next seat"
+    DEALER_TURN = "dealer turn"
+    DEALER_HIT = "dealer hit"
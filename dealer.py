@@ -1,11 +1,12 @@
 from player import Player
+from rules import DEFAULT_RULES
 
 
 class Dealer(Player):
-    def __init__(self):
+    def __init__(self, rules=DEFAULT_RULES):
         super().__init__()
+        self.rules = rules
         self.__card_showing = False
-        self.__shuffle_threshold = 52  # Reshuffle when this many cards remain
     
     @property
     def card_showing(self):
@@ -16,17 +17,14 @@ class Dealer(Player):
         self.__card_showing = value
     
     def make_decision(self):
-        """Dealer's automated decision based on standard rules"""
-        return self.score < 17  # Dealer must hit on 16 and below
-    
-    def should_shuffle(self, remaining_cards):
-        """Decides if deck should be shuffled based on remaining cards"""
-        return remaining_cards <= self.__shuffle_threshold
+        """Dealer's automated decision: hit on 16 and below, and on soft 17
+        under H17 rules"""
+        return self.rules.dealer_hits(self.score, self.is_soft)
     
     def get_visible_score(self):
         """Returns only the score of visible cards when hiding second card"""
         if not self.__card_showing and len(self._game_cards) > 0:
-            return self._game_cards[0].get_card_value()[0]
+            return self._game_cards[0].value
         return self.score
     
     def get_visible_cards(self):
@@ -0,0 +1,84 @@
+"""Exact distribution of the dealer's final hand for a given shoe.
+
+Compositions are tuples of remaining card counts per value: index 0 holds
+aces, index 8 nines and index 9 every ten-valued card. Results are tuples
+of probabilities in OUTCOMES order.
+"""
+from functools import lru_cache
+from cards import RANK_VALUES
+from constants import SUITS, NUMBER_OF_DECKS
+
+OUTCOMES = (17, 18, 19, 20, 21, "bust", "blackjack")
+BUST, BLACKJACK = 5, 6
+
+
+def composition_from_ranks(rank_counts):
+    """Collapse counts per constants.RANKS entry into counts per value"""
+    composition = [0] * 10
+    for rank_index, count in enumerate(rank_counts):
+        composition[RANK_VALUES[rank_index] - 1] += count
+    return tuple(composition)
+
+
+def shoe_composition(num_of_decks=NUMBER_OF_DECKS):
+    """Composition of a full shoe"""
+    per_rank = len(SUITS) * num_of_decks
+    return composition_from_ranks([per_rank] * len(RANK_VALUES))
+
+
+def remove_cards(composition, *values):
+    """Composition left after dealing cards with the given values"""
+    composition = list(composition)
+    for value in values:
+        composition[value - 1] -= 1
+    return tuple(composition)
+
+
+def dealer_distribution(upcard, composition, hit_soft_17=False):
+    """Probabilities of each dealer outcome given the upcard value and the
+    composition of the shoe after the upcard was dealt"""
+    return _outcomes(composition, upcard, upcard == 1, 1, hit_soft_17)
+
+
+@lru_cache(maxsize=1_000_000)
+def _outcomes(composition, hard, has_ace, cards, hit_soft_17):
+    # cards is capped at 3: only "one card" and "exactly two cards" matter
+    soft = has_ace and hard + 10 <= 21
+    score = hard + 10 if soft else hard
+    result = [0.0] * len(OUTCOMES)
+    # Stand like Dealer.make_decision
+    if (cards > 1 and score >= 17
+            and not (hit_soft_17 and score == 17 and soft)):
+        if score > 21:
+            result[BUST] = 1.0
+        elif score == 21 and cards == 2:
+            result[BLACKJACK] = 1.0
+        else:
+            result[score - 17] = 1.0
+        return tuple(result)
+
+    total = sum(composition)
+    next_cards = min(cards + 1, 3)
+    for index, count in enumerate(composition):
+        if not count:
+            continue
+        remaining = (composition[:index] + (count - 1,)
+                     + composition[index + 1:])
+        outcome = _outcomes(remaining, hard + index + 1,
+                            has_ace or index == 0, next_cards, hit_soft_17)
+        weight = count / total
+        for i, probability in enumerate(outcome):
+            result[i] += weight * probability
+    return tuple(result)
+
+
+def stand_ev(score, distribution):
+    """Expected net units for standing on score with a hand that is not a
+    natural, settled like settle_hand: a dealer natural beats it"""
+    ev = distribution[BUST] - distribution[BLACKJACK]
+    for index, final in enumerate((17, 18, 19, 20, 21)):
+        if score > final:
+            ev += distribution[index]
+        elif score < final:
+            ev -= distribution[index]
+    return ev
@@ -1,32 +1,144 @@
 import random
+from array import array
 from constants import NUMBER_OF_DECKS
+from cards import CARDS
 from card_factory import CardFactory
 
+try:
+    import numpy as np
+except ImportError:  # NumPy shuffles are optional
+    np = None
+
 
 class Deck():
-    def __init__(self, num_of_decks=NUMBER_OF_DECKS):
+    def __init__(self, num_of_decks=NUMBER_OF_DECKS, penetration=None,
+                 rng=None):
         self.num_of_decks = num_of_decks
-        self.cards = []
+        # random.Random, a NumPy Generator, or anything else with shuffle()
+        self.rng = rng if rng is not None else random.Random()
+        # Fraction of the shoe dealt before the cut card
+        self.penetration = penetration
+        self.cards = array("B")  # Card ids, see cards.CARDS
+        self.position = 0  # Index of the next card to deal
+        self.burned = []
+        self.cut_card = 0
+        # Notified of every card dealt face up and every shuffle
+        self.observers = []
+        # ShoePipeline supplying pre-shuffled shoes, if attached
+        self.pipeline = None
         self.create_deck()
     
     def create_deck(self):
-        self.cards = CardFactory.create_deck(self.num_of_decks)
+        self.cards = CardFactory.create_shoe(self.num_of_decks)
+        self.reset()
+
+    def reset(self):
+        """Return every card to the shoe and place the cut card"""
+        self.position = 0
+        self.burned = []
+        if self.penetration is None:
+            self.cut_card = len(self.cards)
+        else:
+            self.cut_card = int(len(self.cards) * self.penetration)
+        for observer in self.observers:
+            observer.shoe_shuffled(self)
+
+    def add_observer(self, observer):
+        """Register an object with card_dealt(card) and shoe_shuffled(deck)"""
+        self.observers.append(observer)
+
+    @property
+    def remaining(self):
+        """Number of cards left to deal"""
+        return len(self.cards) - self.position
+
+    def __len__(self):
+        return self.remaining
+
+    @property
+    def cut_card_reached(self):
+        return self.position >= self.cut_card
 
     def get_cards_info(self):
         card_info = []
-        for card in self.cards:
-            card_info.append(card.get_card_info())
+        for card_id in self.cards[self.position:]:
+            card_info.append(CARDS[card_id].get_card_info())
         return card_info
 
     def shuffle_cards(self):
-        random.shuffle(self.cards)
+        """Shuffle the whole shoe in place, including cards already dealt,
+        or swap in the next shoe of an attached ShoePipeline"""
+        if self.pipeline is not None:
+            self.cards = self.pipeline.next_shoe()
+        else:
+            shuffle_buffer(self.cards, self.rng)
+        self.reset()
+
+    def return_discards(self):
+        """Put the dealt cards back at random places in the shoe, as a
+        continuous shuffling machine does. A partial Fisher-Yates pass over
+        the dealt positions makes them a uniform draw from the whole shoe,
+        at one swap per returned card."""
+        cards, dealt, size = self.cards, self.position, len(self.cards)
+        if np is not None and isinstance(self.rng, np.random.Generator):
+            starts = np.arange(dealt)
+            picks = starts + self.rng.random(dealt) * (size - starts)
+            picks = picks.astype(np.int64).tolist()
+        else:
+            picks = [self.rng.randrange(i, size) for i in range(dealt)]
+        for i, j in enumerate(picks):
+            cards[i], cards[j] = cards[j], cards[i]
+        self.reset()
 
     def draw_card(self):
-        card = self.cards[0]
-        self.cards.pop(0)
+        card = CARDS[self.cards[self.position]]
+        self.position += 1
+        for observer in self.observers:
+            observer.card_dealt(card)
         return card
+
+    def deal(self, count):
+        """Deal several cards at once"""
+        cards = self._take(count)
+        for observer in self.observers:
+            for card in cards:
+                observer.card_dealt(card)
+        return cards
+
+    def burn(self, count=1):
+        """Discard cards from the top of the shoe without showing them"""
+        cards = self._take(count)
+        self.burned.extend(cards)
+        return cards
+
+    def _take(self, count):
+        if count > self.remaining:
+            raise IndexError("Not enough cards left in the shoe")
+        start = self.position
+        cards = [CARDS[card_id] for card_id in self.cards[start:start + count]]
+        self.position += count
+        return cards
     
     def debug_split_hands_deck(self):
         """Debugging function to make a deck to draw a split hand"""
-        splitting_cards = CardFactory.create_debug_cards()
-        self.cards = splitting_cards + self.cards
\ No newline at end of file
+        splitting_cards = array(
+            "B", (card.id for card in CardFactory.create_debug_cards()))
+        self.cards[self.position:self.position] = splitting_cards
+
+
+def shuffle_buffer(cards, rng):
+    """Shuffle an array of card ids in place with random.Random or a NumPy
+    Generator"""
+    if np is not None and isinstance(rng, np.random.Generator):
+        rng.shuffle(np.frombuffer(cards, dtype=np.uint8))
+    else:
+        rng.shuffle(cards)
+
+
+def shuffle_decks(decks, rng):
+    """Shuffle many equally sized Decks with one NumPy Generator call"""
+    shoes = np.array([deck.cards for deck in decks], dtype=np.uint8)
+    rng.permuted(shoes, axis=1, out=shoes)
+    for deck, shoe in zip(decks, shoes):
+        np.frombuffer(deck.cards, dtype=np.uint8)[:] = shoe
+        deck.reset()
@@ -1,24 +1,46 @@
 import decks
 import user
 import dealer
-import time
-import os
-from constants import Actions as A, GameActions as GA, MIN_BET
+import round_engine
+import shuffling
+import renderer
+from balance_journal import Entry, DEFAULT_JOURNAL, open_journal
+from hand_history import HandHistory, DEFAULT_DIRECTORY
+from instrumentation import instruments
+from shoe_pipeline import ShoePipeline
+from rules import DEFAULT_RULES
+from constants import Actions as A, Outcomes as O, RoundEvents as E
 
 
 class GameController:
-    def __init__(self):
-        self.deck = decks.Deck()
+    def __init__(self, rules=DEFAULT_RULES, rng=None,
+                 journal_path=DEFAULT_JOURNAL,
+                 history_directory=DEFAULT_DIRECTORY, pipeline=False,
+                 screen=None):
+        self.rules = rules
+        # Renderer for this session's terminal
+        self.screen = screen or renderer.screen
+        self.journal_path = journal_path
+        self.history_directory = history_directory
+        self.deck = decks.Deck(rules.num_of_decks, rng=rng)
         self.deck.shuffle_cards()
+        # Shuffle the next shoes in the background; a reshuffle then swaps
+        # one in
+        self.pipeline = ShoePipeline(self.deck) if pipeline else None
         # self.deck.debug_split_hands_deck()  # For debugging split hands (3 splits, 4 hands)
-        self.dealer = dealer.Dealer()
+        self.dealer = dealer.Dealer(rules)
+        self.shuffler = shuffling.ThresholdShuffle()
+        self.shuffler.setup(self.deck)
         self.user = None
+        self.journal = None
+        self.history = None  # HandHistory of every round played
         self.play = False  # Add play state variable
-        self.hand_split = False 
+        self.engine = round_engine.RoundEngine(
+            self.deck, self.dealer, listener=self.on_round_event)
     
     def start_game(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("Welcome to the Blackjack Game!")
+        self.screen.clear()
+        self.screen.message("Welcome to the Blackjack Game!")
         self.login_user()
         self.play = True  # Set play to True after successful login
     
@@ -32,207 +54,175 @@ class GameController:
             self.play = False  # Set play to False to exit game
 
     def login_user(self):
-        username = input("Enter your username: ")
-        password = input("Enter your password: ")
+        username = self.screen.prompt("Enter your username: ")
+        password = self.screen.prompt("Enter your password: ")
+
+        # Recover balance changes a crash left in the journal before loading
+        self.journal = open_journal(user.User.account_store(),
+                                    self.journal_path)
+        self.history = HandHistory(self.history_directory)
         
         try:
             self.user = user.User.load_player_data(username, password)
-            print(f"Welcome back, {self.user.username}!")
-            print(f"Your current balance is: €{self.user.balance:.2f}")
+            self.screen.message(f"Welcome back, {self.user.username}!")
+            self.screen.message(
+                f"Your current balance is: €{self.user.balance:.2f}")
         except ValueError as e:
-            print(e)
+            self.screen.message(e)
             self.register_user(username, password)
+        self.user.journal = self.journal
+        self.user.rules = self.rules
+        self.user.screen = self.screen
     
     def register_user(self, username, password):
-        initial_balance = float(input("Enter your initial balance: €"))
+        initial_balance = float(
+            self.screen.prompt("Enter your initial balance: €"))
         self.user = user.User(username, password, initial_balance)
         self.user.save_player_data()
-        print(f"User {self.user.username} registered successfully!")
+        self.screen.message(
+            f"User {self.user.username} registered successfully!")
 
     def place_bet(self):
         while True:
             try:
-                print(f"\nYour balance: €{self.user.balance:.2f}")
-                print(f"Minimum bet: €{MIN_BET:.2f}")
-                bet = float(input("Enter your bet amount: €"))
+                self.screen.message(
+                    f"\nYour balance: €{self.user.balance:.2f}")
+                self.screen.message(f"Minimum bet: €{self.rules.min_bet:.2f}")
+                bet = float(self.screen.prompt("Enter your bet amount: €"))
                 self.user.bet_amount = bet
-                self.user.balance -= bet
+                self.user.adjust_balance(-bet, Entry.BET)
                 break
             except ValueError as e:
-                print(e)
+                self.screen.message(e)
 
     def play_round(self):
         """Handles the logic for playing a round of Blackjack."""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        # Check if deck needs shuffling
-        if self.dealer.should_shuffle(len(self.deck.cards)):
-            print("\nDealer is shuffling the deck...")
-            time.sleep(1.5)
-            self.deck = decks.Deck()
-            self.deck.shuffle_cards()
-
-        # Prepare for new round
-        self.user.clear_cards()
-        self.user.clear_splits()
-        self.dealer.clear_cards()
-        self.place_bet()
-
-        # Initial deal
-        for _ in range(2):
-            self.user.draw_card(self.deck.draw_card())
-            self.dealer.draw_card(self.deck.draw_card())
-
-        # Show initial hands
-        self.show_game_state(hide_dealer=True)
-        
-        # Player's turn
-        self.player_turn()
-
-        if self.user.split_hands:
-            self.play_split_hands()
-        else:
-            # Dealer's turn if player hasn't busted
-            if self.user.score <= 21:
-                os.system('pause')
-                self.dealer_turn()
-                self.show_game_state(hide_dealer=False)
-                self.determine_winner()
+        self.screen.clear()
+        with instruments.phase("shuffle"):
+            shuffled = self.shuffler.before_round(self.deck)
+        if shuffled:
+            instruments.count("shuffles")
+            if self.pipeline is None:
+                self.screen.message("\nDealer is shuffling the deck...")
+                self.screen.wait(self.shuffler.shuffle_seconds)
             else:
-                print("\nBust! You lose!")
+                self.screen.message(
+                    "\nDealer brings in a freshly shuffled shoe.")
 
-            os.system('pause')
-
-    def play_split_hands(self):
-        """Handles the logic for playing split hands."""
-        nobust_split_hands = []
-        nobust_split_bets = []
-        self.hand_split = True
-        
-        while self.user.split_hands:
-            hand = self.user.split_hands.pop(0)
-            bet = self.user.split_bets.pop(0)
-            self.user.game_cards = hand
-            self.user.bet_amount = bet
-            
-            self.show_game_state(hide_dealer=True)
-            self.player_turn()
-            
-            if self.user.score == 0:
-                continue # skip because player split his hand
-            elif self.user.score <= 21:
-                nobust_split_hands.append(hand)
-                nobust_split_bets.append(bet)
-                os.system('pause')
-            else:
-                print("\nBust! You lost this hand!")
-                os.system('pause')
-
-        if nobust_split_hands:
-            self.dealer_turn()
-            for i, hand in enumerate(nobust_split_hands):
-                self.user.game_cards = hand
-                self.user.bet_amount = nobust_split_bets[i]
-                self.show_game_state(hide_dealer=False)
-                self.determine_winner()
-                os.system('pause')
-
-    def show_game_state(self, hide_dealer=True):
+        self.place_bet()
+        with instruments.phase("deal"):
+            self.engine.start_round(self.user, self.user.bet_amount,
+                                    self.user.balance)
+        with instruments.phase("player_turn"):
+            while not self.engine.done:
+                actions = self.engine.available_actions()
+                self.engine.act(self.user.make_decision(playing=True,
+                                                        actions=actions))
+        with instruments.phase("dealer_turn"):
+            result = self.engine.finish_round()
+
+        with instruments.phase("determine_winner"):
+            for hand in result.hands:
+                if hand.outcome == O.BUST:
+                    continue  # Already reported when the hand busted
+                self.user.game_cards = hand.cards
+                self.show_game_state(hide_dealer=False, bet=hand.bet)
+                self.report_outcome(hand.outcome, hand.bet, hand.payout)
+                self.pay_out(hand.outcome, hand.payout)
+                self.screen.pause()
+
+        with instruments.phase("persist"):
+            if self.history is not None:
+                self.history.record(self.user.username, result,
+                                    self.user.balance)
+                self.history.flush()
+            if self.journal is not None:
+                self.journal.flush()  # Every round is durable once it ends
+                self.journal.maybe_checkpoint()
+        instruments.count("rounds")
+        instruments.count("hands", len(result.hands))
+
+    def on_round_event(self, event, engine):
+        """Renders the round as the engine plays it."""
+        if event in (E.DOUBLE_DOWN, E.SPLIT):
+            # Extra stake taken by the engine
+            self.user.adjust_balance(engine.bankroll - self.user.balance,
+                                     Entry.BET)
+        if event in (E.DEAL, E.HIT, E.DOUBLE_DOWN, E.NEXT_HAND):
+            self.show_game_state(hide_dealer=True, bet=engine.bet)
+        elif event == E.HAND_DONE:
+            if engine.player.score > 21:
+                if engine.hand_split:
+                    self.screen.message("\nBust! You lost this hand!")
+                else:
+                    self.screen.message("\nBust! You lose!")
+            self.screen.pause()
+        elif event == E.DEALER_TURN:
+            self.show_game_state(hide_dealer=False, bet=engine.bet)
+            self.screen.wait(1)
+        elif event == E.DEALER_HIT:
+            self.show_game_state(hide_dealer=False, bet=engine.bet)
+            self.screen.wait(1.5)
+
+    def show_game_state(self, hide_dealer=True, bet=None):
         """Displays the current game state."""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        if not hide_dealer: 
-            print("\n»»»»» DEALER'S TURN «««««")
-        else: 
-            print(f"\n»»»»» {self.user.username.upper()}'s TURN «««««")
-        print("\n" + "═"*40)
-
-        print("Dealer's hand:")
+        if bet is None:
+            bet = self.user.bet_amount
+        if not hide_dealer:
+            title = "»»»»» DEALER'S TURN «««««"
+        else:
+            title = f"»»»»» {self.user.username.upper()}'s TURN «««««"
         self.dealer.card_showing = not hide_dealer
-        self.dealer.display_cards(hide_second=hide_dealer)
-        print(f"Score: {self.dealer.get_visible_score()}")
-    
-        # if hide_dealer and len(visible_cards) > 0:
-        #     print(f"[{visible_cards[0].code}, **]")
-        # else:
-        #     print([card.code for card in visible_cards])
-        # print(f"Score: {self.dealer.get_visible_score()}")
-
-        print("\nYour hand:")
-        self.user.display_cards(hide_second=False)
-        print(f"Score: {self.user.score}")
-        print(f"Current bet: €{self.user.bet_amount:.2f}")
-        print("═"*40)
-
-        if self.hand_split:
-            print(f"\nSplit hand with bet: €{self.user.bet_amount:.2f}")
-
-    def player_turn(self):
-        """Handles the logic for the player's turn."""
-        while self.user.score < 21:
-            decision = self.user.make_decision(playing=True)
-            if decision == GA.HIT.value:
-                self.handle_hit()
-            elif decision == GA.DOUBLE_DOWN.value:
-                self.handle_double()
-                break
-            elif decision == GA.SPLIT.value:
-                self.handle_split()
-                break
-            elif decision == GA.STAND.value:
-                break
-    
-    def handle_hit(self):
-        """Handles the logic for hitting."""
-        self.user.draw_card(self.deck.draw_card())
-        self.show_game_state(hide_dealer=True)
-
-    def handle_double(self):
-        """Handles the logic for doubling down."""
-        self.user.balance -= self.user.bet_amount
-        self.user.bet_amount *= 2
-        self.user.draw_card(self.deck.draw_card())
-        self.show_game_state(hide_dealer=True)
-
-    def handle_split(self):
-        """Handles the logic for splitting the player's hand."""
-        split_card = self.user.split_hand()
-
-        hand1 = self.user.game_cards + [self.deck.draw_card()]
-        hand2 = [split_card] + [self.deck.draw_card()]
-
-        self.user.clear_cards()
 
-        self.user.split_hands.extend([hand1, hand2])
-        self.user.split_bets.extend([self.user.bet_amount, self.user.bet_amount])
-
-        self.user.balance -= self.user.bet_amount
-
-    def dealer_turn(self):
-        """Handles the logic for the dealer's turn."""
-        self.show_game_state(hide_dealer=False)
-        time.sleep(1)
-        while self.dealer.make_decision():
-            self.dealer.draw_card(self.deck.draw_card())
-            self.show_game_state(hide_dealer=False)
-            time.sleep(1.5)
+        frame = ["", title, "", "═"*40, "Dealer's hand:"]
+        frame += self.dealer.card_lines(hide_second=hide_dealer)
+        frame += [f"Score: {self.dealer.get_visible_score()}", "",
+                  "Your hand:"]
+        frame += self.user.card_lines(hide_second=False)
+        frame += [f"Score: {self.user.score}", f"Current bet: €{bet:.2f}",
+                  "═"*40]
+        if self.engine.hand_split:
+            frame += ["", f"Split hand with bet: €{bet:.2f}"]
+        self.screen.show(frame)
+
+    def report_outcome(self, outcome, bet, payout=None):
+        """Prints the result of a settled hand."""
+        won = bet if payout is None else payout - bet
+        if outcome == O.WIN:
+            if won != bet:
+                self.screen.message(f"\nBlackjack! You win €{won}!")
+            elif self.dealer.score > 21:
+                self.screen.message(f"\nDealer busts! You win €{won}!")
+            else:
+                self.screen.message(f"\nYou win €{won}!")
+        elif outcome == O.PUSH:
+            self.screen.message("\nPush!")
+        elif outcome == O.SURRENDER:
+            self.screen.message(f"\nYou surrendered and get €{bet / 2} back.")
+        else:
+            self.screen.message("\nDealer wins!")
 
     def determine_winner(self):
         """Handles the logic for determining the winner of the round."""
-        dealer_score = self.dealer.score
-        player_score = self.user.score
-        
-        if dealer_score > 21:
-            print(f"\nDealer busts! You win €{self.user.bet_amount}!")
-            self.user.balance += self.user.bet_amount * 2
-        elif dealer_score > player_score:
-            print("\nDealer wins!")
-        elif dealer_score < player_score:
-            print(f"\nYou win €{self.user.bet_amount}!")
-            self.user.balance += self.user.bet_amount * 2
-        else:
-            print("\nPush!")
-            self.user.balance += self.user.bet_amount
+        bet = self.user.bet_amount
+        outcome, payout = round_engine.settle_hand(
+            self.user.score, self.dealer.score, bet, self.user.is_blackjack,
+            self.dealer.is_blackjack, rules=self.rules)
+        self.report_outcome(outcome, bet, payout)
+        self.pay_out(outcome, payout)
+
+    def pay_out(self, outcome, payout):
+        """Returns winnings and pushed bets to the user's balance."""
+        kinds = {O.PUSH: Entry.PUSH, O.SURRENDER: Entry.SURRENDER}
+        if payout:
+            self.user.adjust_balance(payout, kinds.get(outcome, Entry.PAYOUT))
 
     def save_and_exit(self):
         self.user.save_player_data()
-        print(f"\nThanks for playing! Your final balance is: ${self.user.balance:.2f}")
-        print("Your progress has been saved.")
\ No newline at end of file
+        self.journal.close()
+        self.history.close()
+        if self.pipeline is not None:
+            self.pipeline.close()
+        self.screen.message("\nThanks for playing! Your final balance is: "
+                            f"${self.user.balance:.2f}")
+        self.screen.message("Your progress has been saved.")
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""Binary log of every round played, with streaming readers and analytics.
+
+Each seat's round is one length-prefixed, checksummed record:
+
+    length  u32   size of the body
+    crc     u32   CRC32 of the body
+    round   <ddHBB  time, balance after the round, then the lengths of the
+                    username (in UTF-8 bytes), the dealer's cards and the hands
+    username bytes, then the dealer's card ids
+    per hand <ddBBBB  bet, payout, outcome, doubled, then the number of
+                      cards and actions, followed by the card ids and the
+                      action codes
+
+Card ids index cards.CARDS; outcomes and actions are stored as their index
+in Outcomes and GameActions. Files rotate once they pass max_bytes.
+Readers stop at the first torn or corrupt record, and reopening a log
+truncates it there so that new records are never written behind one.
+"""
+import argparse
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from cards import CARDS
+from constants import GameActions as GA, Outcomes as O
+
+DEFAULT_DIRECTORY = "history"
+
+_HEADER = struct.Struct("<II")  # Body length, CRC32 of the body
+_ROUND = struct.Struct("<ddHBB")
+MAX_RECORD = 1 << 20  # Larger lengths can only come from a corrupt header
+_HAND = struct.Struct("<ddBBBB")
+
+ACTIONS = list(GA)
+OUTCOMES = list(O)
+_ACTION_CODES = {action.value: code for code, action in enumerate(ACTIONS)}
+_OUTCOME_CODES = {outcome: code for code, outcome in enumerate(OUTCOMES)}
+
+
+@dataclass
+class HandRecord:
+    cards: list
+    bet: float
+    payout: float
+    outcome: O
+    doubled: bool
+    actions: list  # GameActions values
+
+    @property
+    def net(self):
+        return self.payout - self.bet
+
+
+@dataclass
+class RoundRecord:
+    time: float
+    username: str
+    balance: float  # After the round was settled
+    dealer_cards: list
+    hands: list
+
+    @property
+    def upcard(self):
+        return self.dealer_cards[0]
+
+    @property
+    def net(self):
+        return sum(hand.net for hand in self.hands)
+
+
+def encode_round(username, result, balance, timestamp):
+    """Pack a RoundResult into one record, header included"""
+    name = username.encode("utf-8")
+    parts = [_ROUND.pack(timestamp, balance, len(name),
+                         len(result.dealer_cards), len(result.hands)),
+             name, bytes(card.id for card in result.dealer_cards)]
+    for hand in result.hands:
+        parts.append(_HAND.pack(hand.bet, hand.payout,
+                                _OUTCOME_CODES[hand.outcome], hand.doubled,
+                                len(hand.cards), len(hand.actions)))
+        parts.append(bytes(card.id for card in hand.cards))
+        parts.append(bytes(_ACTION_CODES[action] for action in hand.actions))
+    body = b"".join(parts)
+    return _HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode_round(body):
+    """Unpack one record body (without its header)"""
+    (timestamp, balance, name_length, dealer_count,
+     hand_count) = _ROUND.unpack_from(body)
+    offset = _ROUND.size
+    username = body[offset:offset + name_length].decode("utf-8")
+    offset += name_length
+    dealer_cards = [CARDS[card_id]
+                    for card_id in body[offset:offset + dealer_count]]
+    offset += dealer_count
+
+    hands = []
+    for _ in range(hand_count):
+        (bet, payout, outcome, doubled, card_count,
+         action_count) = _HAND.unpack_from(body, offset)
+        offset += _HAND.size
+        cards = [CARDS[card_id]
+                 for card_id in body[offset:offset + card_count]]
+        offset += card_count
+        actions = [ACTIONS[code].value
+                   for code in body[offset:offset + action_count]]
+        offset += action_count
+        hands.append(HandRecord(cards, bet, payout, OUTCOMES[outcome],
+                                bool(doubled), actions))
+    return RoundRecord(timestamp, username, balance, dealer_cards, hands)
+
+
+def history_files(directory=DEFAULT_DIRECTORY):
+    """Log files in the order they were written"""
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.startswith("hands-") and name.endswith(".log")]
+
+
+class HandHistory:
+    """Appends rounds to the newest log file, rotating past max_bytes"""
+    def __init__(self, directory=DEFAULT_DIRECTORY,
+                 max_bytes=64 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        files = history_files(directory)
+        self.index = 1
+        if files:
+            name = os.path.basename(files[-1])
+            self.index = int(name[len("hands-"):-len(".log")])
+        self._open()
+
+    def _open(self):
+        self.path = os.path.join(self.directory, f"hands-{self.index:06d}.log")
+        intact = 0
+        if os.path.exists(self.path):
+            for intact, _ in _scan(self.path):
+                pass
+        self._file = open(self.path, "ab")
+        if self._file.tell() > intact:
+            self._file.truncate(intact)  # Drop a torn tail left by a crash
+            self._file.seek(intact)
+        self.size = intact
+
+    def record(self, username, result, balance, timestamp=None):
+        """Append one seat's RoundResult and the balance it left"""
+        if self.size >= self.max_bytes:
+            self.rotate()
+        record = encode_round(username, result, balance,
+                              time.time() if timestamp is None else timestamp)
+        self._file.write(record)
+        self.size += len(record)
+
+    def rotate(self):
+        self._file.close()
+        self.index += 1
+        self._open()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _scan(path, chunk_size=1 << 20):
+    """Yield (end offset, body) for every intact record of one log file,
+    stopping at a torn or corrupt one"""
+    with open(path, "rb") as file:
+        buffer = b""
+        offset = 0  # Into buffer
+        consumed = 0  # File offset of the start of buffer
+        while True:
+            needed = _HEADER.size
+            if len(buffer) - offset >= needed:
+                length, crc = _HEADER.unpack_from(buffer, offset)
+                if length > MAX_RECORD:
+                    return
+                needed += length
+            if len(buffer) - offset < needed:
+                more = file.read(max(chunk_size, needed))
+                if not more:
+                    return
+                consumed += offset
+                buffer = buffer[offset:] + more  # Keep the unread bytes
+                offset = 0
+                continue
+            body = buffer[offset + _HEADER.size:offset + needed]
+            if zlib.crc32(body) != crc:
+                return
+            offset += needed
+            yield consumed + offset, body
+
+
+def read_file(path, chunk_size=1 << 20):
+    """Yield every RoundRecord of one log file, stopping at a torn or
+    corrupt record. Memory use is bounded by chunk_size whatever the file
+    size."""
+    for _, body in _scan(path, chunk_size):
+        yield decode_round(body)
+
+
+def read_history(directory=DEFAULT_DIRECTORY):
+    """Yield every RoundRecord in the log, oldest first"""
+    for path in history_files(directory):
+        yield from read_file(path)
+
+
+def win_rate_by_upcard(records):
+    """{dealer upcard value: fraction of hands won}"""
+    wins, hands = {}, {}
+    for record in records:
+        upcard = record.upcard.value
+        for hand in record.hands:
+            hands[upcard] = hands.get(upcard, 0) + 1
+            wins[upcard] = wins.get(upcard, 0) + (hand.outcome == O.WIN)
+    return {upcard: wins[upcard] / hands[upcard] for upcard in sorted(hands)}
+
+
+def ev_by_action(records):
+    """{first action of a hand: mean net result per unit bet}"""
+    totals, hands = {}, {}
+    for record in records:
+        for hand in record.hands:
+            # None: dealt 21
+            action = hand.actions[0] if hand.actions else None
+            hands[action] = hands.get(action, 0) + 1
+            totals[action] = totals.get(action, 0.0) + hand.net / hand.bet
+    return {action: totals[action] / hands[action] for action in hands}
+
+
+def bankroll_curves(records):
+    """Yield (username, time, balance) after every round, tracing each
+    player's bankroll over their sessions"""
+    for record in records:
+        yield record.username, record.time, record.balance
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Summarise the hand history log")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_DIRECTORY)
+    args = parser.parse_args()
+
+    print("Win rate by dealer upcard:")
+    rates = win_rate_by_upcard(read_history(args.directory))
+    for upcard, rate in rates.items():
+        print(f"  {'A' if upcard == 1 else upcard:>2}: {rate:.2%}")
+    print("EV per unit by first action:")
+    for action, ev in ev_by_action(read_history(args.directory)).items():
+        print(f"  {action or 'dealt 21'}: {ev:+.4f}")
+    final = {}
+    for username, _, balance in bankroll_curves(read_history(args.directory)):
+        final[username] = balance
+    print("Latest balances:")
+    for username, balance in sorted(final.items()):
+        print(f"  {username}: €{balance:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Counters and monotonic phase timers for the round hot path.
+
+Instrumentation is off by default: phase() then hands back one shared
+no-op context manager and count() returns at once, so the hooks left in
+GameController cost a method call each. Enable it to collect samples:
+
+    instruments.enabled = True
+    with instruments.phase("deal"):
+        ...
+    instruments.summary()
+
+Time a phase spends blocked on the player (prompts, pauses, dealing
+delays) is left out by wrapping the wait in instruments.idle().
+"""
+import time
+import tracemalloc
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _Phase:
+    __slots__ = ("instruments", "name", "start", "memory", "idle")
+
+    def __init__(self, instruments, name):
+        self.instruments = instruments
+        self.name = name
+
+    def __enter__(self):
+        self.memory = tracemalloc.is_tracing()
+        if self.memory:
+            tracemalloc.reset_peak()
+            self.memory = tracemalloc.get_traced_memory()[0]
+        self.idle = 0
+        self.instruments.current = self
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        instruments = self.instruments
+        elapsed = time.perf_counter_ns() - self.start - self.idle
+        instruments.current = None
+        instruments.timings.setdefault(self.name, []).append(elapsed)
+        if self.memory is not False:
+            peak = tracemalloc.get_traced_memory()[1] - self.memory
+            instruments.peaks.setdefault(self.name, []).append(peak)
+        return False
+
+
+class _Idle:
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.phase.idle += time.perf_counter_ns() - self.start
+        return False
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Instruments:
+    """Named counters and per-phase latency samples (in nanoseconds). Phases
+    must not nest: when tracemalloc is tracing, each one also records the
+    peak memory it allocated above its starting point."""
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.counters = {}
+        self.timings = {}  # {phase: [nanoseconds]}
+        self.peaks = {}    # {phase: [bytes]}
+        self.current = None  # Phase being timed, if any
+
+    def phase(self, name):
+        """Context manager timing one run of a phase"""
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def idle(self):
+        """Context manager leaving its time out of the phase being timed"""
+        if self.current is None:
+            return _NO_PHASE
+        return _Idle(self.current)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        self.counters = {}
+        self.timings = {}
+        self.peaks = {}
+
+    def summary(self):
+        """Counters plus count, total and p50/p99 latency in milliseconds per
+        phase, and p50 peak bytes where memory was traced"""
+        phases = {}
+        for name, samples in self.timings.items():
+            phases[name] = {"count": len(samples),
+                            "total_ms": sum(samples) / 1e6,
+                            "p50_ms": percentile(samples, 0.50) / 1e6,
+                            "p99_ms": percentile(samples, 0.99) / 1e6}
+            if name in self.peaks:
+                phases[name]["peak_bytes_p50"] = percentile(self.peaks[name],
+                                                            0.50)
+        return {"counters": dict(self.counters), "phases": phases}
+
+
+instruments = Instruments()
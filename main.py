@@ -1,10 +1,69 @@
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
 from game_controller import GameController
+from instrumentation import instruments
 
 
-# Main game loop
-if __name__ == "__main__":
-    game = GameController()
+def run_session(game):
     game.start_game()
-    
+
     while game.play:
-        game.handle_action()
\ No newline at end of file
+        game.handle_action()
+
+
+def profile_session(game, directory):
+    """Play a session under cProfile and tracemalloc, then write the raw
+    profile, the stats sorted by cumulative time and a JSON summary of
+    rounds per second, memory per round and phase latencies"""
+    os.makedirs(directory, exist_ok=True)
+    instruments.enabled = True
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.runcall(run_session, game)
+    finally:
+        seconds = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(os.path.join(directory, "session.prof"))
+        text = io.StringIO()
+        stats = pstats.Stats(profiler, stream=text)
+        stats.sort_stats("cumulative").print_stats(40)
+        with open(os.path.join(directory, "stats.txt"), "w") as file:
+            file.write(text.getvalue())
+
+        summary = instruments.summary()
+        rounds = summary["counters"].get("rounds", 0)
+        summary["seconds"] = seconds
+        summary["rounds_per_sec"] = rounds / seconds if seconds else 0.0
+        # Peak traced memory of each phase, summed over the phases of a round
+        summary["peak_bytes_per_round"] = sum(
+            phase.get("peak_bytes_p50", 0)
+            for phase in summary["phases"].values())
+        summary["traced_bytes"] = {"current": current, "peak": peak}
+        with open(os.path.join(directory, "summary.json"), "w") as file:
+            json.dump(summary, file, indent=2)
+
+
+# Main game loop
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Blackjack")
+    parser.add_argument("--profile", nargs="?", const="profile",
+                        metavar="DIRECTORY",
+                        help="Profile the session and write the stats to "
+                             "DIRECTORY (default: profile)")
+    args = parser.parse_args()
+
+    game = GameController(pipeline=True)
+    if args.profile:
+        profile_session(game, args.profile)
+    else:
+        run_session(game)
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from cards import Card
+from renderer import hand_lines
 
 
 class Player(ABC):
     def __init__(self):
         self._score = 0
         self._game_cards = []
+        self._hard_total = 0  # Every ace counted as 1
+        self._aces = 0
+        self._soft = False    # An ace is currently counted as 11
 
     @property
     def score(self):
@@ -14,6 +17,27 @@ class Player(ABC):
     @score.setter
     def score(self, new_score):
         self._score = new_score
+
+    @property
+    def hard_total(self):
+        return self._hard_total
+
+    @property
+    def is_soft(self):
+        return self._soft
+
+    @property
+    def is_bust(self):
+        return self._score > 21
+
+    @property
+    def is_blackjack(self):
+        return self._score == 21 and len(self._game_cards) == 2
+
+    @property
+    def is_pair(self):
+        return (len(self._game_cards) == 2 and
+                self._game_cards[0].rank == self._game_cards[1].rank)
     
     @property
     def game_cards(self):
@@ -27,55 +51,47 @@ class Player(ABC):
     def draw_card(self, card):
         """Add a card to player's hand and update score"""
         self._game_cards.append(card)
-        self.calculate_score()
+        self._aces += card.is_ace
+        self._hard_total += card.value
+        self._update_score()
     
+    def split_hand(self):
+        """Split hand and return the second card"""
+        card = self._game_cards.pop()
+        self._aces -= card.is_ace
+        self._hard_total -= card.value
+        self._update_score()
+        return card
+
     def clear_cards(self):
         """Clear player's hand"""
         self._game_cards = []
         self._score = 0
+        self._hard_total = 0
+        self._aces = 0
+        self._soft = False
     
     def calculate_score(self):
-        """Calculate the total score of cards in hand"""
-        self._score = 0
-        total_aces = 0
-        non_ace_sum = 0
-
+        """Recalculate the score from every card in hand"""
+        self._hard_total = 0
+        self._aces = 0
         for card in self._game_cards:
-            card_values = card.get_card_value()
-            
-            if card.rank == 'A':
-                total_aces += 1
-            else:
-                non_ace_sum += card_values[0]
+            self._aces += card.is_ace
+            self._hard_total += card.value
+        self._update_score()
 
-        # Handle aces optimally
-        self._score = non_ace_sum
-        for _ in range(total_aces):
-            if self._score + 11 <= 21:
-                self._score += 11
-            else:
-                self._score += 1
+    def _update_score(self):
+        # At most one ace can count as 11 without busting
+        if self._aces and self._hard_total + 10 <= 21:
+            self._score = self._hard_total + 10
+            self._soft = True
+        else:
+            self._score = self._hard_total
+            self._soft = False
 
-    def display_cards(self, hide_second=False):
-        """Display multiple cards side by side"""
-        if not self.game_cards:
-            return
-        
-        # Get ASCII representation for each card
-        card_list = []
-        for i, card in enumerate(self.game_cards):
-            if i == 1 and hide_second:
-                hidden_card = Card("?", "?")
-                card_list.append(hidden_card.get_card_ascii())
-            else:
-                card_list.append(card.get_card_ascii())
-        
-        # Combine cards side by side
-        for i in range(5):  # 5 lines per card
-            line = ""
-            for card_ascii in card_list:
-                line += card_ascii[i] + " "
-            print(line)
+    def card_lines(self, hide_second=False):
+        """Lines showing the cards side by side"""
+        return hand_lines(self.game_cards, hide_second)
     
     @abstractmethod
     def make_decision(self):
@@ -0,0 +1,138 @@
+"""Terminal output in whole frames.
+
+A frame is a list of lines written with one sys.stdout.write. Only lines
+that differ from what is already on screen are redrawn, using ANSI cursor
+addressing, so the screen is never cleared by spawning a shell. Messages
+and prompts are added below the current frame and tracked the same way.
+
+Input, output and delays all go through a session's Renderer, so a
+session can be driven headless by a Script of recorded keystrokes:
+
+    script = Script(keys)
+    game = GameController(screen=script.screen)
+"""
+import io
+import re
+import shutil
+import sys
+import time
+from functools import lru_cache
+from cards import Card
+from instrumentation import instruments
+
+HIDDEN_CARD = Card("?", "?")
+
+
+def move_to(row):
+    """ANSI sequence moving the cursor to the start of a 0-based row"""
+    return f"\x1b[{row + 1};1H"
+
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+ANSI_SEQUENCE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+@lru_cache(maxsize=None)
+def card_art(card):
+    """ASCII art of a card, built once per card"""
+    return tuple(card.get_card_ascii())
+
+
+def hand_lines(cards, hide_second=False):
+    """ASCII art of cards side by side"""
+    arts = [card_art(HIDDEN_CARD if i == 1 and hide_second else card)
+            for i, card in enumerate(cards)]
+    return [" ".join(rows) + " " for rows in zip(*arts)]
+
+
+class Renderer:
+    def __init__(self, out=None, read=None, sleep=None):
+        self.out = out      # Defaults to sys.stdout at write time
+        self.read = read    # Defaults to input at read time
+        self.sleep = sleep  # Defaults to time.sleep at wait time
+        self.lines = []    # What is on screen, from the top row down
+        self.stale = True  # Screen content unknown; redraw everything
+
+    def write(self, text):
+        out = self.out or sys.stdout
+        out.write(text)
+        out.flush()
+
+    def show(self, lines):
+        """Replace the screen with a new frame"""
+        lines = "\n".join(lines).split("\n") if lines else []
+        if self.stale:
+            self.write(CLEAR_SCREEN + "".join(line + "\n" for line in lines))
+        else:
+            parts = [move_to(row) + line + CLEAR_LINE
+                     for row, line in enumerate(lines)
+                     if row >= len(self.lines) or self.lines[row] != line]
+            parts.append(move_to(len(lines)) + CLEAR_BELOW)
+            self.write("".join(parts))
+        self.lines = lines
+        self._check_height()
+
+    def clear(self):
+        self.show([])
+
+    def message(self, text=""):
+        """Add lines below the current frame, like print"""
+        lines = str(text).split("\n")
+        self.write("".join(line + "\n" for line in lines))
+        self.lines.extend(lines)
+        self._check_height()
+
+    def prompt(self, text):
+        """Ask for a line of input below the current frame, like input"""
+        self.write(text)
+        with instruments.idle():  # Think time is not game work
+            answer = (self.read or input)()
+        self.lines.append(text + answer)
+        self._check_height()
+        return answer
+
+    def pause(self, text="Press Enter to continue..."):
+        self.prompt(text)
+
+    def wait(self, seconds):
+        """Hold the screen for a dealing delay"""
+        with instruments.idle():
+            (self.sleep or time.sleep)(seconds)
+
+    def _check_height(self):
+        # Once the terminal scrolls, row addresses no longer match self.lines
+        self.stale = len(self.lines) >= shutil.get_terminal_size().lines - 1
+
+
+screen = Renderer()  # Shared by the terminal client
+
+
+class Script:
+    """Recorded keystrokes for a headless session, with a Renderer of its
+    own to pass to GameController. Every prompt reads the next line, output
+    is kept in memory and waits return at once."""
+    def __init__(self, keys):
+        self.keys = iter(keys)
+        self.output = io.StringIO()
+        self.prompts = 0
+        self.waited = 0.0  # Seconds the session would have slept
+        self.screen = Renderer(out=self.output, read=self.read,
+                               sleep=self.sleep)
+
+    def read(self):
+        try:
+            answer = next(self.keys)
+        except StopIteration:
+            raise EOFError("Script ran out of keystrokes") from None
+        self.prompts += 1
+        return answer
+
+    def sleep(self, seconds):
+        self.waited += seconds
+
+    @property
+    def text(self):
+        """Everything written, without the ANSI control sequences"""
+        return ANSI_SEQUENCE.sub("", self.output.getvalue())
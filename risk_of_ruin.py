@@ -0,0 +1,187 @@
+"""Vectorized bankroll trajectories and risk of ruin.
+
+Every path starts from the same bankroll and plays rounds whose net result
+is drawn from a per-round outcome distribution, such as the outcomes of a
+simulate() run, in units of the table's minimum bet. A path is ruined once
+its balance drops below the minimum bet, when no further bet can be
+placed, and stays there. All paths advance together as NumPy arrays, a
+block of rounds at a time.
+
+Rounds are drawn independently, so the streaks of a single shoe (and of a
+count-driven bet spread within it) are averaged out.
+"""
+import argparse
+from dataclasses import dataclass, field
+import seeding
+from rules import DEFAULT_RULES, add_rule_arguments, rules_from_args
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the trajectories
+    np = None
+
+PERCENTILES = (5, 25, 50, 75, 95)
+BLOCK_CELLS = 1 << 21  # Rounds times paths drawn per block
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "Bankroll trajectories require NumPy: pip install numpy")
+
+
+def outcome_distribution(outcomes):
+    """(values, probabilities) arrays from a {net units: count} dict such as
+    SimulationStats.outcomes, or from an array of per-round nets such as
+    simulate_batch returns"""
+    _require_numpy()
+    if isinstance(outcomes, dict):
+        values = np.array(sorted(outcomes), dtype=np.float64)
+        counts = np.array([outcomes[value] for value in sorted(outcomes)],
+                          dtype=np.float64)
+    else:
+        values, counts = np.unique(np.asarray(outcomes, dtype=np.float64),
+                                   return_counts=True)
+    return values, counts / counts.sum()
+
+
+@dataclass
+class RuinReport:
+    bankroll: float
+    rounds: int
+    paths: int
+    bust_rounds: "np.ndarray"   # Round each path went bust in, 0 if never
+    final: "np.ndarray"         # Balance of every path after the last round
+    checkpoints: "np.ndarray"   # Rounds the curves are sampled at, 0 included
+    # {percentile: balances at the checkpoints}
+    curves: dict = field(default_factory=dict)
+
+    @property
+    def ruined(self):
+        return int(np.count_nonzero(self.bust_rounds))
+
+    @property
+    def risk_of_ruin(self):
+        return self.ruined / self.paths
+
+    def rounds_to_bust(self, percentiles=(10, 50, 90)):
+        """{percentile: rounds} over the ruined paths only"""
+        busts = self.bust_rounds[self.bust_rounds > 0]
+        if not busts.size:
+            return {}
+        return dict(zip(percentiles,
+                        np.percentile(busts, percentiles).tolist()))
+
+
+def simulate_bankrolls(values, probabilities, bankroll,
+                       unit=DEFAULT_RULES.min_bet, rounds=10_000,
+                       paths=10_000, seed=0, min_bet=None, points=100,
+                       percentiles=PERCENTILES):
+    """Evolve paths bankrolls over rounds and return a RuinReport.
+
+    values are net results per round in units, scaled by unit (the money
+    value of one unit); min_bet, the table minimum, defaults to unit. The
+    percentile curves are sampled at points + 1 evenly spaced rounds.
+    """
+    _require_numpy()
+    if min_bet is None:
+        min_bet = unit
+    rng = seeding.numpy_stream(seed, "bankroll")
+    steps = np.asarray(values, dtype=np.float64) * unit
+    cdf = np.cumsum(probabilities, dtype=np.float64)
+    cdf /= cdf[-1]
+
+    balance = np.full(paths, float(bankroll))
+    alive = balance >= min_bet
+    bust_rounds = np.zeros(paths, dtype=np.int64)
+    checkpoints = np.unique(
+        np.linspace(0, rounds, points + 1).astype(np.int64))
+    curves = [np.percentile(balance, percentiles)]
+
+    block = max(1, min(rounds, BLOCK_CELLS // paths))
+    for start in range(0, rounds, block):
+        size = min(block, rounds - start)
+        draws = steps[np.searchsorted(cdf, rng.random((size, paths)),
+                                      side="right")]
+        draws[:, ~alive] = 0.0
+        path = balance + np.cumsum(draws, axis=0)
+
+        ruined = path < min_bet
+        busted = np.nonzero(alive & ruined.any(axis=0))[0]
+        if busted.size:
+            first = ruined[:, busted].argmax(axis=0)
+            bust_rounds[busted] = start + first + 1
+            # Ruin is terminal: hold each busted path at its ruined balance
+            after = np.arange(size)[:, None] > first
+            path[:, busted] = np.where(after, path[first, busted],
+                                       path[:, busted])
+            alive[busted] = False
+
+        marks = checkpoints[(checkpoints > start)
+                            & (checkpoints <= start + size)]
+        if marks.size:
+            curves.extend(np.percentile(path[marks - start - 1], percentiles,
+                                        axis=1).T)
+        balance = path[-1]
+
+    curves = np.array(curves)
+    return RuinReport(bankroll, rounds, paths, bust_rounds, balance,
+                      checkpoints,
+                      {q: curves[:, i] for i, q in enumerate(percentiles)})
+
+
+def main():
+    from card_counting import COUNTING_SYSTEMS
+    from simulate import simulate, parse_spread
+    from strategies import STRATEGIES
+
+    parser = argparse.ArgumentParser(
+        description="Bankroll trajectories and risk of ruin")
+    parser.add_argument("--bankroll", type=float, default=1000.0)
+    parser.add_argument("--unit", type=float,
+                        help="Money per betting unit (default: minimum bet)")
+    parser.add_argument("--rounds", type=int, default=10_000,
+                        help="Rounds per trajectory")
+    parser.add_argument("--paths", type=int, default=10_000)
+    parser.add_argument("--sim-rounds", type=int, default=200_000,
+                        help="Simulated rounds for the outcome distribution")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES),
+                        default="basic")
+    parser.add_argument("--count", choices=sorted(COUNTING_SYSTEMS),
+                        help="Counting system driving the bet spread")
+    parser.add_argument("--spread", default="2:2,3:4,4:8",
+                        help="True count:units pairs for --count "
+                             "(default: %(default)s)")
+    add_rule_arguments(parser)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rules = rules_from_args(args)
+    unit = args.unit or rules.min_bet
+    stats = simulate(args.sim_rounds, args.strategy, rules, args.workers,
+                     args.seed, count=args.count,
+                     spread=parse_spread(args.spread))
+    values, probabilities = outcome_distribution(stats.outcomes)
+    report = simulate_bankrolls(values, probabilities, args.bankroll, unit,
+                                args.rounds, args.paths, args.seed,
+                                min_bet=rules.min_bet)
+
+    print(f"Rules: {rules.name}  Seed: {args.seed}")
+    print(f"Mean net per round: {stats.mean:+.4f} units of €{unit:.2f}")
+    print(f"Risk of ruin over {report.rounds} rounds: "
+          f"{report.risk_of_ruin:.2%} "
+          f"({report.ruined}/{report.paths} paths)")
+    for q, busted in report.rounds_to_bust().items():
+        print(f"  p{q} rounds to bust: {busted:.0f}")
+    print("Bankroll percentiles:")
+    print("  round " + "".join(f"{f'p{q}':>11}" for q in report.curves))
+    last = len(report.checkpoints) - 1
+    for i in sorted({*range(0, last, max(1, last // 10)), last}):
+        balances = "".join(f"{curve[i]:>11.2f}"
+                           for curve in report.curves.values())
+        print(f"  {report.checkpoints[i]:>5}{balances}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+from dataclasses import dataclass
+from constants import GameActions as GA, Outcomes as O, RoundEvents as E
+from rules import DEFAULT_RULES
+
+
+def settle_hand(score, dealer_score, bet, natural=False, dealer_natural=False,
+                surrendered=False, rules=DEFAULT_RULES):
+    """Return the outcome of a finished hand and the amount paid back.
+    A natural is a two-card 21 on a hand that was not split; it beats any
+    other hand and pays rules.blackjack_pays. Surrender is late: a dealer
+    natural still takes the whole bet."""
+    if surrendered:
+        if dealer_natural:
+            return O.LOSE, 0
+        return O.SURRENDER, bet / 2
+    if score > 21:
+        return O.BUST, 0
+    if natural or dealer_natural:
+        if natural and dealer_natural:
+            return O.PUSH, bet
+        if natural:
+            return O.WIN, bet * (1 + rules.blackjack_pays)
+        return O.LOSE, 0
+    if dealer_score > 21 or score > dealer_score:
+        return O.WIN, bet * 2
+    if dealer_score > score:
+        return O.LOSE, 0
+    return O.PUSH, bet
+
+
+@dataclass
+class HandResult:
+    cards: list
+    bet: float
+    score: int
+    outcome: O
+    payout: float
+    doubled: bool = False
+    actions: tuple = ()  # GameActions values taken on this hand, in order
+
+    @property
+    def net(self):
+        return self.payout - self.bet
+
+
+@dataclass
+class RoundResult:
+    hands: list
+    dealer_cards: list
+    dealer_score: int
+
+    @property
+    def total_bet(self):
+        return sum(hand.bet for hand in self.hands)
+
+    @property
+    def total_payout(self):
+        return sum(hand.payout for hand in self.hands)
+
+    @property
+    def net(self):
+        return self.total_payout - self.total_bet
+
+
+class Hand:
+    """One hand of a seat: its cards, its stake and how it was played"""
+    __slots__ = ("cards", "bet", "actions", "doubled", "split_aces", "score")
+
+    def __init__(self, cards, bet, actions=(), split_aces=False):
+        self.cards = cards
+        self.bet = bet
+        # GameActions values, split hands inherit the split
+        self.actions = list(actions)
+        self.doubled = False
+        self.split_aces = split_aces  # Started from a split pair of aces
+        self.score = 0  # Final score, set when the hand is finished
+
+    @property
+    def natural(self):
+        # Split hands start with the split action, so they are never naturals
+        return self.score == 21 and len(self.cards) == 2 and not self.actions
+
+    @property
+    def surrendered(self):
+        return GA.SURRENDER.value in self.actions
+
+
+class Seat:
+    """Hand state of one player at the table for the current round.
+
+    Splitting keeps playing the left hand and pushes the right one on a
+    stack, so hands are played left to right however often they resplit.
+    """
+    __slots__ = ("player", "bankroll", "hand", "hand_split", "hand_count",
+                 "stack", "finished")
+
+    def __init__(self, player, bet, bankroll=float("inf")):
+        self.player = player
+        self.bankroll = bankroll
+        self.hand = Hand([], bet)  # The hand being played
+        self.hand_split = False
+        self.hand_count = 1  # Hands after splitting, for the resplit limit
+        self.stack = []      # Split hands waiting for their second card
+        self.finished = []   # Played Hands, in table order
+
+    @property
+    def bet(self):
+        return self.hand.bet
+
+
+class RoundEngine:
+    """Plays rounds of Blackjack without any input, output or delays.
+
+    A round seats one or more players against a single dealer turn. The
+    engine can be driven step by step (start_table or start_round, act,
+    finish_table or finish_round) or in one call with play_table or
+    play_round, which ask the policy for every decision. A policy is a
+    callable taking (player, dealer, actions) and returning one of the
+    GameActions values in actions. Seats play in order; the player, bet
+    and bankroll attributes always refer to the seat being played. Table
+    rules come from the dealer's RuleSet.
+    """
+
+    def __init__(self, deck, dealer, policy=None, listener=None):
+        self.deck = deck
+        self.dealer = dealer
+        self.policy = policy
+        self.listener = listener  # Called with (event, engine) if set
+        self.seats = []
+        self.seat_index = 0
+        self._seat = None
+        self.done = True  # True when no hand is waiting for a decision
+
+    @property
+    def rules(self):
+        return self.dealer.rules
+
+    @property
+    def player(self):
+        return None if self.done else self._seat.player
+
+    @property
+    def bet(self):
+        return self._seat.hand.bet
+
+    @property
+    def bankroll(self):
+        return self._seat.bankroll
+
+    @property
+    def doubled(self):
+        return self._seat.hand.doubled
+
+    @property
+    def hand_split(self):
+        return self._seat.hand_split
+
+    def _emit(self, event):
+        if self.listener is not None:
+            self.listener(event, self)
+
+    def start_round(self, player, bet, bankroll=float("inf")):
+        """Deal the initial cards to a single player. The bet must already
+        be taken from the bankroll, which only limits doubling down and
+        splitting."""
+        self.start_table([Seat(player, bet, bankroll)])
+
+    def start_table(self, seats):
+        """Deal the initial cards to every Seat, one card each in turn with
+        the dealer, as at a real table"""
+        self.seats = seats
+        self.seat_index = 0
+        self._seat = seats[0]
+        self.done = False
+
+        for seat in seats:
+            seat.player.clear_cards()
+            seat.hand.cards = seat.player.game_cards
+        self.dealer.clear_cards()
+        self.dealer.card_showing = False
+        for _ in range(2):
+            for seat in seats:
+                seat.player.draw_card(self.deck.draw_card())
+            self.dealer.draw_card(self.deck.draw_card())
+        self._emit(E.DEAL)
+
+        if self._seat.player.score >= 21:
+            self._finish_hand()
+
+    def available_actions(self):
+        """Actions allowed for the hand currently being played"""
+        seat = self._seat
+        hand = seat.hand
+        rules = self.rules
+        one_card = hand.split_aces and not rules.hit_split_aces
+        if one_card:
+            actions = [GA.STAND.value]
+        else:
+            actions = [GA.HIT.value, GA.STAND.value]
+        # Double/split only on the first turn, and never down to a zero
+        # balance
+        if len(hand.cards) == 2 and seat.bankroll > hand.bet:
+            if not one_card and (rules.double_after_split
+                                 or not seat.hand_split):
+                actions.append(GA.DOUBLE_DOWN.value)
+            if (seat.player.is_pair and seat.hand_count < rules.max_hands
+                    and (rules.resplit_aces or not hand.split_aces)):
+                actions.append(GA.SPLIT.value)
+        if rules.surrender and not hand.actions:
+            actions.append(GA.SURRENDER.value)
+        return actions
+
+    def act(self, action):
+        """Apply a decision to the hand currently being played"""
+        if action not in self.available_actions():
+            raise ValueError(f"Action not available: {action}")
+
+        seat = self._seat
+        hand = seat.hand
+        player = seat.player
+        hand.actions.append(action)
+        if action == GA.HIT.value:
+            player.draw_card(self.deck.draw_card())
+            self._emit(E.HIT)
+            if player.score >= 21:
+                self._finish_hand()
+        elif action == GA.DOUBLE_DOWN.value:
+            seat.bankroll -= hand.bet
+            hand.bet *= 2
+            hand.doubled = True
+            player.draw_card(self.deck.draw_card())
+            self._emit(E.DOUBLE_DOWN)
+            self._finish_hand()
+        elif action == GA.SPLIT.value:
+            split_card = player.split_hand()
+            hand.split_aces = split_card.is_ace
+            seat.stack.append(Hand([split_card], hand.bet, hand.actions,
+                                   hand.split_aces))
+            seat.bankroll -= hand.bet
+            seat.hand_split = True
+            seat.hand_count += 1
+            self._emit(E.SPLIT)
+            self._deal_second_card()
+        else:
+            self._finish_hand()
+
+    def _finish_hand(self):
+        seat = self._seat
+        seat.hand.score = seat.player.score
+        seat.finished.append(seat.hand)
+        self._emit(E.HAND_DONE)
+        self._next_hand()
+
+    def _next_hand(self):
+        seat = self._seat
+        if not seat.stack:
+            self._next_seat()
+            return
+        seat.hand = seat.stack.pop()
+        seat.player.game_cards = seat.hand.cards
+        self._deal_second_card()
+
+    def _deal_second_card(self):
+        """Complete a split hand; split aces that may not be hit are done
+        unless they can be resplit"""
+        seat = self._seat
+        seat.player.draw_card(self.deck.draw_card())
+        self._emit(E.NEXT_HAND)
+        if (seat.player.score >= 21
+                or self.available_actions() == [GA.STAND.value]):
+            self._finish_hand()
+
+    def _next_seat(self):
+        if self.seat_index + 1 == len(self.seats):
+            self.done = True
+            return
+        self.seat_index += 1
+        self._seat = self.seats[self.seat_index]
+        self._emit(E.NEXT_SEAT)
+        if self._seat.player.score >= 21:
+            self._finish_hand()
+
+    def dealer_turn(self):
+        """Reveal the hidden card and draw until the dealer stands"""
+        self.dealer.card_showing = True
+        self._emit(E.DEALER_TURN)
+        while self.dealer.make_decision():
+            self.dealer.draw_card(self.deck.draw_card())
+            self._emit(E.DEALER_HIT)
+
+    def finish_table(self):
+        """Play the dealer's hand once if any seat needs it and settle every
+        hand. Returns one RoundResult per seat."""
+        if any(not (hand.score > 21 or hand.natural or hand.surrendered)
+               for seat in self.seats for hand in seat.finished):
+            self.dealer_turn()
+
+        dealer_cards = self.dealer.game_cards
+        dealer_score = self.dealer.score
+        dealer_natural = dealer_score == 21 and len(dealer_cards) == 2
+        rules = self.rules
+        results = []
+        for seat in self.seats:
+            hands = []
+            for hand in seat.finished:
+                outcome, payout = settle_hand(
+                    hand.score, dealer_score, hand.bet, hand.natural,
+                    dealer_natural, hand.surrendered, rules)
+                hands.append(HandResult(hand.cards, hand.bet, hand.score,
+                                        outcome, payout, hand.doubled,
+                                        tuple(hand.actions)))
+            results.append(RoundResult(hands, dealer_cards, dealer_score))
+        return results
+
+    def finish_round(self):
+        """finish_table for a single seat"""
+        return self.finish_table()[0]
+
+    def play_table(self, seats):
+        """Play a whole round for every Seat, asking the policy for every
+        decision"""
+        self.start_table(seats)
+        while not self.done:
+            player = self._seat.player
+            actions = self.available_actions()
+            self.act(self.policy(player, self.dealer, actions))
+        return self.finish_table()
+
+    def play_round(self, player, bet, bankroll=float("inf")):
+        """Play a whole round for a single player"""
+        return self.play_table([Seat(player, bet, bankroll)])[0]
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, replace
+from fractions import Fraction
+from constants import NUMBER_OF_DECKS, MIN_BET
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Table rules shared by the dealer, the round engine, the solver and
+    the simulators.
+
+    Rule sets are frozen and hashable, so results computed for one (strategy
+    tables, simulations) can be cached by it.
+    """
+    num_of_decks: int = NUMBER_OF_DECKS
+    # H17; the dealer stands on every 17 otherwise (S17)
+    hit_soft_17: bool = False
+    # Payout of a natural: 1.5 for 3:2, 1.2 for 6:5
+    blackjack_pays: float = 1.0
+    double_after_split: bool = True   # DAS
+    # Hands a player may split up to, resplits included
+    max_hands: int = 4
+    # RSA; split aces may be split again within max_hands
+    resplit_aces: bool = True
+    # Split aces are played out; else they take one card each
+    hit_split_aces: bool = True
+    # Late surrender of half the bet on the first decision
+    surrender: bool = False
+    min_bet: float = MIN_BET
+    max_bet: float = float("inf")
+
+    def validate_bet(self, amount):
+        if amount < self.min_bet:
+            raise ValueError(
+                f"Bet amount must be at least €{self.min_bet:.2f}")
+        if amount > self.max_bet:
+            raise ValueError(f"Bet amount must be at most €{self.max_bet:.2f}")
+
+    def dealer_hits(self, score, soft):
+        """Whether the dealer draws on a hand"""
+        return score < 17 or (self.hit_soft_17 and score == 17 and soft)
+
+    @property
+    def name(self):
+        """Short description, e.g. 4D S17 1:1 DAS RSP4"""
+        payout = Fraction(self.blackjack_pays).limit_denominator(10)
+        parts = [f"{self.num_of_decks}D", "H17" if self.hit_soft_17 else "S17",
+                 f"{payout.numerator}:{payout.denominator}"]
+        if self.double_after_split:
+            parts.append("DAS")
+        parts.append(f"RSP{self.max_hands}")
+        if not self.resplit_aces:
+            parts.append("NRSA")
+        if not self.hit_split_aces:
+            parts.append("1SA")
+        if self.surrender:
+            parts.append("LS")
+        return " ".join(parts)
+
+
+DEFAULT_RULES = RuleSet()
+
+
+def parse_payout(text):
+    """Blackjack payout from "3:2", "6:5" or a plain number"""
+    if ":" in text:
+        numerator, denominator = text.split(":")
+        return int(numerator) / int(denominator)
+    return float(text)
+
+
+def add_rule_arguments(parser):
+    """Add the RuleSet options to an argparse parser"""
+    parser.add_argument("--decks", type=int,
+                        default=DEFAULT_RULES.num_of_decks)
+    parser.add_argument("--h17", action="store_true",
+                        help="Dealer hits soft 17")
+    parser.add_argument("--blackjack-pays", type=parse_payout,
+                        default=DEFAULT_RULES.blackjack_pays,
+                        help="Payout of a natural, e.g. 3:2 or 6:5 "
+                             "(default: 1:1)")
+    parser.add_argument("--no-das", action="store_true",
+                        help="No doubling after a split")
+    parser.add_argument("--max-hands", type=int,
+                        default=DEFAULT_RULES.max_hands,
+                        help="Hands a player may split up to "
+                             "(default: %(default)s)")
+    parser.add_argument("--no-resplit-aces", action="store_true",
+                        help="Split aces only once")
+    parser.add_argument("--one-card-split-aces", action="store_true",
+                        help="Split aces get one card each")
+    parser.add_argument("--surrender", action="store_true",
+                        help="Allow late surrender")
+    parser.add_argument("--max-bet", type=float, default=DEFAULT_RULES.max_bet)
+
+
+def rules_from_args(args):
+    return replace(DEFAULT_RULES, num_of_decks=args.decks,
+                   hit_soft_17=args.h17, blackjack_pays=args.blackjack_pays,
+                   double_after_split=not args.no_das,
+                   max_hands=args.max_hands,
+                   resplit_aces=not args.no_resplit_aces,
+                   hit_split_aces=not args.one_card_split_aces,
+                   surrender=args.surrender, max_bet=args.max_bet)
@@ -0,0 +1,39 @@
+"""Reproducible random number streams.
+
+Every stream is derived from a root seed and a path of keys (a chunk
+index, a table id, ...), so parallel workers get independent sequences
+that do not depend on process, platform or PYTHONHASHSEED, and any result
+can be replayed exactly from its seed.
+"""
+import hashlib
+import random
+import secrets
+
+try:
+    import numpy as np
+except ImportError:  # NumPy streams are optional
+    np = None
+
+
+def stream_seed(seed, *keys):
+    """128-bit integer seed of the stream at (seed, *keys)"""
+    path = "/".join(str(part) for part in (seed, *keys))
+    digest = hashlib.sha256(path.encode("utf-8")).digest()
+    return int.from_bytes(digest[:16], "little")
+
+
+def stream(seed, *keys):
+    """random.Random for the stream at (seed, *keys)"""
+    return random.Random(stream_seed(seed, *keys))
+
+
+def numpy_stream(seed, *keys):
+    """NumPy Generator for the stream at (seed, *keys)"""
+    if np is None:
+        raise ImportError("numpy_stream needs NumPy")
+    return np.random.default_rng(stream_seed(seed, *keys))
+
+
+def new_seed():
+    """A fresh root seed, for runs that should still be replayable"""
+    return secrets.randbits(63)
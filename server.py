@@ -0,0 +1,425 @@
+"""Asyncio game server hosting many Blackjack tables in one process.
+
+Clients speak a line-based text protocol over TCP or a unix socket:
+
+    register <username> <password> <balance>
+    login <username> <password>
+    join [table]        sit at a table (a new one is opened if needed)
+    bet <amount>        bet on the next round; the server then asks for actions
+    balance
+    leave
+    quit
+
+Replies start with OK, ERR, STATE, ACTIONS, RESULT or BALANCE.
+"""
+import argparse
+import asyncio
+import account_store
+import dealer
+import decks
+import round_engine
+import seeding
+import shuffling
+import user
+from balance_journal import Entry
+from hand_history import HandHistory, DEFAULT_DIRECTORY
+from rules import DEFAULT_RULES, add_rule_arguments, rules_from_args
+from shoe_pipeline import ShoePipeline
+from constants import GameActions as GA, Outcomes as O, RoundEvents as E
+
+DECISION_TIMEOUT = 60  # Seconds before an idle player stands
+PAYOUT_ENTRIES = {O.PUSH: Entry.PUSH, O.SURRENDER: Entry.SURRENDER}
+BET_WINDOW = 5  # Seconds a round waits for the rest of the table to bet
+
+
+class AsyncAccountStore:
+    """Runs a blocking AccountStore in worker threads"""
+    def __init__(self, store):
+        self.store = store
+
+    async def load(self, username):
+        return await asyncio.to_thread(self.store.load, username)
+
+    async def save(self, username, password, balance):
+        await asyncio.to_thread(self.store.save, username, password, balance)
+
+    async def create(self, username, password, balance):
+        return await asyncio.to_thread(self.store.create, username, password,
+                                       balance)
+
+    async def adjust_balance(self, username, delta):
+        return await asyncio.to_thread(self.store.adjust_balance, username,
+                                       delta)
+
+    async def adjust_balances(self, deltas):
+        """Apply {username: delta} in one batch, all or nothing"""
+        await asyncio.to_thread(self._adjust_balances, deltas)
+
+    def _adjust_balances(self, deltas):
+        with self.store.batch():
+            for username, delta in deltas.items():
+                self.store.adjust_balance(username, delta)
+
+
+class Table:
+    """A shoe and a dealer shared by the players seated at it.
+
+    Players bet into the next round; it starts once every seated player
+    has bet or BET_WINDOW seconds after the first bet, and the dealer then
+    plays once for every seat.
+    """
+    def __init__(self, table_id, store, max_seats=7, rules=DEFAULT_RULES,
+                 rng=None, shuffler=None, history=None, pipeline=False):
+        self.table_id = table_id
+        self.store = store
+        self.history = history  # HandHistory shared by every table, if any
+        self.max_seats = max_seats
+        self.rules = rules
+        self.deck = decks.Deck(rules.num_of_decks, rng=rng)
+        self.deck.shuffle_cards()
+        self.shuffler = shuffler or shuffling.ThresholdShuffle()
+        self.shuffler.setup(self.deck)
+        # A worker thread shuffles the next shoes while the table waits on
+        # players; a continuous shuffler never swaps shoes, so it needs none
+        self.pipeline = None
+        if pipeline and self.shuffler.whole_shoe:
+            self.pipeline = ShoePipeline(self.deck, depth=2)
+        self.dealer = dealer.Dealer(rules)
+        self.engine = round_engine.RoundEngine(self.deck, self.dealer,
+                                               listener=self.on_round_event)
+        self.seats = []
+        self.bets = {}  # Session: bet for the next round, in betting order
+        # Future of the next round's {session: RoundResult}
+        self.results = None
+        self.rounds = set()  # Running play_round tasks, kept until they finish
+        self.all_in = asyncio.Event()
+        self.lock = asyncio.Lock()  # One round at a time per table
+
+    @property
+    def full(self):
+        return len(self.seats) >= self.max_seats
+
+    def sit(self, session):
+        self.seats.append(session)
+        self.all_in.clear()
+
+    def stand_up(self, session):
+        self.seats.remove(session)
+        if self.bets and all(seat in self.bets for seat in self.seats):
+            self.all_in.set()
+
+    def close(self):
+        if self.pipeline is not None:
+            self.pipeline.close()
+            self.pipeline = None
+
+    def place_bet(self, session, bet):
+        """Add a bet to the next round and return the future of its results"""
+        self.bets[session] = bet
+        if self.results is None:
+            self.results = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(self.play_round())
+            self.rounds.add(task)
+            task.add_done_callback(self.rounds.discard)
+        if all(seat in self.bets for seat in self.seats):
+            self.all_in.set()
+        return self.results
+
+    async def play_round(self):
+        try:
+            await asyncio.wait_for(self.all_in.wait(), BET_WINDOW)
+        except asyncio.TimeoutError:
+            pass
+        bets, results = self.bets, self.results
+        self.bets, self.results = {}, None
+        self.all_in.clear()
+
+        try:
+            async with self.lock:
+                results.set_result(await self.deal(bets))
+        except Exception as e:
+            results.set_exception(e)
+
+    async def _play(self, bets):
+        """Play the round and settle the in-memory balances"""
+        self.shuffler.before_round(self.deck)
+        sessions = list(bets)
+        engine = self.engine
+        engine.start_table([
+            round_engine.Seat(session.user, bet, session.user.balance)
+            for session, bet in bets.items()])
+        while not engine.done:
+            session = sessions[engine.seat_index]
+            engine.act(await session.ask_action(engine))
+        results = dict(zip(sessions, engine.finish_table()))
+
+        for session, result in results.items():
+            for hand in result.hands:
+                if hand.payout:
+                    kind = PAYOUT_ENTRIES.get(hand.outcome, Entry.PAYOUT)
+                    session.user.adjust_balance(hand.payout, kind)
+        return results
+
+    def on_round_event(self, event, engine):
+        if event in (E.DOUBLE_DOWN, E.SPLIT):
+            # Extra stake taken by the engine from the seat still being played
+            player = engine.player
+            player.adjust_balance(engine.bankroll - player.balance, Entry.BET)
+
+    async def deal(self, bets):
+        """Play one round for every bet and persist the balances. If the
+        round fails before it is persisted, every bet is given back."""
+        before = {session: session.user.balance + bet
+                  for session, bet in bets.items()}
+        try:
+            results = await self._play(bets)
+            # Persist the whole round in one commit before replying, so neither
+            # a dropped connection nor a failed write leaves it half applied
+            deltas = {}
+            for session, result in results.items():
+                username = session.user.username
+                deltas[username] = deltas.get(username, 0.0) + result.net
+            await self.store.adjust_balances(deltas)
+        except Exception:
+            for session, balance in before.items():
+                session.user.adjust_balance(balance - session.user.balance,
+                                            Entry.BET)
+            raise
+        if self.history is not None:
+            for session, result in results.items():
+                self.history.record(session.user.username, result,
+                                    session.user.balance)
+            self.history.flush()
+        return results
+
+
+class Session:
+    """One connected client"""
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.user = None
+        self.table = None
+
+    async def send(self, line):
+        self.writer.write(line.encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def read_line(self, timeout=None):
+        line = await asyncio.wait_for(self.reader.readline(), timeout)
+        if not line:
+            raise ConnectionError("Client disconnected")
+        return line.decode("utf-8").strip()
+
+    async def run(self):
+        try:
+            while True:
+                words = (await self.read_line()).split()
+                if not words:
+                    continue
+                command, args = words[0].lower(), words[1:]
+                if command == "quit":
+                    await self.send("OK bye")
+                    break
+                handler = getattr(self, f"do_{command}", None)
+                if handler is None:
+                    await self.send(f"ERR unknown command: {command}")
+                    continue
+                try:
+                    await handler(*args)
+                except (TypeError, ValueError) as e:
+                    await self.send(f"ERR {e}")
+        except ConnectionError:
+            pass
+        finally:
+            self.leave_table()
+            self.writer.close()
+
+    async def do_register(self, username, password, balance):
+        new_user = user.User(username, password, float(balance))
+        if not await self.server.store.create(username, password,
+                                              new_user.balance):
+            raise ValueError("Username already taken!")
+        self.user = new_user
+        await self.send(f"OK registered {username}")
+
+    async def do_login(self, username, password):
+        data = await self.server.store.load(username)
+        if data is None:
+            raise ValueError(f"No saved data found for player: {username}")
+        if data["password"] != password:
+            raise ValueError("Invalid password")
+        self.user = user.User(data["username"], data["password"],
+                              data["balance"])
+        await self.send(f"OK welcome {username}")
+        await self.do_balance()
+
+    async def do_balance(self):
+        self.require_user()
+        await self.send(f"BALANCE {self.user.balance:.2f}")
+
+    async def do_join(self, table_id=None):
+        self.require_user()
+        self.leave_table()
+        self.table = self.server.find_table(
+            None if table_id is None else int(table_id))
+        self.table.sit(self)
+        self.user.rules = self.table.rules
+        await self.send(f"OK table {self.table.table_id} "
+                        f"seat {len(self.table.seats)}")
+
+    async def do_leave(self):
+        self.leave_table()
+        await self.send("OK left")
+
+    def leave_table(self):
+        if self.table is not None:
+            self.table.stand_up(self)
+            self.table = None
+
+    def require_user(self):
+        if self.user is None:
+            raise ValueError("Log in first")
+
+    async def do_bet(self, amount):
+        self.require_user()
+        if self.table is None:
+            raise ValueError("Join a table first")
+        if self in self.table.bets:
+            raise ValueError("Bet already placed")
+        bet = float(amount)
+        self.user.bet_amount = bet
+        self.user.adjust_balance(-bet, Entry.BET)
+        await self.send("OK waiting for the round")
+
+        try:
+            result = (await self.table.place_bet(self, bet))[self]
+        except Exception as e:  # The table gave the bet back
+            await self.send(f"ERR round failed: {e}")
+            await self.do_balance()
+            return
+        for hand in result.hands:
+            cards = " ".join(card.code for card in hand.cards)
+            await self.send(f"RESULT {hand.outcome.value} {hand.net:+.2f} "
+                            f"{cards} ({hand.score})")
+        dealer_cards = " ".join(card.code for card in result.dealer_cards)
+        await self.send(f"STATE dealer {dealer_cards} "
+                        f"({result.dealer_score})")
+        await self.do_balance()
+
+    async def ask_action(self, engine):
+        """Ask for a decision; idle or disconnected players stand"""
+        actions = engine.available_actions()
+        while True:
+            try:
+                await self.send(self.state_line(engine, hide_dealer=True))
+                await self.send("ACTIONS " + " ".join(actions))
+                action = (await self.read_line(DECISION_TIMEOUT)).lower()
+            except (asyncio.TimeoutError, ConnectionError):
+                return GA.STAND.value
+            if action in actions:
+                return action
+            await self.send(f"ERR invalid action: {action}")
+
+    def state_line(self, engine, hide_dealer):
+        dealer_cards = [card.code for card in engine.dealer.game_cards]
+        if hide_dealer:
+            dealer_cards[1:] = ["??"] * (len(dealer_cards) - 1)
+        hand = " ".join(card.code for card in engine.player.game_cards)
+        return (f"STATE hand {hand} ({engine.player.score}) "
+                f"bet {engine.bet:.2f} dealer {' '.join(dealer_cards)}")
+
+
+class GameServer:
+    def __init__(self, store=None, max_tables=10_000, max_seats=7,
+                 rules=DEFAULT_RULES, seed=None, shuffle="threshold",
+                 history=None, pipeline=False):
+        self.store = AsyncAccountStore(store or account_store.default_store())
+        self.max_tables = max_tables
+        self.max_seats = max_seats
+        self.rules = rules
+        self.shuffle = shuffle  # See shuffling.parse_shuffle_policy
+        # Replays every table
+        self.seed = seeding.new_seed() if seed is None else seed
+        self.history = history
+        self.pipeline = pipeline  # Pre-shuffle shoes on a thread per table
+        self.tables = {}
+
+    def find_table(self, table_id=None):
+        """Return the requested table, or any table with a free seat"""
+        if table_id is None:
+            table_id = next((table.table_id for table in self.tables.values()
+                             if not table.full),
+                            max(self.tables, default=-1) + 1)
+        table = self.tables.get(table_id)
+        if table is None:
+            if len(self.tables) >= self.max_tables:
+                raise ValueError("No tables available")
+            table = Table(table_id, self.store, self.max_seats, self.rules,
+                          seeding.stream(self.seed, "table", table_id),
+                          shuffling.parse_shuffle_policy(self.shuffle),
+                          self.history, self.pipeline)
+            self.tables[table_id] = table
+        if table.full:
+            raise ValueError(f"Table {table_id} is full")
+        return table
+
+    async def handle_client(self, reader, writer):
+        await Session(self, reader, writer).run()
+
+    def close(self):
+        """Stop the shoe pipelines of every table"""
+        for table in self.tables.values():
+            table.close()
+
+    async def start_tcp(self, host="127.0.0.1", port=8765):
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def start_unix(self, path):
+        return await asyncio.start_unix_server(self.handle_client, path)
+
+
+async def serve(args):
+    history = HandHistory(args.history)
+    game_server = GameServer(max_tables=args.tables,
+                             rules=rules_from_args(args),
+                             seed=args.seed, shuffle=args.shuffle,
+                             history=history, pipeline=args.pipeline)
+    if args.unix:
+        server = await game_server.start_unix(args.unix)
+    else:
+        server = await game_server.start_tcp(args.host, args.port)
+    print(f"Serving with seed {game_server.seed}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        game_server.close()
+        history.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Multi-table Blackjack server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix",
+                        help="Listen on a unix socket instead of TCP")
+    parser.add_argument("--tables", type=int, default=10_000)
+    parser.add_argument("--seed", type=int)
+    add_rule_arguments(parser)
+    parser.add_argument("--history", default=DEFAULT_DIRECTORY,
+                        help="Directory of the hand history log "
+                             "(default: %(default)s)")
+    parser.add_argument("--shuffle", default="threshold",
+                        help="threshold[:cards], cut[:penetration] or csm "
+                             "(default: %(default)s)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Shuffle the next shoes of every table on a "
+                             "background thread")
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
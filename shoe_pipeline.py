@@ -0,0 +1,116 @@
+"""Shoes shuffled ahead of time on a background worker.
+
+A ShoePipeline attached to a Deck keeps a bounded queue of ready shoes
+filled by a worker thread or process, so Deck.shuffle_cards only swaps in
+the next one instead of shuffling while a round waits:
+
+    pipeline = ShoePipeline(deck)
+    ...
+    pipeline.close()
+
+A thread suits the terminal client and the server, which mostly wait on
+players. Simulations keep the interpreter busy, so shuffling there only
+moves off the critical path in a separate process, which sends its shoes
+in batches to spread the cost of the queue.
+
+The worker shuffles with its own generator seeded from the deck's rng, so
+seeded runs still replay, but deal different shoes than without it.
+"""
+import multiprocessing
+import queue
+import random
+import threading
+import time
+from array import array
+from collections import deque
+from decks import np, shuffle_buffer
+
+DEPTH = 8          # Batches of shoes waiting in the queue
+PROCESS_BATCH = 16  # Shoes per message from a worker process
+# Seconds close() waits for a worker before giving up on it
+CLOSE_TIMEOUT = 5.0
+
+
+def worker_rng(rng):
+    """A new generator of the same kind, seeded from rng"""
+    if np is not None and isinstance(rng, np.random.Generator):
+        return np.random.default_rng(int(rng.integers(2 ** 63)))
+    return random.Random(rng.getrandbits(128))
+
+
+def _produce(cards, rng, shoes, batch, stop):
+    """Worker loop: shuffle batches of shoes until stop is set. put blocks
+    while the queue is full; close() drains it to wake the worker."""
+    if hasattr(shoes, "cancel_join_thread"):
+        # A worker process exits without flushing shoes nobody will read
+        shoes.cancel_join_thread()
+    cards = array("B", cards)
+    while not stop.is_set():
+        ready = []
+        for _ in range(batch):
+            shuffle_buffer(cards, rng)
+            ready.append(cards[:])
+        shoes.put(ready)
+
+
+class ShoePipeline:
+    """Bounded queue of pre-shuffled shoes for one Deck"""
+    def __init__(self, deck, depth=DEPTH, process=False, batch=None):
+        self.deck = deck
+        self.process = process
+        if batch is None:
+            batch = PROCESS_BATCH if process else 1
+        self._ready = deque()
+        args = (deck.cards.tobytes(), worker_rng(deck.rng))
+        if process:
+            self._stop = multiprocessing.Event()
+            self._shoes = multiprocessing.Queue(depth)
+            self._worker = multiprocessing.Process(
+                target=_produce, daemon=True,
+                args=(*args, self._shoes, batch, self._stop))
+        else:
+            self._stop = threading.Event()
+            self._shoes = queue.Queue(depth)
+            self._worker = threading.Thread(
+                target=_produce, daemon=True,
+                args=(*args, self._shoes, batch, self._stop))
+        self._worker.start()
+        deck.pipeline = self
+
+    def next_shoe(self):
+        """The next shuffled shoe, waiting for the worker only if it fell
+        behind"""
+        if not self._ready:
+            self._ready.extend(self._shoes.get())
+        return self._ready.popleft()
+
+    def close(self):
+        """Stop the worker and detach from the deck, which shuffles in place
+        again"""
+        if self.deck.pipeline is self:
+            self.deck.pipeline = None
+        self._stop.set()
+        deadline = time.monotonic() + CLOSE_TIMEOUT
+        while self._worker.is_alive() and time.monotonic() < deadline:
+            self._drain()  # Unblocks a worker waiting to put
+            self._worker.join(0.05)
+        if self.process:
+            if self._worker.is_alive():
+                self._worker.terminate()
+                self._worker.join()
+            self._shoes.cancel_join_thread()
+            self._shoes.close()
+
+    def _drain(self):
+        try:
+            while True:
+                self._shoes.get_nowait()
+        except queue.Empty:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,83 @@
+"""Shuffle policies: when, and how much of, a shoe is reshuffled.
+
+A policy is attached to a Deck once with setup(deck) and asked
+before_round(deck) ahead of every round; it returns True when it shuffled.
+All of them reshuffle the deck's existing card buffer in place.
+shuffle_seconds is how long a dealer takes to shuffle by hand, used to
+pace the terminal client and to cost shuffles in simulations.
+whole_shoe tells whether the policy reshuffles through Deck.shuffle_cards,
+where a ShoePipeline can supply the next shoe.
+"""
+
+
+class ThresholdShuffle:
+    """Shuffle the whole shoe once few cards remain"""
+    whole_shoe = True
+
+    def __init__(self, cards=52, shuffle_seconds=1.5):
+        self.cards = cards
+        self.shuffle_seconds = shuffle_seconds
+
+    def setup(self, deck):
+        pass
+
+    def before_round(self, deck):
+        if deck.remaining <= self.cards:
+            deck.shuffle_cards()
+            return True
+        return False
+
+
+class CutCardShuffle:
+    """Shuffle the whole shoe once the cut card comes out; penetration is
+    the fraction of the shoe dealt before it. RESERVE cards, or half of a
+    smaller shoe, stay behind the cut card so the round it comes out in
+    can be finished even at a full table."""
+    whole_shoe = True
+    RESERVE = 52
+
+    def __init__(self, penetration=0.75, shuffle_seconds=1.5):
+        if not 0 < penetration < 1:
+            raise ValueError("Penetration must be between 0 and 1")
+        self.penetration = penetration
+        self.shuffle_seconds = shuffle_seconds
+
+    def setup(self, deck):
+        shoe = len(deck.cards)
+        reserve = min(self.RESERVE, shoe // 2)
+        deck.penetration = min(self.penetration, (shoe - reserve) / shoe)
+        deck.cut_card = int(shoe * deck.penetration)
+
+    def before_round(self, deck):
+        if deck.cut_card_reached:
+            deck.shuffle_cards()
+            return True
+        return False
+
+
+class ContinuousShuffle:
+    """Continuous shuffling machine: the discards go back into the shoe
+    and are mixed in before every round"""
+    shuffle_seconds = 0.0  # The machine shuffles while the round is played
+    whole_shoe = False
+
+    def setup(self, deck):
+        pass
+
+    def before_round(self, deck):
+        if deck.position:
+            deck.return_discards()
+        return False
+
+
+def parse_shuffle_policy(text):
+    """Build a policy from "threshold[:cards]", "cut[:penetration]" or
+    "csm" """
+    name, _, value = text.partition(":")
+    if name == "threshold":
+        return ThresholdShuffle(int(value)) if value else ThresholdShuffle()
+    if name == "cut":
+        return CutCardShuffle(float(value)) if value else CutCardShuffle()
+    if name == "csm" and not value:
+        return ContinuousShuffle()
+    raise ValueError(f"Unknown shuffle policy: {text}")
@@ -0,0 +1,244 @@
+import argparse
+import seeding
+import shuffling
+from concurrent.futures import ProcessPoolExecutor
+from bot import Bot
+from card_counting import CountTracker, BetSpread, COUNTING_SYSTEMS
+from dealer import Dealer
+from decks import Deck
+from round_engine import RoundEngine, Seat
+from shoe_pipeline import ShoePipeline
+from strategies import STRATEGIES
+from rules import DEFAULT_RULES, add_rule_arguments, rules_from_args
+from constants import Outcomes as O
+
+CHUNK_ROUNDS = 10_000  # Rounds per independently seeded shoe sequence
+MAX_SEATS = 7
+
+
+class SimulationStats:
+    """Mergeable aggregate of simulated rounds.
+
+    Seats at one table share the dealer's hand, so their results are
+    correlated: the mean and variance take one sample per table round, the
+    sum of its seats' nets, and hands counts the seats played.
+    """
+    def __init__(self):
+        self.rounds = 0
+        self.hands = 0
+        self.wagered = 0.0  # Initial bets, before doubles and splits
+        self.net = 0.0
+        self.wins = 0
+        self.pushes = 0
+        self.losses = 0
+        self.splits = 0
+        self.doubles = 0
+        self.shuffles = 0
+        self.shuffle_seconds = 0.0  # Dealer time spent shuffling by hand
+        self.mean = 0.0  # Welford running mean and sum of squared deviations
+        self.m2 = 0.0
+        # {net units of a table round: rounds}, bet sizes included
+        self.outcomes = {}
+
+    def add_round(self, result, bet=1):
+        """Add a RoundResult played with the given initial bet"""
+        self.add_table([result], bet)
+
+    def add_table(self, results, bet=1):
+        """Add the RoundResults of every seat in one table round, each
+        played with the given initial bet"""
+        net = 0
+        for result in results:
+            net += result.net
+            self.splits += len(result.hands) - 1
+            for hand in result.hands:
+                if hand.outcome == O.WIN:
+                    self.wins += 1
+                elif hand.outcome == O.PUSH:
+                    self.pushes += 1
+                else:
+                    self.losses += 1
+                self.doubles += hand.doubled
+
+        self.rounds += 1
+        self.hands += len(results)
+        self.wagered += bet * len(results)
+        self.net += net
+        delta = net - self.mean
+        self.mean += delta / self.rounds
+        self.m2 += delta * (net - self.mean)
+        self.outcomes[net] = self.outcomes.get(net, 0) + 1
+
+    def merge(self, other):
+        """Fold another partial aggregate into this one"""
+        rounds = self.rounds + other.rounds
+        if rounds == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean += delta * other.rounds / rounds
+        self.m2 += (other.m2
+                    + delta * delta * self.rounds * other.rounds / rounds)
+        self.rounds = rounds
+        self.hands += other.hands
+        self.wagered += other.wagered
+        self.net += other.net
+        self.wins += other.wins
+        self.pushes += other.pushes
+        self.losses += other.losses
+        self.splits += other.splits
+        self.doubles += other.doubles
+        self.shuffles += other.shuffles
+        self.shuffle_seconds += other.shuffle_seconds
+        for net, count in other.outcomes.items():
+            self.outcomes[net] = self.outcomes.get(net, 0) + count
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.rounds - 1) if self.rounds > 1 else 0.0
+
+    @property
+    def std_error(self):
+        return (self.variance / self.rounds) ** 0.5 if self.rounds else 0.0
+
+    @property
+    def house_edge(self):
+        """Expected player loss per unit of initial bet"""
+        return -self.net / self.wagered if self.wagered else 0.0
+
+    @property
+    def house_edge_error(self):
+        """Standard error of house_edge"""
+        if not self.wagered:
+            return 0.0
+        return self.std_error * self.rounds / self.wagered
+
+
+def run_chunk(seed, chunk, rounds, strategy, rules, count=None, spread=None,
+              seats=1, rng="random", shuffle="threshold", pipeline=None):
+    """Play rounds on a freshly seeded shoe and return their SimulationStats.
+
+    Every round deals to the given number of seats against one dealer turn.
+    With a counting system and a bet spread ramp, each round's bet follows
+    the true count; otherwise every round bets one unit. rng picks the
+    shuffle backend: "random" or "numpy", and shuffle the shuffling policy
+    as accepted by shuffling.parse_shuffle_policy. pipeline="process"
+    shuffles the next shoes on a ShoePipeline worker process; a thread
+    would only compete with this loop for the interpreter.
+    """
+    if not 1 <= seats <= MAX_SEATS:
+        raise ValueError(
+            f"A table seats 1 to {MAX_SEATS} players, not {seats}")
+    policy = STRATEGIES[strategy]
+    streams = {"random": seeding.stream, "numpy": seeding.numpy_stream}
+    deck = Deck(rules.num_of_decks, rng=streams[rng](seed, chunk))
+    tracker = CountTracker(deck, count) if count else None
+    bet_spread = BetSpread(spread) if tracker and spread else None
+    deck.shuffle_cards()
+    if pipeline not in (None, "process"):
+        raise ValueError(f"Unknown pipeline: {pipeline}")
+    shoes = ShoePipeline(deck, process=True) if pipeline else None
+    shuffler = shuffling.parse_shuffle_policy(shuffle)
+    shuffler.setup(deck)
+    dealer = Dealer(rules)
+    players = [Bot(policy) for _ in range(seats)]
+    engine = RoundEngine(deck, dealer, policy)
+
+    stats = SimulationStats()
+    try:
+        for _ in range(rounds):
+            if shuffler.before_round(deck):
+                stats.shuffles += 1
+                stats.shuffle_seconds += shuffler.shuffle_seconds
+            bet = bet_spread.bet(tracker.true_count) if bet_spread else 1
+            seated = [Seat(player, bet) for player in players]
+            stats.add_table(engine.play_table(seated), bet)
+    finally:
+        if shoes is not None:
+            shoes.close()
+    return stats
+
+
+def simulate(rounds, strategy="mimic-dealer", rules=DEFAULT_RULES,
+             workers=1, seed=0, chunk_rounds=CHUNK_ROUNDS, count=None,
+             spread=None, seats=1, rng="random", shuffle="threshold",
+             pipeline=None):
+    """Play rounds across a process pool and return the merged
+    SimulationStats.
+
+    Every seat plays each round, so the stats hold rounds * seats hands.
+    Rounds are split into fixed-size chunks, each shuffled by its own
+    seeding stream (seed, chunk index), and merged in chunk order, so the
+    result replays exactly from the seed whatever the number of workers.
+    """
+    chunks = [min(chunk_rounds, rounds - start)
+              for start in range(0, rounds, chunk_rounds)]
+    n = len(chunks)
+    args = ([seed] * n, range(n), chunks, [strategy] * n, [rules] * n,
+            [count] * n, [spread] * n, [seats] * n, [rng] * n, [shuffle] * n,
+            [pipeline] * n)
+
+    if workers == 1:
+        partials = map(run_chunk, *args)
+        return sum_stats(partials)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum_stats(pool.map(run_chunk, *args))
+
+
+def sum_stats(partials):
+    total = SimulationStats()
+    for stats in partials:
+        total.merge(stats)
+    return total
+
+
+def parse_spread(text):
+    """Bet spread ramp from "count:units" pairs, e.g. 2:2,3:4,4:8"""
+    return tuple(tuple(int(part) for part in step.split(":"))
+                 for step in text.split(","))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Monte Carlo Blackjack simulation")
+    parser.add_argument("--rounds", type=int, default=100_000)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES),
+                        default="mimic-dealer")
+    add_rule_arguments(parser)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rng", choices=("random", "numpy"), default="random",
+                        help="Shuffle backend")
+    parser.add_argument("--shuffle", default="threshold",
+                        help="threshold[:cards], cut[:penetration] or csm "
+                             "(default: %(default)s)")
+    parser.add_argument("--seats", type=int, default=1,
+                        choices=range(1, MAX_SEATS + 1),
+                        metavar=f"1-{MAX_SEATS}", help="Players per table")
+    parser.add_argument("--pipeline", choices=("process",),
+                        help="Shuffle the next shoes in a background process")
+    parser.add_argument("--count", choices=sorted(COUNTING_SYSTEMS),
+                        help="Counting system driving the bet spread")
+    parser.add_argument("--spread", default="2:2,3:4,4:8",
+                        help="True count:units pairs for --count "
+                             "(default: %(default)s)")
+    args = parser.parse_args()
+
+    rules = rules_from_args(args)
+    stats = simulate(args.rounds, args.strategy, rules, args.workers,
+                     args.seed, count=args.count,
+                     spread=parse_spread(args.spread), seats=args.seats,
+                     rng=args.rng, shuffle=args.shuffle,
+                     pipeline=args.pipeline)
+    print(f"Rules: {rules.name}")
+    print(f"Seed: {args.seed}  Rounds: {stats.rounds}  Hands: {stats.hands}")
+    print(f"Units wagered: {stats.wagered:.1f}  Net units: {stats.net:+.1f}")
+    print(f"Wins/pushes/losses: {stats.wins}/{stats.pushes}/{stats.losses}")
+    print(f"Splits: {stats.splits}  Doubles: {stats.doubles}")
+    print(f"Shuffles: {stats.shuffles} "
+          f"({stats.shuffle_seconds:.0f} s of dealer time)")
+    print(f"House edge: {stats.house_edge:.4%} ± {stats.house_edge_error:.4%}")
+
+
+if __name__ == "__main__":
+    main()
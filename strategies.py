@@ -0,0 +1,36 @@
+"""Decision policies for automated players.
+
+A policy takes (player, dealer, actions) and returns one of the
+GameActions values in actions.
+"""
+from functools import lru_cache
+from constants import GameActions as GA
+
+
+def mimic_dealer(player, dealer, actions):
+    """Hit below 17, like the dealer"""
+    return GA.HIT.value if player.score < 17 else GA.STAND.value
+
+
+def never_bust(player, dealer, actions):
+    """Only hit when the next card cannot bust the hand"""
+    return GA.HIT.value if player.score < 12 else GA.STAND.value
+
+
+@lru_cache(maxsize=None)
+def _basic_table(rules):
+    from strategy_solver import load_or_solve
+    return load_or_solve(rules)
+
+
+def basic_strategy(player, dealer, actions):
+    """Follow the solver's EV-maximising table for a full shoe under the
+    dealer's rules"""
+    return _basic_table(dealer.rules).policy(player, dealer, actions)
+
+
+STRATEGIES = {
+    "mimic-dealer": mimic_dealer,
+    "never-bust": never_bust,
+    "basic": basic_strategy,
+}
@@ -0,0 +1,227 @@
+"""Composition-dependent strategy solver.
+
+For every starting hand and dealer upcard the solver computes the expected
+value of each GameActions entry from the exact dealer distribution and
+stores the actions ranked by EV in a StrategyTable. Split hands are played
+on without resplitting, so resplit limits are not modelled.
+"""
+import argparse
+import os
+from functools import lru_cache
+import dealer_probabilities as dp
+from rules import DEFAULT_RULES, add_rule_arguments, rules_from_args
+from constants import GameActions as GA
+
+ACTIONS = list(GA)  # Actions are stored as their index in GameActions
+HARD_TOTALS = range(4, 22)
+SOFT_TOTALS = range(12, 22)
+PAIR_VALUES = range(1, 11)
+UPCARDS = range(1, 11)
+ROWS = len(HARD_TOTALS) + len(SOFT_TOTALS) + len(PAIR_VALUES)
+MAGIC = b"BJST1"
+# Next to this module, so solved tables are shared whatever the working
+# directory
+TABLE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "strategy_tables")
+
+
+def hand_row(score, soft=False, pair_value=None):
+    """Table row for a hand: hard totals, then soft totals, then pairs"""
+    if pair_value is not None:
+        return len(HARD_TOTALS) + len(SOFT_TOTALS) + pair_value - 1
+    if soft:
+        return len(HARD_TOTALS) + score - SOFT_TOTALS.start
+    return score - HARD_TOTALS.start
+
+
+class StrategyTable:
+    """Actions ranked by EV for every (hand, upcard), packed into bytes"""
+    def __init__(self, ranks):
+        if len(ranks) != ROWS * len(UPCARDS) * len(ACTIONS):
+            raise ValueError("Strategy table has the wrong size")
+        self.ranks = bytes(ranks)
+
+    def ranked_actions(self, row, upcard):
+        offset = (row * len(UPCARDS) + upcard - 1) * len(ACTIONS)
+        return self.ranks[offset:offset + len(ACTIONS)]
+
+    def best_action(self, player, upcard, actions):
+        """Best action in actions for the player's hand against upcard"""
+        if player.is_pair:
+            row = hand_row(player.score, pair_value=player.game_cards[0].value)
+        else:
+            row = hand_row(max(player.score, HARD_TOTALS.start),
+                           soft=player.is_soft)
+        for code in self.ranked_actions(row, upcard):
+            action = ACTIONS[code].value
+            if action in actions:
+                return action
+        return GA.STAND.value
+
+    def policy(self, player, dealer, actions):
+        """Round engine policy following the table"""
+        return self.best_action(player, dealer.game_cards[0].value, actions)
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(MAGIC + self.ranks)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"Not a strategy table: {path}")
+        return cls(data[len(MAGIC):])
+
+
+def _hand_evs(composition, upcard, rules=DEFAULT_RULES):
+    """EV functions for hands played against upcard from composition"""
+    distribution = dp.dealer_distribution(upcard, composition,
+                                          rules.hit_soft_17)
+    total = sum(composition)
+    draws = [(index + 1, count / total)
+             for index, count in enumerate(composition) if count]
+
+    def score(hard, has_ace):
+        return hard + 10 if has_ace and hard + 10 <= 21 else hard
+
+    @lru_cache(maxsize=None)
+    def stand(hard, has_ace):
+        player_score = score(hard, has_ace)
+        if player_score > 21:
+            return -1.0
+        return dp.stand_ev(player_score, distribution)
+
+    @lru_cache(maxsize=None)
+    def best(hard, has_ace):
+        """EV of playing on without doubling; the engine stands on 21"""
+        player_score = score(hard, has_ace)
+        if player_score >= 21:
+            return stand(hard, has_ace)
+        return max(stand(hard, has_ace), hit(hard, has_ace))
+
+    @lru_cache(maxsize=None)
+    def hit(hard, has_ace):
+        return sum(p * best(hard + value, has_ace or value == 1)
+                   for value, p in draws)
+
+    def double(hard, has_ace):
+        return 2 * sum(p * stand(hard + value, has_ace or value == 1)
+                       for value, p in draws)
+
+    def split(value):
+        """Both hands start from one card"""
+        hand_ev = 0.0
+        for drawn, p in draws:
+            hard, has_ace = value + drawn, value == 1 or drawn == 1
+            if (score(hard, has_ace) >= 21
+                    or (value == 1 and not rules.hit_split_aces)):
+                hand_ev += p * stand(hard, has_ace)
+            elif rules.double_after_split:
+                hand_ev += p * max(best(hard, has_ace), double(hard, has_ace))
+            else:
+                hand_ev += p * best(hard, has_ace)
+        return 2 * hand_ev
+
+    def evs(hard, has_ace, pair_value=None):
+        return {
+            GA.STAND: stand(hard, has_ace),
+            GA.HIT: hit(hard, has_ace),
+            GA.DOUBLE_DOWN: double(hard, has_ace),
+            GA.SPLIT: split(pair_value) if pair_value else float("-inf"),
+            # Late surrender: half the bet back unless the dealer has a natural
+            GA.SURRENDER: (-0.5 - 0.5 * distribution[dp.BLACKJACK]
+                           if rules.surrender else float("-inf")),
+        }
+    return evs
+
+
+def solve(composition, rules=DEFAULT_RULES):
+    """Solve every starting hand against every upcard for a shoe composition
+    and return the StrategyTable together with the EVs behind it"""
+    ranks = bytearray()
+    table_evs = {}
+    for row in range(ROWS):
+        for upcard in UPCARDS:
+            composition_up = dp.remove_cards(composition, upcard)
+            if row >= len(HARD_TOTALS) + len(SOFT_TOTALS):
+                pair_value = row - len(HARD_TOTALS) - len(SOFT_TOTALS) + 1
+                remaining = dp.remove_cards(composition_up, pair_value,
+                                            pair_value)
+                evs = _hand_evs(remaining, upcard, rules)(
+                    2 * pair_value, pair_value == 1, pair_value)
+            elif row >= len(HARD_TOTALS):
+                soft_total = row - len(HARD_TOTALS) + SOFT_TOTALS.start
+                evs = _cached_evs(composition_up, upcard, rules)(
+                    soft_total - 10, True)
+            else:
+                evs = _cached_evs(composition_up, upcard, rules)(
+                    row + HARD_TOTALS.start, False)
+            table_evs[row, upcard] = evs
+            ranked = sorted(ACTIONS, key=lambda action: -evs[action])
+            ranks.extend(ACTIONS.index(action) for action in ranked)
+    return StrategyTable(ranks), table_evs
+
+
+@lru_cache(maxsize=64)
+def _cached_evs(composition, upcard, rules):
+    return _hand_evs(composition, upcard, rules)
+
+
+def table_path(rules=DEFAULT_RULES, directory=TABLE_DIRECTORY):
+    """File of the table for rules; rules that play alike share a file"""
+    name = (f"basic_{rules.num_of_decks}_decks_"
+            f"{'h17' if rules.hit_soft_17 else 's17'}"
+            f"{'_das' if rules.double_after_split else ''}"
+            f"{'_ls' if rules.surrender else ''}"
+            f"{'' if rules.hit_split_aces else '_1sa'}")
+    return os.path.join(directory, name + ".bin")
+
+
+def load_or_solve(rules=DEFAULT_RULES, directory=TABLE_DIRECTORY):
+    """Load the table for a full shoe, solving and saving it if missing"""
+    path = table_path(rules, directory)
+    if os.path.exists(path):
+        return StrategyTable.load(path)
+    table, _ = solve(dp.shoe_composition(rules.num_of_decks), rules)
+    os.makedirs(directory, exist_ok=True)
+    table.save(path)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve EV-maximising strategy tables")
+    add_rule_arguments(parser)
+    parser.add_argument("--output",
+                        help="Table file "
+                             "(default: strategy_tables/ next to this module)")
+    args = parser.parse_args()
+
+    rules = rules_from_args(args)
+    table, _ = solve(dp.shoe_composition(rules.num_of_decks), rules)
+    path = args.output or table_path(rules)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    table.save(path)
+
+    letters = {GA.HIT: "H", GA.STAND: "S", GA.DOUBLE_DOWN: "D",
+               GA.SPLIT: "P", GA.SURRENDER: "R"}
+    sections = [
+        ("Hard", HARD_TOTALS, lambda total: hand_row(total)),
+        ("Soft", SOFT_TOTALS, lambda total: hand_row(total, soft=True)),
+        ("Pair", PAIR_VALUES, lambda value: hand_row(0, pair_value=value)),
+    ]
+    for name, hands, row_for in sections:
+        print(f"{name:<5} " + " ".join(f"{'A' if up == 1 else up:>2}"
+                                       for up in UPCARDS))
+        for hand in hands:
+            codes = (letters[ACTIONS[table.ranked_actions(row_for(hand),
+                                                          up)[0]]]
+                     for up in UPCARDS)
+            print(f"{hand:>5} " + " ".join(f"{code:>2}" for code in codes))
+    print(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from account_store import (SQLiteAccountStore, JsonAccountStore,
+                           migrate_json_accounts)
+from user import User
+
+class TestAccountStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SQLiteAccountStore(
+            os.path.join(self.directory.name, "accounts.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_save_load_and_balance(self):
+        """Test accounts round-trip and balances update atomically"""
+        self.store.save("alice", "secret", 100)
+        self.assertEqual(self.store.load("alice")["balance"], 100)
+        self.assertEqual(self.store.adjust_balance("alice", -25), 75)
+        self.assertIsNone(self.store.load("bob"))
+
+    def test_rename(self):
+        """Test renaming refuses taken usernames"""
+        self.store.save("alice", "secret", 100)
+        self.store.save("bob", "secret", 50)
+        self.assertFalse(self.store.rename("alice", "bob"))
+        self.assertTrue(self.store.rename("alice", "carol"))
+        self.assertIsNone(self.store.load("alice"))
+        self.assertEqual(self.store.load("carol")["balance"], 100)
+
+    def test_create_refuses_taken_usernames(self):
+        """Test creating an account never overwrites an existing one"""
+        self.assertTrue(self.store.create("alice", "secret", 100))
+        self.assertFalse(self.store.create("alice", "other", 5))
+        self.assertEqual(self.store.load("alice")["password"], "secret")
+
+    def test_batch_rolls_back(self):
+        """Test a failed batch leaves no partial writes"""
+        with self.assertRaises(RuntimeError):
+            with self.store.batch():
+                self.store.save("alice", "secret", 100)
+                raise RuntimeError()
+        self.assertIsNone(self.store.load("alice"))
+
+    def test_migrate_json_accounts(self):
+        """Test legacy JSON files are imported once"""
+        legacy = os.path.join(self.directory.name, "players")
+        JsonAccountStore(legacy).save("dave", "pw", 40.0)
+        self.assertEqual(migrate_json_accounts(self.store, legacy), 1)
+        self.assertEqual(migrate_json_accounts(self.store, legacy), 0)
+        self.assertEqual(self.store.load("dave")["password"], "pw")
+
+    def test_user_uses_store(self):
+        """Test User saves and loads through the configured store"""
+        previous, User.store = User.store, self.store
+        try:
+            User("erin", "pw", 500).save_player_data()
+            self.assertEqual(User.load_player_data("erin", "pw").balance, 500)
+            with self.assertRaises(ValueError):
+                User.load_player_data("erin", "wrong")
+        finally:
+            User.store = previous
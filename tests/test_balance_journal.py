@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+from account_store import SQLiteAccountStore
+from user import User
+from balance_journal import BalanceJournal, Entry, JournalInUse, open_journal
+
+class TestBalanceJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SQLiteAccountStore(
+            os.path.join(self.directory.name, "accounts.db"))
+        self.store.save("alice", "pw", 100.0)
+        self.path = os.path.join(self.directory.name, "balance.journal")
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_replay_after_crash(self):
+        """Test entries left in the journal are applied exactly once"""
+        journal = BalanceJournal(self.store, self.path, sync_every=100)
+        journal.record("alice", Entry.BET, -10.0)
+        journal.record("alice", Entry.PAYOUT, 20.0)
+        journal.close()  # Crash here: nothing reached the store
+
+        recovered = BalanceJournal(self.store, self.path)
+        recovered.replay()
+        recovered.replay()
+        self.assertEqual(self.store.load("alice")["balance"], 110.0)
+        self.assertEqual(list(recovered.entries()), [])
+        recovered.close()
+
+    def test_torn_tail_is_ignored(self):
+        """Test a partially written last entry is dropped"""
+        journal = BalanceJournal(self.store, self.path)
+        journal.record("alice", Entry.DEPOSIT, 5.0)
+        journal.record("alice", Entry.DEPOSIT, 7.0)
+        journal.close()
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 3)
+
+        entries = list(BalanceJournal(self.store, self.path).entries())
+        self.assertEqual(
+            [(seq, kind, delta) for seq, _, kind, delta in entries],
+            [(1, Entry.DEPOSIT, 5.0)])
+
+    def test_sequence_continues_after_checkpoint(self):
+        """Test sequence numbers keep growing across checkpoints"""
+        journal = BalanceJournal(self.store, self.path)
+        journal.record("alice", Entry.BET, -5.0)
+        journal.checkpoint()
+        journal.close()
+        reopened = BalanceJournal(self.store, self.path)
+        reopened.record("alice", Entry.BET, -5.0)
+        reopened.flush()
+        self.assertEqual([seq for seq, _, _, _ in reopened.entries()], [2])
+        reopened.close()
+
+    def test_checkpoint_waits_for_outer_batch(self):
+        """Test a checkpoint inside a rolled back batch keeps its entries"""
+        journal = BalanceJournal(self.store, self.path)
+        journal.record("alice", Entry.DEPOSIT, 5.0)
+        with self.assertRaises(RuntimeError):
+            with self.store.batch():
+                journal.checkpoint()
+                self.assertEqual(len(list(journal.entries())), 1)
+                raise RuntimeError
+        self.assertEqual(self.store.load("alice")["balance"], 100.0)
+        self.assertEqual(len(list(journal.entries())), 1)
+
+        with self.store.batch():
+            journal.checkpoint()
+        self.assertEqual(self.store.load("alice")["balance"], 105.0)
+        self.assertEqual(list(journal.entries()), [])
+        journal.close()
+
+    def test_sessions_get_their_own_journals(self):
+        """Test concurrent sessions write separate journals and a crashed
+        session's journal is replayed by the next one"""
+        first = open_journal(self.store, self.path)
+        second = open_journal(self.store, self.path)
+        self.assertNotEqual(first.path, second.path)
+        with self.assertRaises(JournalInUse):
+            BalanceJournal(self.store, second.path)
+
+        first.record("alice", Entry.DEPOSIT, 1.0)
+        second.record("alice", Entry.DEPOSIT, 2.0)
+        first.checkpoint()
+        second.close()  # Crash here: nothing reached the store
+        self.assertEqual(self.store.load("alice")["balance"], 101.0)
+
+        third = open_journal(self.store, self.path)
+        self.assertEqual(third.path, second.path)
+        self.assertEqual(self.store.load("alice")["balance"], 103.0)
+        first.close()
+        third.close()
+
+    def test_concurrent_sessions_keep_both_updates(self):
+        """Test two sessions of one account both keep their balance changes"""
+        saved_store, User.store = User.store, self.store
+        try:
+            first = User.load_player_data("alice", "pw")
+            second = User.load_player_data("alice", "pw")
+            first.journal = open_journal(self.store, self.path)
+            second.journal = open_journal(self.store, self.path)
+            first.adjust_balance(50.0, Entry.PAYOUT)
+            second.adjust_balance(-10.0, Entry.BET)
+            first.save_player_data()
+            second.save_player_data()
+            self.assertEqual(self.store.load("alice")["balance"], 140.0)
+            self.assertEqual(second.balance, 140.0)
+            first.journal.close()
+            second.journal.close()
+        finally:
+            User.store = saved_store
@@ -0,0 +1,18 @@
+import unittest
+import batch_simulator as bs
+
+@unittest.skipIf(bs.np is None, "NumPy is not installed")
+class TestBatchSimulator(unittest.TestCase):
+    def test_cross_check_with_round_engine(self):
+        """Test vectorized hands settle exactly like the object engine"""
+        hard, soft = bs.threshold_table(13)
+        hard[10:12] = bs.DOUBLE
+        self.assertEqual(
+            bs.cross_check(100, table=(hard, soft), seeds=(0, 1)), [])
+
+    def test_seeded_results_repeat(self):
+        """Test a seed always gives the same batch"""
+        first = bs.simulate_batch(1000, seed=3, batch_size=300)
+        second = bs.simulate_batch(1000, seed=3, batch_size=300)
+        self.assertEqual(len(first), 1000)
+        self.assertTrue((first == second).all())
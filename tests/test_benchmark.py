@@ -0,0 +1,47 @@
+import json
+import threading
+import unittest
+import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_report_is_json(self):
+        """Test a run reports every deck count and survives a JSON round
+        trip"""
+        report = benchmark.run_benchmarks(["draw_card", "dealer_decision"],
+                                          repeat=1, min_seconds=0)
+        report = json.loads(json.dumps(report))
+        keys = [(result["name"], result["decks"])
+                for result in report["results"]]
+        self.assertEqual(keys, [("draw_card", 1), ("draw_card", 4),
+                                ("draw_card", 6), ("draw_card", 8),
+                                ("dealer_decision", None)])
+        for result in report["results"]:
+            self.assertGreater(result["ns_per_op"], 0)
+
+    def test_pipeline_workers_stop(self):
+        """Test the shallow pipeline benchmarks stop their workers"""
+        before = threading.active_count()
+        report = benchmark.run_benchmarks(["shallow_round_thread"],
+                                          repeat=1, min_seconds=0)
+        self.assertEqual(len(report["results"]), len(benchmark.DECK_COUNTS))
+        self.assertEqual(threading.active_count(), before)
+
+    def test_compare_flags_slowdowns(self):
+        """Test only benchmarks slower than the tolerance are regressions"""
+        def result(name, decks, ns_per_op):
+            return {"name": name, "decks": decks, "ns_per_op": ns_per_op}
+
+        baseline = {"results": [result("round", 4, 100.0),
+                                result("round", 8, 100.0)]}
+        report = {"results": [result("round", 4, 105.0),
+                              result("round", 8, 130.0),
+                              result("draw_card", 1, 999.0)]}
+        regressions = benchmark.compare(report, baseline, tolerance=0.10)
+        self.assertEqual([(name, decks) for name, decks, _ in regressions],
+                         [("round", 8)])
+        self.assertAlmostEqual(regressions[0][2], 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
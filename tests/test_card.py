@@ -1,5 +1,5 @@
 import unittest
-from cards import Card
+from cards import Card, CARDS
 
 class TestCard(unittest.TestCase):
     def setUp(self):
@@ -17,4 +17,20 @@ class TestCard(unittest.TestCase):
         """Test card information structure"""
         info = self.ace.get_card_info()
         self.assertEqual(info["code"], "A♠")
-        self.assertEqual(info["value"], [1, 11])
\ No newline at end of file
+        self.assertEqual(info["value"], [1, 11])
+
+    def test_cards_are_interned(self):
+        """Test cards are immutable singletons with integer ids"""
+        self.assertIs(Card("A", "♠"), self.ace)
+        self.assertIs(CARDS[self.king.id], self.king)
+        self.assertEqual(len(CARDS), 52)
+        with self.assertRaises(AttributeError):
+            self.ace.rank = "K"
+
+    def test_value_tables(self):
+        """Test numeric card values come from the rank tables"""
+        self.assertEqual(self.ace.value, 1)
+        self.assertTrue(self.ace.is_ace)
+        self.assertEqual(self.king.value, 10)
+        self.assertEqual(Card("7", "♦").value, 7)
+        self.assertFalse(self.ten.is_ace)
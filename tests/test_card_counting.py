@@ -0,0 +1,47 @@
+import unittest
+from array import array
+from cards import Card
+from decks import Deck
+from card_counting import CountTracker, BetSpread
+
+def stacked_deck(ranks):
+    deck = Deck(1)
+    deck.cards[:len(ranks)] = array(
+        "B", (Card(rank, "♠").id for rank in ranks))
+    return deck
+
+class TestCardCounting(unittest.TestCase):
+    def test_hi_lo_running_and_true_count(self):
+        """Test the count follows every card dealt from the deck"""
+        deck = stacked_deck(["2", "3", "K", "5", "6"])
+        tracker = CountTracker(deck, "hi-lo")
+        deck.draw_card()
+        deck.draw_card()
+        deck.draw_card()
+        deck.deal(2)
+        self.assertEqual(tracker.running_count, 3)
+        self.assertAlmostEqual(tracker.true_count, 3 / (47 / 52))
+        self.assertEqual(tracker.rank_remaining[1], 3)  # Twos left
+
+    def test_burn_and_shuffle(self):
+        """Test burned cards are not counted and a shuffle resets the count"""
+        deck = stacked_deck(["2", "3"])
+        tracker = CountTracker(deck, "hi-lo")
+        deck.burn()
+        self.assertEqual(tracker.running_count, 0)
+        deck.draw_card()
+        deck.shuffle_cards()
+        self.assertEqual(tracker.running_count, 0)
+        self.assertEqual(tracker.rank_remaining, [4] * 13)
+
+    def test_unbalanced_start(self):
+        """Test KO starts each shoe below zero"""
+        tracker = CountTracker(Deck(2), "ko")
+        self.assertEqual(tracker.running_count, -8)
+
+    def test_bet_spread(self):
+        """Test bets follow the true count ramp"""
+        spread = BetSpread(((2, 2), (4, 8)), min_bet=5)
+        self.assertEqual(spread.bet(-1.5), 5)
+        self.assertEqual(spread.bet(2.9), 10)
+        self.assertEqual(spread.bet(6), 40)
@@ -0,0 +1,28 @@
+import unittest
+import dealer_probabilities as dp
+
+class TestDealerProbabilities(unittest.TestCase):
+    def test_distribution_sums_to_one(self):
+        """Test every upcard gives a complete distribution"""
+        shoe = dp.shoe_composition(1)
+        for upcard in range(1, 11):
+            composition = dp.remove_cards(shoe, upcard)
+            distribution = dp.dealer_distribution(upcard, composition)
+            self.assertAlmostEqual(sum(distribution), 1.0)
+
+    def test_forced_outcomes(self):
+        """Test compositions where the dealer's hand is certain"""
+        only_tens = (0,) * 9 + (20,)
+        twenty = dp.OUTCOMES.index(20)
+        self.assertEqual(dp.dealer_distribution(10, only_tens)[twenty], 1.0)
+        self.assertEqual(
+            dp.dealer_distribution(1, only_tens)[dp.BLACKJACK], 1.0)
+        # 6 + 10 = 16 must hit and bust on another ten
+        self.assertEqual(dp.dealer_distribution(6, only_tens)[dp.BUST], 1.0)
+
+    def test_stand_ev(self):
+        """Test standing EV against a known dealer distribution"""
+        distribution = (0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0)  # Dealer always 20
+        self.assertEqual(dp.stand_ev(19, distribution), -1.0)
+        self.assertEqual(dp.stand_ev(20, distribution), 0.0)
+        self.assertEqual(dp.stand_ev(21, distribution), 1.0)
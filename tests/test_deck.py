@@ -0,0 +1,36 @@
+import unittest
+from decks import Deck
+from cards import CARDS
+
+class TestDeck(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck(1)
+
+    def test_draw_advances_cursor(self):
+        """Test drawing deals cards in order without removing them"""
+        first, second = CARDS[self.deck.cards[0]], CARDS[self.deck.cards[1]]
+        self.assertIs(self.deck.draw_card(), first)
+        self.assertIs(self.deck.draw_card(), second)
+        self.assertEqual(self.deck.remaining, 50)
+        self.assertEqual(len(self.deck), 50)
+        self.assertEqual(len(self.deck.cards), 52)
+
+    def test_deal_and_burn(self):
+        """Test bulk dealing and burn cards"""
+        expected = [CARDS[card_id] for card_id in self.deck.cards[1:4]]
+        burned = self.deck.burn()
+        self.assertEqual(self.deck.burned, burned)
+        self.assertEqual(self.deck.deal(3), expected)
+        self.assertEqual(self.deck.remaining, 48)
+        with self.assertRaises(IndexError):
+            self.deck.deal(49)
+
+    def test_cut_card(self):
+        """Test penetration places the cut card and shuffling resets it"""
+        deck = Deck(2, penetration=0.75)
+        self.assertEqual(deck.cut_card, 78)
+        deck.deal(78)
+        self.assertTrue(deck.cut_card_reached)
+        deck.shuffle_cards()
+        self.assertFalse(deck.cut_card_reached)
+        self.assertEqual(deck.remaining, 104)
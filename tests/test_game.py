@@ -1,8 +1,17 @@
+import os
+import tempfile
 import unittest
+from account_store import SQLiteAccountStore
 from dealer import Dealer
 from user import User
 from game_controller import GameController
 from cards import Card
+from hand_history import read_history
+from renderer import Script
+from rules import RuleSet
+from shuffling import ThresholdShuffle
+from test_round_engine import stacked_deck
+from constants import Outcomes as O
 
 class TestGameState(unittest.TestCase):
     def setUp(self):
@@ -28,6 +37,22 @@ class TestGameState(unittest.TestCase):
         self.game.determine_winner()
         self.assertEqual(self.game.user.balance, initial_balance + 200)
 
+    def test_blackjack_pays_rules_payout(self):
+        """Test a natural pays 3:2 under 3:2 rules and loses to a dealer
+        natural"""
+        self.game.rules = RuleSet(blackjack_pays=1.5)
+        self.game.user.game_cards = [Card("A", "♠"), Card("K", "♥")]
+        self.game.dealer.game_cards = [Card("10", "♠"), Card("9", "♥")]
+        self.game.user.bet_amount = 100
+        self.game.determine_winner()
+        self.assertEqual(self.game.user.balance, 1250)
+
+        self.game.user.game_cards = [Card("10", "♣"), Card("5", "♥"),
+                                     Card("6", "♦")]
+        self.game.dealer.game_cards = [Card("A", "♥"), Card("K", "♠")]
+        self.game.determine_winner()
+        self.assertEqual(self.game.user.balance, 1250)
+
     def test_push_condition(self):
         """Test push condition"""
         self.game.user.game_cards = [Card("10", "♠"), Card("10", "♥")]
@@ -36,4 +61,81 @@ class TestGameState(unittest.TestCase):
         
         initial_balance = self.game.user.balance
         self.game.determine_winner()
-        self.assertEqual(self.game.user.balance, initial_balance + 100)
\ No newline at end of file
+        self.assertEqual(self.game.user.balance, initial_balance + 100)
+
+class TestScriptedSession(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.saved_store = User.store
+        User.store = SQLiteAccountStore(
+            os.path.join(self.directory.name, "accounts.db"))
+
+    def tearDown(self):
+        User.store.close()
+        User.store = self.saved_store
+        self.directory.cleanup()
+
+    def game(self, script):
+        directory = self.directory.name
+        return GameController(
+            journal_path=os.path.join(directory, "balance.journal"),
+            history_directory=os.path.join(directory, "history"),
+            screen=script.screen)
+
+    def test_full_session(self):
+        """Test a whole session replays headless: register, split, account
+        changes"""
+        keys = ["alice", "pw", "100",
+                "play", "10", "split", "double", "", "stand", "", "", "",
+                "account", "view balance", "",
+                "change password", "pw", "pw2", "", "back",
+                "exit"]
+        script = Script(keys)
+        game = self.game(script)
+        # Player 8+8 against dealer 10+7; the split hands draw 3 (then 9) and K
+        ranks = ["8", "10", "8", "7", "3", "9", "K"]
+        game.deck.cards = stacked_deck(ranks).cards
+        game.deck.reset()
+        game.shuffler = ThresholdShuffle(cards=0)
+        game.start_game()
+        while game.play:
+            game.handle_action()
+
+        self.assertEqual(script.prompts, len(keys))
+        self.assertEqual(script.waited, 1)  # The dealer's turn; no shuffle
+        self.assertIn("You win €20.0!", script.text)
+        self.assertIn("Current balance: €130.00", script.text)
+        self.assertEqual(User.store.load("alice"),
+                         {"username": "alice", "password": "pw2",
+                          "balance": 130})
+        records = list(read_history(game.history_directory))
+        self.assertEqual([hand.outcome for hand in records[0].hands],
+                         [O.WIN, O.WIN])
+        self.assertEqual([hand.bet for hand in records[0].hands], [20, 10])
+
+    def test_script_runs_out(self):
+        """Test a session stops with EOFError once the keystrokes run out"""
+        with self.assertRaises(EOFError):
+            self.game(Script(["bob"])).login_user()
+
+    def test_sessions_run_side_by_side(self):
+        """Test two scripted sessions interleave, each on its own renderer"""
+        scripts = [Script([name, "pw", "100", "play", "10", "stand", "", "",
+                           "exit"])
+                   for name in ("alice", "bob")]
+        games = [self.game(script) for script in scripts]
+        for game in games:
+            # Both players stand on 17 against the dealer's 17
+            game.deck.cards = stacked_deck(["10", "10", "7", "7"]).cards
+            game.deck.reset()
+            game.shuffler = ThresholdShuffle(cards=0)
+            game.start_game()
+        while any(game.play for game in games):
+            for game in games:
+                if game.play:
+                    game.handle_action()
+
+        for name, script in zip(("alice", "bob"), scripts):
+            self.assertEqual(script.prompts, 9)
+            self.assertIn(f"User {name} registered successfully!", script.text)
+            self.assertIsNotNone(User.store.load(name))
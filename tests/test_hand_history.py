@@ -0,0 +1,115 @@
+import os
+import struct
+import tempfile
+import unittest
+import seeding
+import hand_history as hh
+from bot import Bot
+from dealer import Dealer
+from decks import Deck
+from round_engine import RoundEngine
+from shuffling import ContinuousShuffle
+from strategies import never_bust
+from constants import GameActions as GA
+
+class TestHandHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        deck = Deck(4, rng=seeding.stream(0))
+        deck.shuffle_cards()
+        self.shuffler = ContinuousShuffle()
+        self.engine = RoundEngine(deck, Dealer(), never_bust)
+        self.player = Bot(never_bust)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play(self, rounds, history):
+        results = []
+        for i in range(rounds):
+            self.shuffler.before_round(self.engine.deck)
+            result = self.engine.play_round(self.player, 2)
+            history.record("bot", result, 100 + i, timestamp=i)
+            results.append(result)
+        history.close()
+        return results
+
+    def test_round_trip(self):
+        """Test records read back exactly as they were written"""
+        results = self.play(50, hh.HandHistory(self.directory.name))
+        records = list(hh.read_history(self.directory.name))
+        self.assertEqual(len(records), 50)
+        for i, (result, record) in enumerate(zip(results, records)):
+            self.assertEqual(record.username, "bot")
+            self.assertEqual(record.balance, 100 + i)
+            self.assertEqual(record.dealer_cards, result.dealer_cards)
+            self.assertEqual(record.net, result.net)
+            for hand, hand_record in zip(result.hands, record.hands):
+                self.assertEqual(hand_record.cards, hand.cards)
+                self.assertEqual(hand_record.outcome, hand.outcome)
+                self.assertEqual(hand_record.actions, list(hand.actions))
+
+    def test_rotation_and_torn_tail(self):
+        """Test logs rotate and a torn final record is skipped"""
+        self.play(40, hh.HandHistory(self.directory.name, max_bytes=512))
+        files = hh.history_files(self.directory.name)
+        self.assertGreater(len(files), 1)
+        with open(files[-1], "ab") as file:
+            file.write(b"\x40\x00\x01")
+        self.assertEqual(len(list(hh.read_history(self.directory.name))), 40)
+
+    def test_reopen_truncates_torn_tail(self):
+        """Test rounds written after a torn tail are not lost behind it"""
+        self.play(3, hh.HandHistory(self.directory.name))
+        path = hh.history_files(self.directory.name)[-1]
+        with open(path, "ab") as file:
+            file.write(b"\x07\x00\x00\x00")
+        history = hh.HandHistory(self.directory.name)
+        self.assertEqual(history.size, os.path.getsize(path))
+        self.shuffler.before_round(self.engine.deck)
+        history.record("after", self.engine.play_round(self.player, 2), 50)
+        history.close()
+        names = [record.username
+                 for record in hh.read_history(self.directory.name)]
+        self.assertEqual(names, ["bot"] * 3 + ["after"])
+
+    def test_corrupt_record_stops_reading(self):
+        """Test a record failing its checksum ends the file"""
+        self.play(5, hh.HandHistory(self.directory.name))
+        path = hh.history_files(self.directory.name)[0]
+        with open(path, "r+b") as file:
+            data = bytearray(file.read())
+            data[-1] ^= 0xFF
+            file.seek(0)
+            file.write(data)
+        self.assertEqual(len(list(hh.read_file(path))), 4)
+
+    def test_long_usernames(self):
+        """Test usernames past 255 UTF-8 bytes round-trip"""
+        history = hh.HandHistory(self.directory.name)
+        self.shuffler.before_round(self.engine.deck)
+        result = self.engine.play_round(self.player, 2)
+        for name in ("é" * 150, "a" * 65535):
+            history.record(name, result, 10)
+        history.close()
+        names = [record.username
+                 for record in hh.read_history(self.directory.name)]
+        self.assertEqual(names, ["é" * 150, "a" * 65535])
+        with self.assertRaises(struct.error):
+            hh.encode_round("a" * 65536, result, 10, 0)
+
+    def test_small_read_chunks(self):
+        """Test records spanning read chunks are reassembled"""
+        self.play(20, hh.HandHistory(self.directory.name))
+        path = hh.history_files(self.directory.name)[0]
+        self.assertEqual(len(list(hh.read_file(path, chunk_size=7))), 20)
+
+    def test_analytics(self):
+        """Test the summaries cover every hand"""
+        self.play(200, hh.HandHistory(self.directory.name))
+        rates = hh.win_rate_by_upcard(hh.read_history(self.directory.name))
+        self.assertTrue(set(rates) <= set(range(1, 11)))
+        evs = hh.ev_by_action(hh.read_history(self.directory.name))
+        self.assertIn(GA.STAND.value, evs)
+        curve = list(hh.bankroll_curves(hh.read_history(self.directory.name)))
+        self.assertEqual(curve[-1], ("bot", 199, 299))
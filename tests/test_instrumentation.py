@@ -0,0 +1,63 @@
+import time
+import tracemalloc
+import unittest
+from instrumentation import Instruments, percentile
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        """Test disabled instruments share one no-op phase and keep no
+        samples"""
+        instruments = Instruments()
+        self.assertIs(instruments.phase("deal"), instruments.phase("persist"))
+        with instruments.phase("deal"):
+            instruments.count("rounds")
+        self.assertEqual(instruments.summary(), {"counters": {}, "phases": {}})
+
+    def test_phases_and_counters(self):
+        """Test enabled instruments time every phase and add up counters"""
+        instruments = Instruments(enabled=True)
+        for _ in range(3):
+            with instruments.phase("deal"):
+                pass
+            instruments.count("hands", 2)
+        summary = instruments.summary()
+        self.assertEqual(summary["counters"], {"hands": 6})
+        self.assertEqual(summary["phases"]["deal"]["count"], 3)
+        self.assertLessEqual(summary["phases"]["deal"]["p50_ms"],
+                             summary["phases"]["deal"]["p99_ms"])
+        self.assertNotIn("peak_bytes_p50", summary["phases"]["deal"])
+
+    def test_traced_peaks(self):
+        """Test phases record the memory they allocate while tracing"""
+        instruments = Instruments(enabled=True)
+        tracemalloc.start()
+        try:
+            with instruments.phase("deal"):
+                block = bytearray(100_000)
+        finally:
+            tracemalloc.stop()
+        del block
+        deal = instruments.summary()["phases"]["deal"]
+        self.assertGreaterEqual(deal["peak_bytes_p50"], 100_000)
+
+    def test_idle_time_is_left_out(self):
+        """Test time spent idle inside a phase does not count towards it"""
+        instruments = Instruments(enabled=True)
+        with instruments.phase("player_turn"):
+            with instruments.idle():
+                time.sleep(0.05)
+        with instruments.idle():  # Outside any phase: nothing to subtract from
+            pass
+        player_turn = instruments.summary()["phases"]["player_turn"]
+        self.assertLess(player_turn["total_ms"], 50)
+
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 0.5), 51)
+        self.assertEqual(percentile(samples, 0.99), 100)
+        self.assertEqual(percentile([7], 0.99), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,4 +28,32 @@ class TestUser(unittest.TestCase):
         self.assertTrue(self.user.can_split())
 
         self.user.game_cards = [Card("10", "♠"), Card("9", "♥")]
-        self.assertFalse(self.user.can_split())
\ No newline at end of file
+        self.assertFalse(self.user.can_split())
+
+class TestHandScore(unittest.TestCase):
+    def setUp(self):
+        self.dealer = Dealer()
+
+    def test_soft_hand(self):
+        """Test aces are tracked as soft until they would bust the hand"""
+        self.dealer.draw_card(Card("A", "♠"))
+        self.dealer.draw_card(Card("6", "♥"))
+        self.assertEqual(self.dealer.score, 17)
+        self.assertTrue(self.dealer.is_soft)
+
+        self.dealer.draw_card(Card("10", "♣"))
+        self.assertEqual(self.dealer.score, 17)
+        self.assertFalse(self.dealer.is_soft)
+        self.assertEqual(self.dealer.hard_total, 17)
+
+    def test_hand_flags(self):
+        """Test blackjack, bust and pair flags"""
+        self.dealer.game_cards = [Card("A", "♠"), Card("K", "♥")]
+        self.assertTrue(self.dealer.is_blackjack)
+        self.assertFalse(self.dealer.is_pair)
+
+        self.dealer.game_cards = [Card("8", "♠"), Card("8", "♥")]
+        self.assertTrue(self.dealer.is_pair)
+        self.dealer.draw_card(Card("K", "♣"))
+        self.assertTrue(self.dealer.is_bust)
+        self.assertFalse(self.dealer.is_pair)
@@ -0,0 +1,49 @@
+import io
+import unittest
+from cards import Card
+from renderer import Renderer, card_art, hand_lines, CLEAR_SCREEN
+
+class TestRenderer(unittest.TestCase):
+    def setUp(self):
+        self.out = io.StringIO()
+        self.renderer = Renderer(out=self.out, read=lambda: "yes")
+        self.renderer.show(["title", "score: 10", "bet: 5"])
+
+    def written(self):
+        text = self.out.getvalue()
+        self.out.seek(0)
+        self.out.truncate()
+        return text
+
+    def test_first_frame_is_full(self):
+        """Test the first frame clears the screen and draws every line"""
+        self.assertEqual(self.written(),
+                         CLEAR_SCREEN + "title\nscore: 10\nbet: 5\n")
+
+    def test_redraw_sends_only_changes(self):
+        """Test a redraw writes just the changed lines"""
+        self.written()
+        self.renderer.show(["title", "score: 15", "bet: 5"])
+        text = self.written()
+        self.assertIn("score: 15", text)
+        self.assertNotIn("title", text)
+        self.assertNotIn("bet", text)
+
+    def test_prompt_is_tracked(self):
+        """Test prompts are redrawn over on the next frame"""
+        self.assertEqual(self.renderer.prompt("Sure? "), "yes")
+        self.assertEqual(self.renderer.lines[-1], "Sure? yes")
+        self.written()
+        self.renderer.show(["title", "score: 10", "bet: 5"])
+        self.assertTrue(self.written().endswith("\x1b[J"))
+
+    def test_card_art_is_cached(self):
+        """Test card art is built once per card"""
+        self.assertIs(card_art(Card("A", "♠")), card_art(Card("A", "♠")))
+
+    def test_hand_lines_hide_second(self):
+        """Test the hole card is drawn face down"""
+        lines = hand_lines([Card("A", "♠"), Card("K", "♥")], hide_second=True)
+        self.assertEqual(len(lines), 5)
+        self.assertIn("?", lines[1])
+        self.assertNotIn("K", "".join(lines))
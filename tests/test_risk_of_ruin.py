@@ -0,0 +1,52 @@
+import unittest
+import risk_of_ruin
+from risk_of_ruin import outcome_distribution, simulate_bankrolls
+from simulate import simulate
+
+@unittest.skipIf(risk_of_ruin.np is None, "NumPy is not installed")
+class TestRiskOfRuin(unittest.TestCase):
+    def test_certain_loss(self):
+        """Test ruin is reached below the minimum bet and is terminal"""
+        report = simulate_bankrolls([-1.0], [1.0], bankroll=20, unit=5,
+                                    rounds=50, paths=100, points=10)
+        self.assertEqual(report.risk_of_ruin, 1.0)
+        self.assertTrue((report.bust_rounds == 4).all())
+        self.assertTrue((report.final == 0).all())
+        self.assertEqual(report.rounds_to_bust(), {10: 4.0, 50: 4.0, 90: 4.0})
+
+    def test_no_ruin(self):
+        """Test paths that cannot lose follow the same curve"""
+        report = simulate_bankrolls([1.0], [1.0], bankroll=20, unit=5,
+                                    rounds=100, paths=10, points=4)
+        self.assertEqual(report.risk_of_ruin, 0.0)
+        self.assertEqual(report.checkpoints.tolist(), [0, 25, 50, 75, 100])
+        self.assertEqual(report.curves[50].tolist(), [20, 145, 270, 395, 520])
+        self.assertEqual(report.rounds_to_bust(), {})
+
+    def test_blocks_replay(self):
+        """Test trajectories replay from the seed across several blocks"""
+        values, probabilities = [-1.0, 0.0, 1.0], [0.5, 0.1, 0.4]
+        runs = [simulate_bankrolls(values, probabilities, 50, 1, rounds=400,
+                                   paths=20_000, seed=3) for _ in range(2)]
+        self.assertEqual(runs[0].bust_rounds.tolist(),
+                         runs[1].bust_rounds.tolist())
+        self.assertTrue(0 < runs[0].risk_of_ruin < 1)
+        busted = runs[0].bust_rounds > 0
+        self.assertTrue((runs[0].final[busted] < 1).all())
+        self.assertTrue((runs[0].final[~busted] >= 1).all())
+
+    def test_distribution_from_simulation(self):
+        """Test simulated outcomes and raw nets give the same distribution"""
+        stats = simulate(500, seed=2)
+        self.assertEqual(sum(stats.outcomes.values()), 500)
+        values, probabilities = outcome_distribution(stats.outcomes)
+        nets = [net for net, count in stats.outcomes.items()
+                for _ in range(count)]
+        same_values, same_probabilities = outcome_distribution(nets)
+        self.assertEqual(values.tolist(), same_values.tolist())
+        self.assertEqual(probabilities.tolist(), same_probabilities.tolist())
+        self.assertAlmostEqual((values * probabilities).sum(), stats.mean)
+
+
+if __name__ == '__main__':
+    unittest.main()
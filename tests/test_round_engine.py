@@ -0,0 +1,114 @@
+import unittest
+from array import array
+from dealer import Dealer
+from decks import Deck
+from user import User
+from cards import Card
+from round_engine import RoundEngine, Seat
+from constants import GameActions as GA, Outcomes as O, RoundEvents as E
+
+def stacked_deck(ranks):
+    deck = Deck(1)
+    deck.cards = array("B", (Card(rank, "♠").id for rank in ranks))
+    return deck
+
+class TestRoundEngine(unittest.TestCase):
+    def setUp(self):
+        self.user = User("test", "test", 1000)
+        self.dealer = Dealer()
+
+    def play(self, ranks, decisions, bet=10, bankroll=1000):
+        decisions = list(decisions)
+        policy = lambda player, dealer, actions: decisions.pop(0)
+        engine = RoundEngine(stacked_deck(ranks), self.dealer, policy)
+        return engine.play_round(self.user, bet, bankroll)
+
+    def test_stand_and_win(self):
+        """Test a plain round where the dealer busts"""
+        # Player 10+9, dealer 10+6 draws a 10
+        result = self.play(["10", "10", "9", "6", "10"], [GA.STAND.value])
+        self.assertEqual(result.hands[0].outcome, O.WIN)
+        self.assertEqual(result.dealer_score, 26)
+        self.assertEqual(result.net, 10)
+
+    def test_bust_skips_dealer(self):
+        """Test that the dealer does not draw when every hand busted"""
+        result = self.play(["10", "10", "6", "6", "K"], [GA.HIT.value])
+        self.assertEqual(result.hands[0].outcome, O.BUST)
+        self.assertEqual(len(result.dealer_cards), 2)
+        self.assertEqual(result.net, -10)
+
+    def test_double_down(self):
+        """Test doubling down draws one card and doubles the bet"""
+        result = self.play(["6", "10", "5", "8", "K"], [GA.DOUBLE_DOWN.value])
+        self.assertEqual(result.hands[0].bet, 20)
+        self.assertEqual(result.hands[0].score, 21)
+        self.assertEqual(result.net, 20)
+
+    def test_split_hands(self):
+        """Test splitting plays both hands against one dealer turn"""
+        ranks = ["8", "10", "8", "9", "3", "K", "10"]
+        result = self.play(ranks,
+                           [GA.SPLIT.value, GA.STAND.value, GA.HIT.value])
+        self.assertEqual([hand.score for hand in result.hands], [11, 28])
+        self.assertEqual([hand.outcome for hand in result.hands],
+                         [O.LOSE, O.BUST])
+        self.assertEqual(result.net, -20)
+
+    def test_resplits_play_left_to_right(self):
+        """Test resplit hands are played and settled in table order"""
+        # 8+8 splits, the left 8 draws another 8 and splits again
+        ranks = ["8", "10", "8", "7", "8", "3", "2", "K"]
+        engine = RoundEngine(stacked_deck(ranks), self.dealer)
+        engine.start_round(self.user, 10, bankroll=990)
+        engine.act(GA.SPLIT.value)
+        engine.act(GA.SPLIT.value)
+        for _ in range(3):
+            engine.act(GA.STAND.value)
+        self.assertEqual(engine.seats[0].bankroll, 970)
+        result = engine.finish_round()
+        self.assertEqual(
+            [[card.rank for card in hand.cards] for hand in result.hands],
+            [["8", "3"], ["8", "2"], ["8", "K"]])
+        self.assertEqual([hand.outcome for hand in result.hands],
+                         [O.LOSE, O.LOSE, O.WIN])
+        self.assertEqual(result.net, -10)
+
+    def test_no_double_without_funds(self):
+        """Test double and split are not offered without enough bankroll"""
+        engine = RoundEngine(stacked_deck(["8", "10", "8", "9"]), self.dealer)
+        engine.start_round(self.user, 10, bankroll=10)
+        self.assertEqual(engine.available_actions(),
+                         [GA.HIT.value, GA.STAND.value])
+        with self.assertRaises(ValueError):
+            engine.act(GA.SPLIT.value)
+
+    def test_table_shares_one_dealer_turn(self):
+        """Test every seat plays against a single dealer turn"""
+        # Seats get 10+9 and 10+7, dealer 10+6 draws a 5
+        ranks = ["10", "10", "10", "9", "7", "6", "5"]
+        events = []
+        engine = RoundEngine(stacked_deck(ranks), self.dealer,
+                             lambda player, dealer, actions: GA.STAND.value,
+                             lambda event, engine: events.append(event))
+        other = User("other", "test", 1000)
+        results = engine.play_table([Seat(self.user, 10), Seat(other, 20)])
+        self.assertEqual([result.hands[0].score for result in results],
+                         [19, 17])
+        self.assertEqual([result.net for result in results], [-10, -20])
+        self.assertEqual(results[0].dealer_score, 21)
+        self.assertEqual(events.count(E.DEALER_TURN), 1)
+        self.assertEqual(events.count(E.NEXT_SEAT), 1)
+
+    def test_table_skips_blackjack_seat(self):
+        """Test a seat dealt 21 needs no decision"""
+        ranks = ["A", "10", "10", "K", "7", "6", "2"]
+        engine = RoundEngine(stacked_deck(ranks), self.dealer)
+        other = User("other", "test", 1000)
+        engine.start_table([Seat(self.user, 10), Seat(other, 10)])
+        self.assertIs(engine.player, other)
+        engine.act(GA.STAND.value)
+        self.assertTrue(engine.done)
+        results = engine.finish_table()
+        self.assertEqual([result.hands[0].outcome for result in results],
+                         [O.WIN, O.LOSE])
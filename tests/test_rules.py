@@ -0,0 +1,110 @@
+import dataclasses
+import unittest
+from cards import Card
+from dealer import Dealer
+from user import User
+from round_engine import RoundEngine
+from rules import RuleSet, DEFAULT_RULES
+from test_round_engine import stacked_deck
+from constants import GameActions as GA, Outcomes as O
+
+class TestRules(unittest.TestCase):
+    def setUp(self):
+        self.user = User("test", "test", 1000)
+
+    def engine(self, ranks, rules):
+        return RoundEngine(stacked_deck(ranks), Dealer(rules))
+
+    def test_frozen_and_hashable(self):
+        """Test rule sets can key caches and cannot be changed"""
+        self.assertEqual(hash(RuleSet()), hash(DEFAULT_RULES))
+        self.assertEqual(
+            len({RuleSet(), RuleSet(hit_soft_17=True), RuleSet()}), 2)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            DEFAULT_RULES.surrender = True
+
+    def test_soft_17(self):
+        """Test the dealer hits soft 17 only under H17"""
+        for rules, hits in ((RuleSet(), False),
+                            (RuleSet(hit_soft_17=True), True)):
+            dealer = Dealer(rules)
+            dealer.game_cards = [Card("A", "♠"), Card("6", "♠")]
+            self.assertEqual(dealer.make_decision(), hits)
+
+    def test_blackjack_payout(self):
+        """Test a natural pays the rule set's blackjack payout"""
+        engine = self.engine(["A", "10", "K", "8"],
+                             RuleSet(blackjack_pays=1.5))
+        engine.start_round(self.user, 10)
+        self.assertTrue(engine.done)
+        hand = engine.finish_round().hands[0]
+        self.assertEqual((hand.outcome, hand.payout), (O.WIN, 25))
+
+    def test_dealer_natural_beats_21(self):
+        """Test a dealer natural beats a three-card 21"""
+        engine = self.engine(["5", "A", "6", "K", "10"], DEFAULT_RULES)
+        engine.start_round(self.user, 10)
+        engine.act(GA.HIT.value)
+        self.assertEqual(engine.finish_round().hands[0].outcome, O.LOSE)
+
+    def test_surrender(self):
+        """Test surrender returns half the bet on the first decision only"""
+        engine = self.engine(["10", "10", "6", "7", "2"],
+                             RuleSet(surrender=True))
+        engine.start_round(self.user, 10)
+        self.assertIn(GA.SURRENDER.value, engine.available_actions())
+        engine.act(GA.SURRENDER.value)
+        result = engine.finish_round()
+        self.assertEqual((result.hands[0].outcome, result.net),
+                         (O.SURRENDER, -5))
+        self.assertEqual(len(result.dealer_cards), 2)
+
+        engine = self.engine(["10", "10", "6", "7", "2"], DEFAULT_RULES)
+        engine.start_round(self.user, 10)
+        self.assertNotIn(GA.SURRENDER.value, engine.available_actions())
+
+    def test_late_surrender(self):
+        """Test a surrendered hand loses the whole bet to a dealer natural"""
+        engine = self.engine(["10", "A", "6", "K"], RuleSet(surrender=True))
+        engine.start_round(self.user, 10)
+        engine.act(GA.SURRENDER.value)
+        result = engine.finish_round()
+        self.assertEqual((result.hands[0].outcome, result.net), (O.LOSE, -10))
+
+    def test_split_limits(self):
+        """Test the resplit limit and doubling after splits"""
+        rules = RuleSet(max_hands=2, double_after_split=False)
+        engine = self.engine(["8", "10", "8", "9", "8", "3"], rules)
+        engine.start_round(self.user, 10)
+        engine.act(GA.SPLIT.value)
+        self.assertEqual(engine.player.game_cards[0].rank, "8")
+        self.assertEqual(engine.available_actions(),
+                         [GA.HIT.value, GA.STAND.value])
+
+    def test_split_aces(self):
+        """Test one-card split aces and the resplit aces rule"""
+        # Player A+A splits into A+5 and A+A against a dealer 17
+        ranks = ["A", "10", "A", "7", "5", "A", "9"]
+        engine = self.engine(ranks, RuleSet(hit_split_aces=False))
+        engine.start_round(self.user, 10)
+        engine.act(GA.SPLIT.value)
+        self.assertEqual(engine.player.game_cards[1].rank, "A")
+        self.assertEqual(engine.available_actions(),
+                         [GA.STAND.value, GA.SPLIT.value])
+
+        rules = RuleSet(hit_split_aces=False, resplit_aces=False)
+        engine = self.engine(ranks, rules)
+        engine.start_round(self.user, 10)
+        engine.act(GA.SPLIT.value)
+        self.assertTrue(engine.done)
+        result = engine.finish_round()
+        self.assertEqual([hand.score for hand in result.hands], [16, 12])
+        self.assertEqual(result.net, -20)
+        self.assertEqual(rules.name, "4D S17 1:1 DAS RSP4 NRSA 1SA")
+
+    def test_bet_limits(self):
+        """Test bets are checked against the user's rule set"""
+        self.user.rules = RuleSet(max_bet=50)
+        with self.assertRaises(ValueError):
+            self.user.bet_amount = 60
+        self.user.bet_amount = 50
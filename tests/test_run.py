@@ -4,9 +4,28 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from test_account_store import *
+from test_balance_journal import *
+from test_benchmark import *
 from test_card import *
+from test_deck import *
+from test_hand_history import *
+from test_instrumentation import *
+from test_card_counting import *
 from test_player import *
 from test_game import *
+from test_renderer import *
+from test_round_engine import *
+from test_risk_of_ruin import *
+from test_rules import *
+from test_seeding import *
+from test_server import *
+from test_shoe_pipeline import *
+from test_shuffling import *
+from test_simulate import *
+from test_batch_simulator import *
+from test_dealer_probabilities import *
+from test_strategy_solver import *
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import unittest
+import decks
+import seeding
+from decks import Deck
+from simulate import simulate
+
+class TestSeeding(unittest.TestCase):
+    def test_streams_replay(self):
+        """Test a stream repeats from its seed and keys"""
+        self.assertEqual(seeding.stream(7, 3).random(),
+                         seeding.stream(7, 3).random())
+        self.assertNotEqual(seeding.stream(7, 3).random(),
+                            seeding.stream(7, 4).random())
+        self.assertNotEqual(seeding.stream_seed(1, 23),
+                            seeding.stream_seed(12, 3))
+
+    def test_seeded_deck_replays(self):
+        """Test two decks on the same stream shuffle alike"""
+        first = Deck(2, rng=seeding.stream(1))
+        second = Deck(2, rng=seeding.stream(1))
+        first.shuffle_cards()
+        second.shuffle_cards()
+        self.assertEqual(first.cards, second.cards)
+
+    @unittest.skipIf(decks.np is None, "NumPy is not installed")
+    def test_numpy_shuffles(self):
+        """Test NumPy shuffles keep every card and replay from the seed"""
+        deck = Deck(2, rng=seeding.numpy_stream(5))
+        cards = deck.cards
+        deck.shuffle_cards()
+        self.assertIs(deck.cards, cards)
+        self.assertEqual(sorted(deck.cards), sorted(list(range(52)) * 2))
+
+        shoes = [Deck(2) for _ in range(3)]
+        decks.shuffle_decks(shoes, seeding.numpy_stream(5))
+        again = [Deck(2) for _ in range(3)]
+        decks.shuffle_decks(again, seeding.numpy_stream(5))
+        self.assertEqual([d.cards for d in shoes], [d.cards for d in again])
+        self.assertNotEqual(shoes[0].cards, shoes[1].cards)
+
+    @unittest.skipIf(decks.np is None, "NumPy is not installed")
+    def test_numpy_simulation_replays(self):
+        """Test the NumPy shuffle backend gives replayable simulations"""
+        first = simulate(300, seed=3, chunk_rounds=100, rng="numpy")
+        second = simulate(300, seed=3, chunk_rounds=100, rng="numpy")
+        self.assertEqual(vars(first), vars(second))
@@ -0,0 +1,215 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from account_store import SQLiteAccountStore
+from server import AsyncAccountStore, GameServer, Table
+from shuffling import ThresholdShuffle
+from test_round_engine import stacked_deck
+from user import User
+
+class ScriptedClient:
+    """Plays a session over a real socket, choosing actions from a script"""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, line):
+        self.writer.write(line.encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def expect(self, prefix):
+        while True:
+            line = (await self.reader.readline()).decode("utf-8").strip()
+            if line.startswith(prefix) or line.startswith("ERR"):
+                return line
+
+    async def join(self, table_id, seated):
+        """Sit at a table, then wait on the seated barrier until every
+        client has sat, so no bet starts a round before the table is full"""
+        await self.send(f"join {table_id}")
+        reply = await self.expect("OK")
+        await seated.wait()
+        return reply
+
+    async def play_round(self, bet, action="stand"):
+        """Returns the dealer's final STATE line and the BALANCE line"""
+        await self.send(f"bet {bet}")
+        dealer = None
+        while True:
+            line = await self.expect(("ACTIONS", "STATE dealer", "BALANCE"))
+            if line.startswith("STATE"):
+                dealer = line
+            elif line.startswith("ACTIONS"):
+                await self.send(action)
+            else:
+                return dealer, line
+
+async def connect(port):
+    """ScriptedClient on a new connection to the local server"""
+    return ScriptedClient(*await asyncio.open_connection("127.0.0.1", port))
+
+class StubSession:
+    """Seated player answering from a list of actions"""
+    def __init__(self, username, balance, actions):
+        self.user = User(username, "pw", balance)
+        self.actions = list(actions)
+
+    async def ask_action(self, engine):
+        return self.actions.pop(0)
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SQLiteAccountStore(
+            os.path.join(self.directory.name, "accounts.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_scripted_clients_share_a_table(self):
+        """Test two scripted clients play each round against one dealer turn"""
+        async def scenario():
+            game_server = GameServer(self.store, seed=1)
+            server = await game_server.start_tcp("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                seated = asyncio.Barrier(2)
+
+                async def client(name):
+                    c = await connect(port)
+                    await c.send(f"register {name} pw 100")
+                    self.assertTrue((await c.expect("OK")).startswith("OK"))
+                    reply = await c.join(0, seated)
+                    self.assertTrue(reply.startswith("OK table 0"))
+                    rounds = [await c.play_round(10) for _ in range(3)]
+                    await c.send("quit")
+                    await c.expect("OK")
+                    c.writer.close()
+                    return rounds
+                return await asyncio.gather(client("ann"), client("ben"))
+
+        results = asyncio.run(scenario())
+        self.assertEqual([dealer for dealer, _ in results[0]],
+                         [dealer for dealer, _ in results[1]])
+        for name, rounds in zip(("ann", "ben"), results):
+            self.assertTrue(all(line.startswith("BALANCE")
+                                for _, line in rounds))
+            final = float(rounds[-1][1].split()[1])
+            self.assertEqual(self.store.load(name)["balance"], final)
+
+    def test_requires_login(self):
+        """Test commands are refused before logging in"""
+        async def scenario():
+            server = await GameServer(self.store).start_tcp("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                c = await connect(port)
+                await c.send("bet 10")
+                reply = await c.expect("OK")
+                c.writer.close()
+                return reply
+        self.assertEqual(asyncio.run(scenario()), "ERR Log in first")
+
+    def test_table_pipelines(self):
+        """Test shoe pipelines start only for whole-shoe shuffles and stop
+        on close"""
+        game_server = GameServer(self.store, seed=1, pipeline=True)
+        table = game_server.find_table()
+        worker = table.pipeline._worker
+        self.assertTrue(worker.is_alive())
+        game_server.close()
+        self.assertIsNone(table.pipeline)
+        self.assertFalse(worker.is_alive())
+        game_server = GameServer(self.store, shuffle="csm", pipeline=True)
+        self.assertIsNone(game_server.find_table().pipeline)
+
+    def test_round_balances_commit_together(self):
+        """Test a round's balance changes are applied all at once or not at
+        all"""
+        self.store.save("ann", "pw", 100.0)
+        store = AsyncAccountStore(self.store)
+        with self.assertRaises(ValueError):
+            asyncio.run(store.adjust_balances({"ann": 10.0, "nobody": -10.0}))
+        self.assertEqual(self.store.load("ann")["balance"], 100.0)
+        asyncio.run(store.adjust_balances({"ann": 10.0}))
+        self.assertEqual(self.store.load("ann")["balance"], 110.0)
+
+    def test_new_table_id_skips_requested_ids(self):
+        """Test a new table never takes the id of a table opened on request"""
+        game_server = GameServer(self.store, max_seats=1, seed=1)
+        game_server.find_table(1).sit(object())
+        self.assertEqual(game_server.find_table().table_id, 2)
+
+    def test_concurrent_registrations(self):
+        """Test only one of two racing registrations of a username succeeds"""
+        async def scenario():
+            server = await GameServer(self.store).start_tcp("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                async def register(balance):
+                    c = await connect(port)
+                    await c.send(f"register ann pw {balance}")
+                    reply = await c.expect("OK")
+                    c.writer.close()
+                    return reply
+                return await asyncio.gather(register(100), register(200))
+
+        replies = sorted(asyncio.run(scenario()))
+        self.assertEqual(replies, ["ERR Username already taken!",
+                                   "OK registered ann"])
+        self.assertIn(self.store.load("ann")["balance"], (100.0, 200.0))
+
+    def test_first_seat_doubles(self):
+        """Test a double on the first seat takes the stake from that player
+        only"""
+        self.store.save("ann", "pw", 100.0)
+        self.store.save("ben", "pw", 100.0)
+        table = Table(0, AsyncAccountStore(self.store),
+                      shuffler=ThresholdShuffle(0))
+        # Ann 6 5 doubles onto 9, ben stands on 19, the dealer stands on 17
+        deck = stacked_deck(["6", "10", "10", "5", "9", "7", "9"])
+        table.deck = table.engine.deck = deck
+        ann = StubSession("ann", 90.0, ["double"])
+        ben = StubSession("ben", 90.0, ["stand"])
+        asyncio.run(table.deal({ann: 10.0, ben: 10.0}))
+        self.assertEqual(ann.user.balance, 120.0)
+        self.assertEqual(ben.user.balance, 110.0)
+        self.assertEqual(self.store.load("ann")["balance"], 120.0)
+        self.assertEqual(self.store.load("ben")["balance"], 110.0)
+
+    def test_failed_round_returns_bets(self):
+        """Test a round that fails to persist gives the bet back and keeps
+        the client"""
+        class FailingStore(AsyncAccountStore):
+            async def adjust_balances(self, deltas):
+                raise OSError("disk full")
+
+        async def scenario():
+            game_server = GameServer(self.store, seed=1)
+            server = await game_server.start_tcp("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                c = await connect(port)
+                await c.send("register ann pw 100")
+                await c.expect("OK")
+                await c.send("join 0")
+                await c.expect("OK")
+                game_server.tables[0].store = FailingStore(self.store)
+                await c.send("bet 10")
+                error = await c.expect(("ACTIONS", "ERR"))
+                while error.startswith("ACTIONS"):
+                    await c.send("stand")
+                    error = await c.expect(("ACTIONS", "ERR"))
+                replies = [error, await c.expect("BALANCE")]
+                await c.send("balance")
+                replies.append(await c.expect("BALANCE"))
+                c.writer.close()
+                return replies
+
+        error, balance, again = asyncio.run(scenario())
+        self.assertEqual(error, "ERR round failed: disk full")
+        self.assertEqual((balance, again),
+                         ("BALANCE 100.00", "BALANCE 100.00"))
+        self.assertEqual(self.store.load("ann")["balance"], 100.0)
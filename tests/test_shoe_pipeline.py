@@ -0,0 +1,64 @@
+import time
+import unittest
+import seeding
+from decks import Deck
+from shoe_pipeline import ShoePipeline
+from simulate import simulate
+
+class TestShoePipeline(unittest.TestCase):
+    def shoes(self, process=False, count=5):
+        deck = Deck(2, rng=seeding.stream(9))
+        with ShoePipeline(deck, depth=2, process=process) as pipeline:
+            self.assertIs(deck.pipeline, pipeline)
+            shoes = []
+            for _ in range(count):
+                deck.draw_card()
+                deck.shuffle_cards()
+                self.assertEqual(deck.position, 0)
+                shoes.append(deck.cards.tolist())
+        self.assertIsNone(deck.pipeline)
+        return shoes
+
+    def test_swaps_in_shuffled_shoes(self):
+        """Test every reshuffle swaps in a new full shoe that replays from
+        the seed"""
+        shoes = self.shoes()
+        for shoe in shoes:
+            self.assertEqual(sorted(shoe), sorted(list(range(52)) * 2))
+        self.assertEqual(len({tuple(shoe) for shoe in shoes}), len(shoes))
+        self.assertEqual(shoes, self.shoes())
+
+    def test_process_matches_thread(self):
+        """Test a worker process deals the same shoes as a worker thread"""
+        self.assertEqual(self.shoes(process=True, count=20),
+                         self.shoes(count=20))
+
+    def test_closed_deck_shuffles_in_place(self):
+        deck = Deck(1)
+        ShoePipeline(deck).close()
+        cards = deck.cards
+        deck.shuffle_cards()
+        self.assertIs(deck.cards, cards)
+
+    def test_close_with_full_queue(self):
+        """Test closing does not hang once a worker filled the queue"""
+        for options in ({"depth": 16, "process": True},
+                        {"batch": 64, "process": True}, {"depth": 2}):
+            pipeline = ShoePipeline(Deck(8), **options)
+            deadline = time.monotonic() + 5
+            while not pipeline._shoes.full() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(pipeline._shoes.full())
+            pipeline.close()
+            self.assertFalse(pipeline._worker.is_alive())
+
+    def test_simulation_replays(self):
+        """Test seeded simulations replay with a pipeline"""
+        first, second = [simulate(300, seed=3, shuffle="threshold:150",
+                                  pipeline="process") for _ in range(2)]
+        self.assertEqual(first.net, second.net)
+        self.assertGreater(first.shuffles, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
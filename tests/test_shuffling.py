@@ -0,0 +1,61 @@
+import unittest
+import seeding
+from decks import Deck
+from shuffling import (ThresholdShuffle, CutCardShuffle, ContinuousShuffle,
+                       parse_shuffle_policy)
+
+class TestShuffling(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck(1, rng=seeding.stream(0))
+
+    def test_threshold(self):
+        """Test the whole shoe is shuffled once few cards remain"""
+        policy = ThresholdShuffle(cards=20)
+        self.deck.deal(31)
+        self.assertFalse(policy.before_round(self.deck))
+        self.deck.deal(1)
+        self.assertTrue(policy.before_round(self.deck))
+        self.assertEqual(self.deck.remaining, 52)
+
+    def test_cut_card(self):
+        """Test the shoe is shuffled once the cut card comes out"""
+        policy = CutCardShuffle(penetration=0.5)
+        policy.setup(self.deck)
+        self.deck.deal(25)
+        self.assertFalse(policy.before_round(self.deck))
+        self.deck.deal(1)
+        self.assertTrue(policy.before_round(self.deck))
+        self.assertEqual(self.deck.cut_card, 26)
+
+    def test_cut_card_leaves_cards_for_the_round(self):
+        """Test the cut card never sits too close to the end of the shoe"""
+        for penetration in (0, 1, 1.5):
+            with self.assertRaises(ValueError):
+                CutCardShuffle(penetration)
+        CutCardShuffle(0.95).setup(self.deck)
+        self.assertEqual(self.deck.cut_card, 26)
+        self.deck.shuffle_cards()
+        self.assertEqual(self.deck.cut_card, 26)
+        shoe = Deck(6)
+        CutCardShuffle(0.95).setup(shoe)
+        self.assertEqual(len(shoe.cards) - shoe.cut_card,
+                         CutCardShuffle.RESERVE)
+
+    def test_continuous_shuffle_reuses_shoe(self):
+        """Test a CSM returns the discards into the same card buffer"""
+        policy = ContinuousShuffle()
+        cards = self.deck.cards
+        dealt = self.deck.deal(10)
+        policy.before_round(self.deck)
+        self.assertIs(self.deck.cards, cards)
+        self.assertEqual(self.deck.remaining, 52)
+        self.assertEqual(sorted(self.deck.cards), list(range(52)))
+        self.assertNotEqual(self.deck.deal(10), dealt)
+
+    def test_parse(self):
+        """Test policies are built from their command line names"""
+        self.assertEqual(parse_shuffle_policy("cut:0.8").penetration, 0.8)
+        self.assertEqual(parse_shuffle_policy("threshold:30").cards, 30)
+        self.assertIsInstance(parse_shuffle_policy("csm"), ContinuousShuffle)
+        with self.assertRaises(ValueError):
+            parse_shuffle_policy("riffle")
@@ -0,0 +1,37 @@
+import unittest
+from types import SimpleNamespace
+from simulate import SimulationStats, simulate
+
+class TestSimulate(unittest.TestCase):
+    def test_worker_count_does_not_change_result(self):
+        """Test a fixed seed gives the same stats for any number of workers"""
+        single = simulate(600, workers=1, seed=7, chunk_rounds=100)
+        pooled = simulate(600, workers=2, seed=7, chunk_rounds=100)
+        self.assertEqual(vars(single), vars(pooled))
+        self.assertEqual(single.rounds, 600)
+
+    def test_merge_matches_sequential(self):
+        """Test merged Welford aggregates match one sequential pass"""
+        values = [1, -1, 0, 2, -1, -1, 1, 0]
+        sequential = SimulationStats()
+        left, right = SimulationStats(), SimulationStats()
+        for i, value in enumerate(values):
+            round_result = SimpleNamespace(net=value, hands=[])
+            sequential.add_round(round_result)
+            (left if i < 3 else right).add_round(round_result)
+
+        merged = left.merge(right)
+        self.assertEqual(merged.rounds, sequential.rounds)
+        self.assertAlmostEqual(merged.mean, sequential.mean)
+        self.assertAlmostEqual(merged.variance, sequential.variance)
+
+    def test_seats_share_one_sample_per_round(self):
+        """Test a multi-seat table adds one sample per round and counts
+        every hand"""
+        stats = simulate(200, seed=3, seats=3)
+        self.assertEqual(stats.rounds, 200)
+        self.assertEqual(stats.hands, 600)
+        self.assertEqual(sum(stats.outcomes.values()), 200)
+        self.assertAlmostEqual(stats.mean * stats.rounds, stats.net)
+        with self.assertRaises(ValueError):
+            simulate(10, seats=8)
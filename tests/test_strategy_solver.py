@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from bot import Bot
+from cards import Card
+import dealer_probabilities as dp
+from rules import RuleSet
+from strategy_solver import (StrategyTable, solve, hand_row, load_or_solve,
+                             table_path)
+from constants import GameActions as GA
+
+class TestStrategySolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table, cls.evs = solve(dp.shoe_composition(4))
+
+    def best(self, row, upcard):
+        return list(GA)[self.table.ranked_actions(row, upcard)[0]]
+
+    def test_well_known_plays(self):
+        """Test a few textbook decisions"""
+        self.assertEqual(self.best(hand_row(11), 6), GA.DOUBLE_DOWN)
+        self.assertEqual(self.best(hand_row(20), 10), GA.STAND)
+        self.assertEqual(self.best(hand_row(0, pair_value=8), 6), GA.SPLIT)
+        self.assertEqual(self.best(hand_row(13, soft=True), 2), GA.HIT)
+
+    def test_policy_falls_back_to_available_action(self):
+        """Test the bot takes the next best action when one is not offered"""
+        bot = Bot(self.table.policy)
+        bot.game_cards = [Card("6", "♠"), Card("5", "♥")]
+        dealer = Bot(self.table.policy)
+        dealer.game_cards = [Card("6", "♣"), Card("10", "♣")]
+        actions = [GA.HIT.value, GA.STAND.value]
+        self.assertEqual(
+            bot.make_decision(dealer, actions + [GA.DOUBLE_DOWN.value]),
+            GA.DOUBLE_DOWN.value)
+        self.assertEqual(bot.make_decision(dealer, actions), GA.HIT.value)
+
+    def test_save_and_load(self):
+        """Test tables round-trip through their file format"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.bin")
+            self.table.save(path)
+            self.assertEqual(StrategyTable.load(path).ranks, self.table.ranks)
+
+    def test_load_or_solve_caches_in_directory(self):
+        """Test tables are solved once into the given directory, then loaded"""
+        rules = RuleSet(num_of_decks=4)
+        with tempfile.TemporaryDirectory() as directory:
+            table = load_or_solve(rules, directory)
+            self.assertEqual(table.ranks, self.table.ranks)
+            self.assertTrue(os.path.exists(table_path(rules, directory)))
+            self.assertEqual(load_or_solve(rules, directory).ranks,
+                             table.ranks)
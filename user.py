@@ -1,18 +1,25 @@
 from player import Player
-import json
-import os
-from constants import Actions as A, GameActions as GA, AccountActions as AA, MIN_BET
+import account_store
+from balance_journal import Entry
+import renderer
+from rules import DEFAULT_RULES
+from constants import Actions as A, AccountActions as AA
 
 
 class User(Player):
+    store = None  # AccountStore shared by every user
+    # Table rules limiting bets; set per user to override
+    rules = DEFAULT_RULES
+    # Renderer for the menus; set per user to override
+    screen = renderer.screen
+
     def __init__(self, username, password, initial_balance=0):
         super().__init__()
         self.__username = ""
         self.__password = ""
         self.__balance = 0
         self.__bet_amount = 0
-        self.__split_hands = []
-        self.__split_bets = []
+        self.journal = None  # BalanceJournal recording every balance change
         
         self.username = username
         self.password = password
@@ -57,53 +64,52 @@ class User(Player):
     
     @bet_amount.setter
     def bet_amount(self, amount):
-        if amount < MIN_BET:
-            raise ValueError(f"Bet amount must be at least €{MIN_BET:.2f}")
-        elif amount > self.__balance:
+        self.rules.validate_bet(amount)
+        if amount > self.__balance:
             raise ValueError("Insufficient funds for this bet!")
         else:
             self.__bet_amount = amount
 
-    @property
-    def split_hands(self):
-        return self.__split_hands
-    
-    @property
-    def split_bets(self):
-        return self.__split_bets
-    
+    @classmethod
+    def account_store(cls):
+        """Storage backend for accounts; set User.store to replace it"""
+        if cls.store is None:
+            cls.store = account_store.default_store()
+        return cls.store
+
+    def adjust_balance(self, delta, kind):
+        """Change the balance and record the change in the journal"""
+        self.balance += delta
+        if self.journal is not None:
+            self.journal.record(self.__username, kind, delta)
+
     def save_player_data(self):
-        """Save player data to a JSON file"""
-        player_data = {
-            "username": self.__username,
-            "password": self.__password,
-            "balance": self.__balance
-        }
-        
-        filename = f"players/{self.__username}.json"
-        os.makedirs("players", exist_ok=True)
-        
-        with open(filename, "w") as file:
-            json.dump(player_data, file, indent=4)
+        """Save player data to the account store. With a journal the balance
+        only changes through its deltas, so other sessions of the same
+        account keep their updates; the stored balance is read back."""
+        store = self.account_store()
+        with store.batch():
+            if self.journal is not None:
+                self.journal.checkpoint()
+                data = store.load(self.__username)
+                if data is not None:
+                    self.__balance = data["balance"]
+            store.save(self.__username, self.__password, self.__balance)
 
     @classmethod
     def load_player_data(cls, username, password):
-        """Load player data from JSON file"""
-        try:
-            filename = f"players/{username}.json"
-            with open(filename, "r") as file:
-                data = json.load(file)
-                
-            if data["password"] != password:
-                raise ValueError("Invalid password")
-                
-            return cls(
-                username=data["username"],
-                password=data["password"],
-                initial_balance=data["balance"]
-            )
-        except FileNotFoundError:
+        """Load player data from the account store"""
+        data = cls.account_store().load(username)
+        if data is None:
             raise ValueError(f"No saved data found for player: {username}")
+        if data["password"] != password:
+            raise ValueError("Invalid password")
+
+        return cls(
+            username=data["username"],
+            password=data["password"],
+            initial_balance=data["balance"]
+        )
         
     def can_split(self):
         """Check if hand can be split"""
@@ -111,57 +117,30 @@ class User(Player):
                 self._game_cards[0].rank == self._game_cards[1].rank and 
                 self.balance >= self.bet_amount)
 
-    def split_hand(self):
-        """Split hand and return the second card"""
-        return self._game_cards.pop()
-
-    def clear_splits(self):
-        """Clear split hands and bets"""
-        self.__split_hands.clear()
-        self.__split_bets.clear()
-
-    def make_decision(self, playing=False):
+    def make_decision(self, playing=False, actions=None):
         if playing:
-            return self.show_play_menu()
+            return self.show_play_menu(actions)
         else:
             return self.show_main_menu()
 
-    def show_play_menu(self):
+    def show_play_menu(self, actions):
+        """Ask for one of the actions allowed by the round engine"""
         while True:
-                actions = f"| {GA.HIT.value} | {GA.STAND.value} |"
-                # Only allow double/split on first turn
-                if len(self._game_cards) == 2:
-                    if self.balance >= self.bet_amount:
-                        actions += f" {GA.DOUBLE_DOWN.value} |"
-                    if self.can_split():
-                        actions += f" {GA.SPLIT.value} |"
-                
-                print(f"\nAvailable actions: {actions}")
-                choice = input("Your action: ").lower()
-            
-                if choice == GA.HIT.value:
-                    return GA.HIT.value
-                elif choice == GA.STAND.value:
-                    return GA.STAND.value
-                elif choice == GA.DOUBLE_DOWN.value and len(self._game_cards) == 2:
-                    if self.balance >= self.bet_amount:
-                        return GA.DOUBLE_DOWN.value
-                    else:
-                        print("Insufficient funds to double down!")
-                elif choice == GA.SPLIT.value and self.can_split():
-                    return GA.SPLIT.value
-                else:
-                    print(f"Invalid choice! Please enter from available actions.")
+            self.screen.message(
+                f"\nAvailable actions: | {' | '.join(actions)} |")
+            choice = self.screen.prompt("Your action: ").lower()
+
+            if choice in actions:
+                return choice
+            self.screen.message(
+                "Invalid choice! Please enter from available actions.")
     
     def show_main_menu(self):
         while True:
-                os.system('cls' if os.name == 'nt' else 'clear')
-                print("\nMain Menu:")
-                print(f"- {A.PLAY.value}")
-                print(f"- {A.ACCOUNT.value}")
-                print(f"- {A.EXIT.value}")
-                
-                choice = input("Your choice: ").lower()
+                self.screen.show(["", "Main Menu:", f"- {A.PLAY.value}",
+                             f"- {A.ACCOUNT.value}", f"- {A.EXIT.value}", ""])
+
+                choice = self.screen.prompt("Your choice: ").lower()
                 
                 if choice == A.PLAY.value:
                     return A.PLAY.value
@@ -170,16 +149,14 @@ class User(Player):
                 elif choice == A.EXIT.value:
                     return A.EXIT.value
                 else:
-                    print("Invalid choice! Please try again.")
+                    self.screen.message("Invalid choice! Please try again.")
 
     def show_account_menu(self):
         while True:
-            os.system('cls' if os.name == 'nt' else 'clear')
-            print("\nAccount Menu:")
-            for action in AA:
-                print(f"- {action.value}")
-            
-            choice = input("Your choice: ").lower()
+            self.screen.show(["", "Account Menu:"]
+                             + [f"- {action.value}" for action in AA] + [""])
+
+            choice = self.screen.prompt("Your choice: ").lower()
             
             if choice == AA.ADD_FUNDS.value:
                 self.add_funds()
@@ -191,95 +168,88 @@ class User(Player):
             elif choice == AA.CHANGE_USERNAME.value:
                 self.change_username()
             elif choice == AA.VIEW_BALANCE.value:
-                print(f"\nCurrent balance: €{self.balance:.2f}")
-                os.system('pause')
+                self.screen.message(f"\nCurrent balance: €{self.balance:.2f}")
+                self.screen.pause()
             elif choice == AA.BACK.value:
                 break
             else:
-                print("Invalid choice! Please try again.")
-                os.system('pause')
+                self.screen.message("Invalid choice! Please try again.")
+                self.screen.pause()
 
     def add_funds(self):
         while True:
-            os.system('cls' if os.name == 'nt' else 'clear')
+            self.screen.clear()
             try:
-                amount = float(input("Enter amount to add: €"))
+                amount = float(self.screen.prompt("Enter amount to add: €"))
                 if amount <= 0:
-                    print("Amount must be positive!")
+                    self.screen.message("Amount must be positive!")
                 else:
-                    self.balance += amount
-                    print(f"Funds added! New balance: €{self.balance:.2f}")
+                    self.adjust_balance(amount, Entry.DEPOSIT)
+                    self.screen.message(
+                        f"Funds added! New balance: €{self.balance:.2f}")
                     break
             except ValueError:
-                print("Invalid input! Please enter a number.")
-                os.system('pause')
+                self.screen.message("Invalid input! Please enter a number.")
+                self.screen.pause()
     
     def delete_account(self):
         """Delete player account and data file"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        confirmation = input("Are you sure you want to delete your account? (yes/no): ").lower()
+        self.screen.clear()
+        confirmation = self.screen.prompt(
+            "Are you sure you want to delete your account? (yes/no): ").lower()
         if confirmation == "yes":
-            filename = f"players/{self.__username}.json"
-            if os.path.exists(filename):
-                os.remove(filename)
-                print("Account deleted successfully!")
-                os.system('pause')
+            if self.account_store().delete(self.__username):
+                self.screen.message("Account deleted successfully!")
+                self.screen.pause()
                 return True
             else:
-                print("Account not found!")
-                os.system('pause')
+                self.screen.message("Account not found!")
+                self.screen.pause()
                 return False
         else:
-            print("Account deletion cancelled.")
-            os.system('pause')
+            self.screen.message("Account deletion cancelled.")
+            self.screen.pause()
             return False
         
     def change_password(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        old_password = input("Enter current password: ")
+        self.screen.clear()
+        old_password = self.screen.prompt("Enter current password: ")
         if old_password != self.__password:
-            print("Incorrect current password!")
-            os.system('pause')
+            self.screen.message("Incorrect current password!")
+            self.screen.pause()
             return
         
-        new_password = input("Enter new password: ")
+        new_password = self.screen.prompt("Enter new password: ")
         if new_password:
             self.password = new_password
             self.save_player_data()
-            print("Password changed successfully!")
-            os.system('pause')
+            self.screen.message("Password changed successfully!")
+            self.screen.pause()
         else:
-            print("Password cannot be empty!")
-            os.system('pause')
+            self.screen.message("Password cannot be empty!")
+            self.screen.pause()
 
     def change_username(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        new_username = input("Enter new username: ")
+        self.screen.clear()
+        new_username = self.screen.prompt("Enter new username: ")
         if new_username:
-            old_filename = f"players/{self.__username}.json"
-            new_filename = f"players/{new_username}.json"
-        
-            try:
-                # Check if new username file already exists
-                if os.path.exists(new_filename):
-                    print("Username already taken!")
-                    os.system('pause')
-                    return
-                
-                # Delete old file first
-                if os.path.exists(old_filename):
-                    os.remove(old_filename)
-                
-                # Update username and save
-                self.username = new_username
-                self.save_player_data()
-                print("Username changed successfully!")
-                os.system('pause')
-            
-            except OSError as e:
-                print(f"Error changing username: {e}")
-                # Revert username if save failed
-                self.username = old_filename.split('/')[-1].split('.')[0]
+            store = self.account_store()
+            # Check, rename and save in one transaction
+            with store.batch():
+                taken = store.exists(new_username)
+                if not taken:
+                    if self.journal is not None:
+                        # Entries still use the old name
+                        self.journal.checkpoint()
+                    store.rename(self.__username, new_username)
+                    self.username = new_username
+                    self.save_player_data()
+
+            if taken:
+                self.screen.message("Username already taken!")
+            else:
+                self.screen.message("Username changed successfully!")
+            self.screen.pause()
         else:
-            print("Username cannot be empty!")
-            os.system('pause')
\ No newline at end of file
+            self.screen.message("Username cannot be empty!")
+            self.screen.pause()